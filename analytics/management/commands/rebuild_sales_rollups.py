@@ -0,0 +1,43 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.services import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily sales rollups for a date range from OrderItem."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="start",
+            type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD). Defaults to --to.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="end",
+            type=date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--restaurant",
+            type=int,
+            help="Only rebuild the rollups of this restaurant id.",
+        )
+
+    def handle(self, *args, **options):
+        end = options["end"] or timezone.localdate()
+        start = options["start"] or end
+        if start > end:
+            raise CommandError("--from must not be after --to")
+
+        items, restaurants = rebuild_rollups(start, end, options["restaurant"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {items} item rollups and {restaurants} restaurant "
+                f"rollups for {start} to {end}"
+            )
+        )
@@ -0,0 +1,59 @@
+from django.db import models
+
+from restaurants.models import Menu, Restaurants
+
+
+class DailySalesRollup(models.Model):
+    """
+    Units sold and revenue of one menu item on one day.
+
+    Maintained incrementally by `analytics.services.record_order` when an
+    order is placed (and `remove_order` when it is cancelled), and rebuilt from OrderItem by the
+    `rebuild_sales_rollups` management command.
+    """
+
+    restaurant = models.ForeignKey(Restaurants, on_delete=models.CASCADE)
+    menu_item = models.ForeignKey(Menu, on_delete=models.CASCADE)
+    day = models.DateField()
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.menu_item_id} on {self.day}: {self.quantity}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant", "menu_item", "day"],
+                name="daily_sales_unique_item_day",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["restaurant", "day"], name="daily_sales_day_idx"),
+        ]
+
+
+class DailyRestaurantRollup(models.Model):
+    """
+    Orders, units and revenue of one restaurant on one day.
+
+    Kept next to DailySalesRollup because the number of distinct orders
+    (needed for the average basket) cannot be summed from per-item rows.
+    """
+
+    restaurant = models.ForeignKey(Restaurants, on_delete=models.CASCADE)
+    day = models.DateField()
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    orders = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.restaurant_id} on {self.day}: {self.revenue}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant", "day"], name="daily_restaurant_unique_day"
+            ),
+        ]
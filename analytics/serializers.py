@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class SalesRangeSerializer(serializers.Serializer):
+    """
+    Validate the query params of the sales analytics endpoint.
+
+    `end` defaults to today and `start` to 29 days before `end`, so a bare
+    request covers the last 30 days.
+    """
+
+    MAX_DAYS = 366
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    top = serializers.IntegerField(
+        required=False, default=10, min_value=1, max_value=50
+    )
+
+    def validate(self, attrs):
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=29)
+        if start > end:
+            raise serializers.ValidationError("start must not be after end")
+        if (end - start).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                f"The range must be at most {self.MAX_DAYS} days"
+            )
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class DailyRevenueSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    orders = serializers.IntegerField()
+    quantity = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class TopMenuItemSerializer(serializers.Serializer):
+    menu_item = serializers.IntegerField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField(source="total_quantity")
+    revenue = serializers.DecimalField(
+        source="total_revenue", max_digits=12, decimal_places=2
+    )
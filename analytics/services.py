@@ -0,0 +1,283 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from orders.models import OrderItem
+from .models import DailyRestaurantRollup, DailySalesRollup
+
+
+def upsert_increments(model, rows, key_fields, sum_fields):
+    """
+    Add each row's `sum_fields` onto the matching rollup row, creating it
+    when missing.
+
+    On databases with ``INSERT ... ON CONFLICT (...) DO UPDATE`` (SQLite,
+    PostgreSQL) all rows are written in one statement. Elsewhere every row
+    falls back to an ``UPDATE ... SET f = f + n`` and an INSERT if nothing
+    was updated.
+
+    Args:
+        model (type[Model]): The rollup model.
+        rows (list[dict]): Values keyed by field name; must contain every
+            key field and sum field.
+        key_fields (list[str]): Fields of the model's unique constraint.
+        sum_fields (list[str]): Fields to increment.
+    """
+    if not rows:
+        return
+    db = router.db_for_write(model)
+    connection = connections[db]
+    if not connection.features.supports_update_conflicts_with_target:
+        for row in rows:
+            _update_or_insert(model, db, row, key_fields, sum_fields)
+        return
+
+    opts = model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    fields = [opts.get_field(name) for name in key_fields + sum_fields]
+    columns = [qn(field.column) for field in fields]
+    placeholders = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    updates = ", ".join(
+        f"{column} = {table}.{column} + excluded.{column}"
+        for column in columns[len(key_fields) :]
+    )
+    batch_size = connection.ops.bulk_batch_size(fields, rows)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            params = [
+                field.get_db_prep_save(row[field.name], connection)
+                for row in batch
+                for field in fields
+            ]
+            cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES {', '.join([placeholders] * len(batch))} "
+                f"ON CONFLICT ({', '.join(columns[: len(key_fields)])}) "
+                f"DO UPDATE SET {updates}",
+                params,
+            )
+
+
+def _update_or_insert(model, db, row, key_fields, sum_fields):
+    lookup = {name: row[name] for name in key_fields}
+    increments = {name: F(name) + row[name] for name in sum_fields}
+    manager = model.objects.using(db)
+    with transaction.atomic(using=db):
+        if manager.filter(**lookup).update(**increments):
+            return
+        try:
+            with transaction.atomic(using=db):
+                manager.create(**row)
+        except IntegrityError:
+            manager.filter(**lookup).update(**increments)
+
+
+def record_order(order, lines):
+    """
+    Add a newly placed order to the daily rollups.
+
+    Meant to run inside the transaction that creates the order, so the
+    rollups commit (or roll back) together with it. Costs two queries
+    however many lines the order has.
+
+    Args:
+        order (orders.models.Order): The order just created.
+        lines (list[tuple[Menu, int]]): (menu item, quantity) pairs; the
+            menu items must have `price` and `restaurant_id` loaded.
+    """
+    day = timezone.localdate(order.order_date)
+    items = {}
+    restaurants = defaultdict(
+        lambda: {"quantity": 0, "revenue": Decimal("0.00"), "orders": 1}
+    )
+    for menu_item, quantity in lines:
+        revenue = menu_item.price * quantity
+        row = items.setdefault(
+            menu_item.pk,
+            {
+                "restaurant": menu_item.restaurant_id,
+                "menu_item": menu_item.pk,
+                "day": day,
+                "quantity": 0,
+                "revenue": Decimal("0.00"),
+                "orders": 1,
+            },
+        )
+        row["quantity"] += quantity
+        row["revenue"] += revenue
+        totals = restaurants[menu_item.restaurant_id]
+        totals["quantity"] += quantity
+        totals["revenue"] += revenue
+
+    upsert_increments(
+        DailySalesRollup,
+        list(items.values()),
+        ["restaurant", "menu_item", "day"],
+        ["quantity", "revenue", "orders"],
+    )
+    upsert_increments(
+        DailyRestaurantRollup,
+        [
+            {"restaurant": restaurant, "day": day, **totals}
+            for restaurant, totals in restaurants.items()
+        ],
+        ["restaurant", "day"],
+        ["quantity", "revenue", "orders"],
+    )
+
+
+def stored_order_rows(order):
+    """
+    Return the rollup rows of an order saved with its items, as
+    `record_order` added them.
+
+    Returns:
+        tuple[list[dict], list[dict]]: The DailySalesRollup rows and the
+        DailyRestaurantRollup rows, in the shape `upsert_increments` takes.
+    """
+    day = timezone.localdate(order.order_date)
+    lines = (
+        OrderItem.objects.filter(order=order)
+        .values("menu_item_id", restaurant_id=F("menu_item__restaurant_id"))
+        .annotate(total_quantity=Sum("quantity"), total_revenue=Sum("price"))
+    )
+    items = []
+    restaurants = defaultdict(
+        lambda: {"quantity": 0, "revenue": Decimal("0.00"), "orders": 1}
+    )
+    for line in lines:
+        items.append(
+            {
+                "restaurant": line["restaurant_id"],
+                "menu_item": line["menu_item_id"],
+                "day": day,
+                "quantity": line["total_quantity"],
+                "revenue": line["total_revenue"],
+                "orders": 1,
+            }
+        )
+        totals = restaurants[line["restaurant_id"]]
+        totals["quantity"] += line["total_quantity"]
+        totals["revenue"] += line["total_revenue"]
+    return items, [
+        {"restaurant": restaurant, "day": day, **totals}
+        for restaurant, totals in restaurants.items()
+    ]
+
+
+def restore_order(order):
+    """
+    Add an order that is no longer cancelled back to the daily rollups.
+    """
+    items, restaurants = stored_order_rows(order)
+    upsert_increments(
+        DailySalesRollup,
+        items,
+        ["restaurant", "menu_item", "day"],
+        ["quantity", "revenue", "orders"],
+    )
+    upsert_increments(
+        DailyRestaurantRollup,
+        restaurants,
+        ["restaurant", "day"],
+        ["quantity", "revenue", "orders"],
+    )
+
+
+def remove_order(order):
+    """
+    Take a cancelled order out of the daily rollups, which then match what
+    `rebuild_rollups` computes.
+
+    Rows left without any order are deleted, since a rebuild would not
+    create them. Costs two queries per menu item and restaurant of the
+    order, which is fine for the occasional cancellation.
+    """
+    items, restaurants = stored_order_rows(order)
+    for model, rows, key_fields in (
+        (DailySalesRollup, items, ["restaurant", "menu_item", "day"]),
+        (DailyRestaurantRollup, restaurants, ["restaurant", "day"]),
+    ):
+        for row in rows:
+            rollup = model.objects.filter(**{name: row[name] for name in key_fields})
+            rollup.update(
+                **{
+                    name: F(name) - row[name]
+                    for name in ("quantity", "revenue", "orders")
+                }
+            )
+            rollup.filter(orders=0).delete()
+
+
+def rebuild_rollups(start, end, restaurant=None):
+    """
+    Recompute the rollups for days `start`..`end` (inclusive) from
+    OrderItem in bulk, replacing whatever is stored. Cancelled orders are
+    left out, as `remove_order` takes them out of the incremental rollups.
+
+    Args:
+        start (datetime.date): First day to rebuild.
+        end (datetime.date): Last day to rebuild.
+        restaurant (int | None): Restrict the rebuild to one restaurant.
+
+    Returns:
+        tuple[int, int]: Number of item rows and restaurant rows written.
+    """
+    items = (
+        OrderItem.objects.exclude(order__status="CANCELLED")
+        .annotate(day=TruncDate("order__order_date"))
+        .filter(day__gte=start, day__lte=end)
+    )
+    rollups = Q(day__gte=start, day__lte=end)
+    if restaurant is not None:
+        items = items.filter(menu_item__restaurant_id=restaurant)
+        rollups &= Q(restaurant_id=restaurant)
+
+    per_item = items.values("menu_item__restaurant_id", "menu_item_id", "day").annotate(
+        total_quantity=Sum("quantity"),
+        total_revenue=Sum("price"),
+        total_orders=Count("order_id", distinct=True),
+    )
+    per_restaurant = items.values("menu_item__restaurant_id", "day").annotate(
+        total_quantity=Sum("quantity"),
+        total_revenue=Sum("price"),
+        total_orders=Count("order_id", distinct=True),
+    )
+
+    with transaction.atomic():
+        DailySalesRollup.objects.filter(rollups).delete()
+        DailyRestaurantRollup.objects.filter(rollups).delete()
+        created_items = DailySalesRollup.objects.bulk_create(
+            [
+                DailySalesRollup(
+                    restaurant_id=row["menu_item__restaurant_id"],
+                    menu_item_id=row["menu_item_id"],
+                    day=row["day"],
+                    quantity=row["total_quantity"],
+                    revenue=row["total_revenue"],
+                    orders=row["total_orders"],
+                )
+                for row in per_item.iterator()
+            ],
+            batch_size=1000,
+        )
+        created_restaurants = DailyRestaurantRollup.objects.bulk_create(
+            [
+                DailyRestaurantRollup(
+                    restaurant_id=row["menu_item__restaurant_id"],
+                    day=row["day"],
+                    quantity=row["total_quantity"],
+                    revenue=row["total_revenue"],
+                    orders=row["total_orders"],
+                )
+                for row in per_restaurant.iterator()
+            ],
+            batch_size=1000,
+        )
+    return len(created_items), len(created_restaurants)
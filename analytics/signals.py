@@ -0,0 +1,32 @@
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from orders.models import Order
+from .services import remove_order, restore_order
+
+CANCELLED = "CANCELLED"
+
+
+@receiver(pre_save, sender=Order)
+def remember_order_status(sender, instance, raw, update_fields, **kwargs):
+    # Only an existing order whose status may change needs the lookup.
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and "status" not in update_fields:
+        return
+    instance._stored_status = (
+        Order.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Order)
+def update_rollups_on_cancel(sender, instance, raw, **kwargs):
+    # Keep the rollups in line with `rebuild_rollups`, which leaves cancelled
+    # orders out. `QuerySet.update()` sends no signal and bypasses this.
+    stored = instance.__dict__.pop("_stored_status", None)
+    if raw or stored is None:
+        return
+    if instance.status == CANCELLED and stored != CANCELLED:
+        remove_order(instance)
+    elif stored == CANCELLED and instance.status != CANCELLED:
+        restore_order(instance)
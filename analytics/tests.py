@@ -0,0 +1,179 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
+
+from cart.models import Cart
+from orders.models import Order
+from orders.services import place_order
+from orders.tests import OrderFixturesMixin
+from .models import DailyRestaurantRollup, DailySalesRollup
+from .services import rebuild_rollups
+from .views import RestaurantSalesView
+
+
+def snapshot():
+    return (
+        sorted(
+            DailySalesRollup.objects.values_list(
+                "restaurant_id", "menu_item_id", "day", "quantity", "revenue", "orders"
+            )
+        ),
+        sorted(
+            DailyRestaurantRollup.objects.values_list(
+                "restaurant_id", "day", "quantity", "revenue", "orders"
+            )
+        ),
+    )
+
+
+class RollupTestMixin(OrderFixturesMixin):
+    def setUp(self):
+        self.menu = self.create_menu(items=3)
+        self.restaurant = self.menu[0].restaurant
+        self.customer, self.other = self.create_customers(2)
+
+    def place(self, customer, menu, quantity=2):
+        self.fill_cart(customer, menu, quantity)
+        order = place_order(customer)
+        Cart.objects.filter(customer=customer).delete()
+        return order
+
+
+class RollupTests(RollupTestMixin, APITestCase):
+    def test_orders_update_rollups_incrementally(self):
+        self.place(self.customer, self.menu[:2])
+        self.place(self.other, self.menu[:1], quantity=3)
+
+        today = timezone.localdate()
+        first = DailySalesRollup.objects.get(menu_item=self.menu[0], day=today)
+        self.assertEqual(first.quantity, 5)
+        self.assertEqual(first.revenue, Decimal("15.00"))
+        self.assertEqual(first.orders, 2)
+        totals = DailyRestaurantRollup.objects.get(restaurant=self.restaurant)
+        self.assertEqual(totals.orders, 2)
+        self.assertEqual(totals.quantity, 7)
+        self.assertEqual(totals.revenue, Decimal("23.00"))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self.place(self.customer, self.menu)
+        self.place(self.other, self.menu[1:], quantity=4)
+        incremental = snapshot()
+        today = timezone.localdate()
+
+        DailySalesRollup.objects.update(quantity=0)
+        rebuild_rollups(today, today)
+
+        self.assertEqual(snapshot(), incremental)
+
+    def test_rebuild_skips_cancelled_orders(self):
+        order = self.place(self.customer, self.menu)
+        Order.objects.filter(pk=order.pk).update(status="CANCELLED")
+        today = timezone.localdate()
+
+        self.assertEqual(rebuild_rollups(today, today), (0, 0))
+        self.assertFalse(DailyRestaurantRollup.objects.exists())
+
+    def test_cancelling_an_order_matches_the_rebuild(self):
+        order = self.place(self.customer, self.menu)
+        self.place(self.other, self.menu[1:], quantity=4)
+        today = timezone.localdate()
+
+        for new_status in ("CANCELLED", "COMPLETED"):
+            with self.subTest(status=new_status):
+                order.status = new_status
+                order.save()
+                incremental = snapshot()
+                rebuild_rollups(today, today)
+                self.assertEqual(snapshot(), incremental)
+
+        order.status = "CANCELLED"
+        order.save()
+        self.assertFalse(
+            DailySalesRollup.objects.filter(menu_item=self.menu[0]).exists()
+        )
+        self.assertEqual(DailyRestaurantRollup.objects.get().orders, 1)
+
+    def test_rebuild_command(self):
+        self.place(self.customer, self.menu)
+        DailySalesRollup.objects.all().delete()
+        today = timezone.localdate().isoformat()
+        out = StringIO()
+
+        call_command(
+            "rebuild_sales_rollups",
+            "--from",
+            today,
+            "--to",
+            today,
+            "--restaurant",
+            str(self.restaurant.pk),
+            stdout=out,
+        )
+
+        self.assertIn("Rebuilt 3 item rollups and 1 restaurant rollups", out.getvalue())
+        self.assertEqual(DailySalesRollup.objects.count(), 3)
+
+
+class RestaurantSalesViewTests(RollupTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("restaurant-sales", args=[self.restaurant.pk])
+
+    def test_owner_gets_daily_series_and_top_items(self):
+        self.place(self.customer, self.menu[:2])
+        self.place(self.other, self.menu[2:], quantity=5)
+        self.client.force_authenticate(self.restaurant.owner)
+
+        response = self.client.get(self.url, {"top": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["orders"], 2)
+        self.assertEqual(data["revenue"], "39.00")
+        self.assertEqual(data["average_basket"], "19.50")
+        self.assertEqual(len(data["daily"]), 1)
+        self.assertEqual(
+            [item["menu_item"] for item in data["top_items"]],
+            [self.menu[2].pk, self.menu[1].pk],
+        )
+
+    def test_range_excludes_other_days(self):
+        self.place(self.customer, self.menu)
+        self.client.force_authenticate(self.restaurant.owner)
+        yesterday = timezone.localdate() - timedelta(days=1)
+
+        response = self.client.get(
+            self.url, {"start": yesterday - timedelta(days=5), "end": yesterday}
+        )
+
+        self.assertEqual(response.data["data"]["orders"], 0)
+        self.assertEqual(response.data["data"]["average_basket"], "0.00")
+
+    def test_invalid_range(self):
+        self.client.force_authenticate(self.restaurant.owner)
+        response = self.client.get(
+            self.url, {"start": "2025-02-01", "end": "2025-01-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_only_the_owner_can_see_analytics(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        view = RestaurantSalesView.as_view()
+        for _ in range(5):
+            self.place(self.customer, self.menu)
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, user=self.restaurant.owner)
+        # Ownership check, daily series and top items.
+        with self.assertNumQueries(3):
+            response = view(request, pk=self.restaurant.pk)
+        self.assertEqual(response.data["data"]["orders"], 5)
@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import RestaurantSalesView
+
+urlpatterns = [
+    path(
+        "restaurants/<int:pk>/analytics/",
+        RestaurantSalesView.as_view(),
+        name="restaurant-sales",
+    ),
+]
@@ -0,0 +1,101 @@
+from decimal import Decimal
+
+from django.db.models import F, Sum
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from restaurants.models import Restaurants
+from .models import DailyRestaurantRollup, DailySalesRollup
+from .serializers import (
+    DailyRevenueSerializer,
+    SalesRangeSerializer,
+    TopMenuItemSerializer,
+)
+
+
+@extend_schema(tags=["analytics"], parameters=[SalesRangeSerializer])
+class RestaurantSalesView(GenericAPIView):
+    """
+    Sales dashboard for a restaurant owned by the authenticated user.
+
+    Answers from the daily rollup tables instead of scanning OrderItem, so
+    the cost depends on the number of days in the range, not on how many
+    orders were placed.
+
+    Methods:
+        get(request, pk): Return revenue per day, top menu items and the
+            average basket for a date range.
+    """
+
+    serializer_class = SalesRangeSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        """
+        Retrieve sales analytics for a restaurant owned by the user.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Optional query params: `start` and `end` (YYYY-MM-DD,
+                inclusive, default the last 30 days) and `top` (number of
+                menu items to rank, default 10, max 50).
+            pk (int): Path parameter for the restaurant primary key.
+
+        Returns:
+            rest_framework.response.Response: JSON response with the
+            per-day series, the top menu items by revenue and the range
+            totals including the average basket (HTTP 200).
+
+        Raises:
+            Http404 if the restaurant does not exist or is not owned by user.
+            ValidationError (HTTP 400) for malformed or oversized ranges.
+        """
+        get_object_or_404(Restaurants.objects.only("id"), pk=pk, owner=request.user)
+        params = self.serializer_class(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = params.validated_data["start"], params.validated_data["end"]
+
+        days = list(
+            DailyRestaurantRollup.objects.filter(
+                restaurant_id=pk, day__range=(start, end)
+            )
+            .order_by("day")
+            .values("day", "orders", "quantity", "revenue")
+        )
+        top_items = (
+            DailySalesRollup.objects.filter(restaurant_id=pk, day__range=(start, end))
+            .values("menu_item")
+            .annotate(
+                name=F("menu_item__name"),
+                total_quantity=Sum("quantity"),
+                total_revenue=Sum("revenue"),
+            )
+            .order_by("-total_revenue", "menu_item")[: params.validated_data["top"]]
+        )
+
+        orders = sum(day["orders"] for day in days)
+        revenue = sum((day["revenue"] for day in days), Decimal("0.00"))
+        average_basket = (
+            (revenue / orders).quantize(Decimal("0.01")) if orders else Decimal("0.00")
+        )
+        return Response(
+            {
+                "msg": "Restaurant sales",
+                "data": {
+                    "start": start,
+                    "end": end,
+                    "orders": orders,
+                    "quantity": sum(day["quantity"] for day in days),
+                    "revenue": str(revenue),
+                    "average_basket": str(average_basket),
+                    "daily": DailyRevenueSerializer(days, many=True).data,
+                    "top_items": TopMenuItemSerializer(top_items, many=True).data,
+                },
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
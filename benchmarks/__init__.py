@@ -0,0 +1,92 @@
+"""
+Benchmark scripts for the Multi Restaurant API.
+
+Each module is runnable from the project root, e.g.::
+
+    python -m benchmarks.catalogue
+
+Benchmarks run against a throwaway test database created from the current
+settings, so the development `db.sqlite3` is never touched.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup():
+    """
+    Configure Django for a standalone benchmark script.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """
+    Create a fresh test database for the duration of the block.
+    """
+    from django.db import connection
+    from django.test.utils import (
+        setup_test_environment,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat=50, warmup=5):
+    """
+    Call `func` repeatedly and return the wall-clock samples in ms.
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, pct):
+    """
+    Return the `pct` percentile of `samples` (nearest-rank).
+    """
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """
+    Return p50/p95/p99 and mean latency for a list of samples in ms.
+    """
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def report(label, samples):
+    """
+    Print a one-line latency summary for `samples`.
+    """
+    stats = summarize(samples)
+    print(
+        f"{label:<40} p50={stats['p50_ms']:>8.3f}ms "
+        f"p95={stats['p95_ms']:>8.3f}ms p99={stats['p99_ms']:>8.3f}ms"
+    )
@@ -0,0 +1,307 @@
+"""
+Concurrency scaling of the read endpoints under ASGI and WSGI.
+
+Seeds a throwaway database with `seeding.generator`, then starts the
+project twice on localhost, one server at a time:
+
+    asgi  uvicorn serving `config.asgi`, where the restaurant detail, menu
+          and cart GETs are the async views of `config.urls_async`
+    wsgi  a threaded wsgiref server (Django's runserver server class)
+          serving `config.wsgi`, the sync DRF views, one thread per request
+
+and fires GET requests at each with an asyncio client at increasing
+concurrency. Requests cycle through the three endpoints, authenticated
+with the JWT of an owner (restaurant detail) or a customer with a cart,
+and open a fresh connection each. For every server and concurrency level
+the script prints p50/p95/p99 latency, throughput and errors, overall
+and per endpoint.
+
+Both servers run in one process with DEBUG off and sampled profiling
+off. The client runs on the same machine, so on a small box it competes
+with the server for CPU; compare the two servers against each other
+rather than reading the numbers as absolute capacity.
+
+Usage:
+    python -m benchmarks.asgi [--concurrency 1 8 32 64] [--requests 1000]
+        [--restaurants 50] [--menu-items 30] [--customers 200]
+        [--servers asgi wsgi] [--port 8765] [--output result.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks import setup, summarize, test_database
+
+HOST = "127.0.0.1"
+SERVERS = ("asgi", "wsgi")
+
+
+def seed(options):
+    """
+    Insert the data set and return the requests to replay.
+
+    Returns:
+        list[tuple[str, str, str]]: (endpoint, path, bearer token) triples,
+        cycling through restaurant detail, menu and cart.
+    """
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from cart.models import Cart
+    from restaurants.models import Restaurants
+    from seeding.generator import make_plan, seed as insert
+
+    plan = make_plan(
+        {
+            "owners": options.restaurants,
+            "customers": options.customers,
+            "restaurants": options.restaurants,
+            "menu_items": options.menu_items,
+            "carts": options.customers,
+            "orders": 0,
+        },
+        seed=options.seed,
+        password="seed-password",
+    )
+    insert(plan, workers=0)
+
+    def token(user):
+        return str(RefreshToken.for_user(user).access_token)
+
+    rng = random.Random(options.seed)
+    restaurants = list(Restaurants.objects.select_related("owner"))
+    carts = list(Cart.objects.select_related("customer"))
+    requests = []
+    for _ in range(options.users):
+        restaurant = rng.choice(restaurants)
+        owner = token(restaurant.owner)
+        customer = token(rng.choice(carts).customer)
+        requests += [
+            ("restaurant-detail", f"/api/v1/restaurants/{restaurant.pk}/", owner),
+            (
+                "menu",
+                f"/api/v1/restaurants/{rng.choice(restaurants).pk}/menu/",
+                customer,
+            ),
+            ("cart", "/api/v1/cart/", customer),
+        ]
+    return requests
+
+
+def serve(kind, port, database):
+    """
+    Run the `kind` server until killed; the entry point of the server
+    subprocess.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from django.conf import settings
+
+    # Before django.setup(): point at the seeded database and drop the
+    # development-only overhead.
+    settings.DATABASES["default"]["NAME"] = database
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = [HOST]
+    settings.PROFILING = {**settings.PROFILING, "ENABLED": False}
+    settings.QUERY_BUDGET = {**settings.QUERY_BUDGET, "ACTION": None}
+
+    if kind == "asgi":
+        import uvicorn
+
+        from config.asgi import application
+
+        uvicorn.run(
+            application,
+            host=HOST,
+            port=port,
+            lifespan="off",
+            access_log=False,
+            log_level="warning",
+        )
+        return
+
+    import logging
+
+    from django.core.servers.basehttp import WSGIServer, run
+
+    from config.wsgi import application
+
+    class Server(WSGIServer):
+        request_queue_size = 1024
+
+    logging.getLogger("django.server").setLevel(logging.WARNING)
+    run(HOST, port, application, threading=True, server_cls=Server)
+
+
+def start(kind, port, database):
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.asgi",
+            "--serve",
+            kind,
+            "--port",
+            str(port),
+            "--database",
+            str(database),
+        ],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{kind} server exited with {process.returncode}")
+        try:
+            socket.create_connection((HOST, port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+async def fetch(port, path, token):
+    """
+    GET `path` on a new connection and return the status code.
+    """
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\n"
+            f"Authorization: Bearer {token}\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(port, requests, total, concurrency):
+    """
+    Send `total` requests with `concurrency` of them in flight at a time.
+
+    Returns:
+        tuple: ({endpoint: [latency ms]}, {endpoint: errors}, seconds).
+    """
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    cursor = iter(range(total))
+
+    async def worker():
+        for number in cursor:
+            endpoint, path, token = requests[number % len(requests)]
+            start = time.perf_counter()
+            try:
+                status = await fetch(port, path, token)
+            except (OSError, IndexError, ValueError):
+                status = None
+            samples[endpoint].append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors[endpoint] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, errors, time.perf_counter() - start
+
+
+def measure_server(kind, port, database, requests, options):
+    process = start(kind, port, database)
+    try:
+        # Warm the menu cache, the user cache and the ORM in the server.
+        asyncio.run(load(port, requests, len(requests), 4))
+        levels = {}
+        for concurrency in options.concurrency:
+            samples, errors, seconds = asyncio.run(
+                load(port, requests, options.requests, concurrency)
+            )
+            everything = [value for values in samples.values() for value in values]
+            levels[concurrency] = {
+                **summarize(everything),
+                "throughput_rps": round(len(everything) / seconds, 1),
+                "errors": sum(errors.values()),
+                "endpoints": {
+                    endpoint: {**summarize(values), "errors": errors[endpoint]}
+                    for endpoint, values in sorted(samples.items())
+                },
+            }
+            print(
+                f"{kind} c={concurrency:<4} "
+                f"p50={levels[concurrency]['p50_ms']:>8.2f}ms "
+                f"p95={levels[concurrency]['p95_ms']:>8.2f}ms "
+                f"p99={levels[concurrency]['p99_ms']:>8.2f}ms "
+                f"{levels[concurrency]['throughput_rps']:>7.1f} req/s "
+                f"err={levels[concurrency]['errors']}",
+                file=sys.stderr,
+            )
+        return levels
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument(
+        "--requests", type=int, default=1000, help="Requests per level."
+    )
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--menu-items", type=int, default=30)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=100,
+        help="Distinct owner/customer request triples to cycle through.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=SERVERS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Write the JSON result here.")
+    parser.add_argument("--serve", choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port, args.database)
+        return
+    if min(args.restaurants, args.customers, args.users, args.requests) < 1:
+        parser.error("counts must be positive")
+
+    setup()
+    from django.db import connection
+
+    with test_database():
+        requests = seed(args)
+        database = connection.settings_dict["NAME"]
+        connection.close()
+        result = {
+            "options": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("serve", "database", "output")
+            },
+            "servers": {
+                kind: measure_server(kind, args.port, database, requests, args)
+                for kind in args.servers
+            },
+        }
+
+    document = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
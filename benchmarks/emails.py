@@ -0,0 +1,81 @@
+"""
+Activation email rendering benchmark.
+
+Sends N activation emails to the locmem email backend, once with Djoser's
+ActivationEmail rendering the template on every send and once with
+users.email.CustomActivationEmail rendering from its compiled template,
+and reports the per-email render time and the send time of each.
+
+Usage:
+    python -m benchmarks.emails [--emails 10000]
+"""
+
+import argparse
+
+from benchmarks import measure, report, setup, test_database
+
+
+def run(count):
+    from django.core import mail
+    from django.test import RequestFactory
+    from djoser.email import ActivationEmail
+
+    from users.email import CustomActivationEmail
+    from users.models import User
+
+    # Unsaved users are enough: the email only needs a pk and token inputs.
+    users = [
+        User(pk=i, email=f"user{i}@example.com", first_name="Bench", password="!")
+        for i in range(count)
+    ]
+    request = RequestFactory().get("/")
+
+    def plain(user):
+        return ActivationEmail(
+            request,
+            {"user": user},
+            template_name=CustomActivationEmail.template_name,
+        )
+
+    def compiled(user):
+        return CustomActivationEmail(request, {"user": user})
+
+    print(f"{count} activation emails")
+    # test_database() also switches EMAIL_BACKEND to locmem.
+    for label, build in (("djoser", plain), ("compiled", compiled)):
+        pending = iter(users)
+
+        def render():
+            build(next(pending)).render()
+
+        report(
+            f"{label} render per email",
+            measure(render, repeat=count - 10, warmup=10),
+        )
+
+        mail.outbox = []
+        pending = iter(users)
+
+        def send():
+            user = next(pending)
+            build(user).send([user.email])
+
+        report(
+            f"{label} render + send per email",
+            measure(send, repeat=count - 10, warmup=10),
+        )
+        assert len(mail.outbox) == count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--emails", type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.emails)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Read serializer throughput benchmark.
+
+Seeds N menu items and serializes all of them with MenuSerializers, the
+DRF ModelSerializer, and with its FastSerializer counterpart, both end to
+end (query + serialize) and for serialization alone on rows loaded
+beforehand. Prints latency and rows per second for each, and checks that
+both produce the same output.
+
+Usage:
+    python -m benchmarks.fast_serializers [--rows 10000] [--repeat 20]
+"""
+
+import argparse
+import statistics
+
+from benchmarks import measure, report, setup, test_database
+
+
+def seed(rows):
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    restaurant = Restaurants.objects.create(
+        name="Bench Kitchen",
+        owner=owner,
+        description="Synthetic restaurant",
+        address="1 Benchmark Street",
+        phone_number="0244000000",
+    )
+    Menu.objects.bulk_create(
+        [
+            Menu(
+                name=f"Dish {i}",
+                description="Synthetic menu item",
+                price=f"{i % 100}.{i % 100:02d}",
+                is_available=i % 10 != 0,
+                restaurant=restaurant,
+            )
+            for i in range(rows)
+        ],
+        batch_size=1000,
+    )
+
+
+def throughput(label, rows, samples):
+    report(label, samples)
+    print(f"{'':<40} {rows / statistics.fmean(samples) * 1000:>12,.0f} rows/s")
+
+
+def run(rows, repeat):
+    from config.serializers import FastSerializer
+    from restaurants.models import Menu
+    from restaurants.serializers import MenuSerializers
+
+    seed(rows)
+    queryset = Menu.objects.order_by("id")
+    fast = FastSerializer.for_serializer(MenuSerializers)
+
+    instances = list(queryset)
+    values = list(fast.values(queryset))
+    assert fast.serialize(values) == MenuSerializers(instances, many=True).data
+
+    print(f"{rows} menu items")
+    for label, func in (
+        (
+            "ModelSerializer, query + serialize",
+            lambda: MenuSerializers(list(queryset), many=True).data,
+        ),
+        (
+            "FastSerializer, query + serialize",
+            lambda: fast.serialize(fast.values(queryset)),
+        ),
+        (
+            "ModelSerializer, serialize only",
+            lambda: MenuSerializers(instances, many=True).data,
+        ),
+        ("FastSerializer, serialize only", lambda: fast.serialize(values)),
+    ):
+        throughput(label, rows, measure(func, repeat=repeat, warmup=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+End-to-end API load test.
+
+Seeds a throwaway database with synthetic owners, restaurants, menus and
+customers (some with a filled cart, most with past orders), then replays
+customer sessions through the Django test client, so every request goes
+through the full middleware, authentication and rendering stack:
+
+    register -> activate -> log in (new customers only)
+    catalogue -> public menu (and a 304 revisit) -> menu search
+    add to cart -> view cart -> check out -> order history
+
+Restaurants are picked with Zipfian popularity, so a few of them get most
+of the traffic, as in production. Each request is timed and its queries
+counted with `config.querybudget.track_queries`. The results per endpoint
+(count, errors, p50/p95/p99, mean, throughput and queries per request) are
+written as JSON. Pass a previous result with `--compare` to list the
+endpoints whose p95 grew by more than `--tolerance` or that run more
+queries; the exit status is 1 when there are any.
+
+Sessions run one after the other, so the latencies are per-request
+service times rather than behaviour under concurrency. Sampled profiling
+is turned off and query budget violations are logged instead of raised
+for the run.
+
+Usage:
+    python -m benchmarks.load [--sessions 50] [--new-ratio 0.25]
+        [--owners 10] [--restaurants 50] [--menu-items 30]
+        [--customers 200] [--carts 50] [--orders 1000] [--seed 0]
+        [--fast-hasher] [--output result.json] [--compare baseline.json]
+        [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from benchmarks import setup, summarize, test_database
+
+PASSWORD = "Kente#Weave-8841"
+
+
+def zipf_weights(n, s=1.1):
+    """
+    Return Zipfian weights for ranks 1..n: the k-th item is picked in
+    proportion to 1 / k**s.
+    """
+    return [1 / rank**s for rank in range(1, n + 1)]
+
+
+def seed(options, rng):
+    """
+    Bulk-insert the synthetic data set and return what the sessions need.
+
+    Returns:
+        dict: `restaurants` (ids in popularity order), `menus` (restaurant
+        id to available menu item ids and prices), `words` (dish names to
+        search for), `customers` (emails of seeded customers) and `counts`
+        (rows per model).
+    """
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+
+    from cart.models import Cart, CartItem
+    from customer.snapshots import build_snapshot
+    from orders.models import Order, OrderItem
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    password = make_password(PASSWORD)
+    dishes = ["Jollof", "Waakye", "Banku", "Fufu", "Kenkey", "Kelewele", "Red Red"]
+    with transaction.atomic():
+        owners = User.objects.bulk_create(
+            User(
+                email=f"owner{i}@load.test",
+                password=password,
+                first_name="Owner",
+                last_name=str(i),
+                role="owner",
+            )
+            for i in range(options.owners)
+        )
+        restaurants = Restaurants.objects.bulk_create(
+            Restaurants(
+                name=f"Kitchen {i}",
+                owner=owners[i % len(owners)],
+                description="Synthetic restaurant",
+                address=f"{i} Load Test Street, Accra",
+                phone_number="0244000000",
+            )
+            for i in range(options.restaurants)
+        )
+        items = Menu.objects.bulk_create(
+            Menu(
+                name=f"{dishes[i % len(dishes)]} {i}",
+                description="Synthetic menu item with a longer description",
+                price=Decimal(rng.randrange(500, 10000)) / 100,
+                is_available=rng.random() > 0.1,
+                restaurant=restaurant,
+            )
+            for restaurant in restaurants
+            for i in range(options.menu_items)
+        )
+        customers = User.objects.bulk_create(
+            User(
+                email=f"customer{i}@load.test",
+                password=password,
+                first_name="Customer",
+                last_name=str(i),
+            )
+            for i in range(options.customers)
+        )
+
+        menus = defaultdict(list)
+        for item in items:
+            if item.is_available:
+                menus[item.restaurant_id].append((item.pk, item.price))
+        ranked = [r.pk for r in restaurants if menus[r.pk]]
+        weights = zipf_weights(len(ranked))
+
+        def basket():
+            restaurant = rng.choices(ranked, weights)[0]
+            return rng.sample(menus[restaurant], min(3, len(menus[restaurant])))
+
+        carts = Cart.objects.bulk_create(
+            Cart(customer=customer) for customer in customers[: options.carts]
+        )
+        cart_items = [
+            CartItem(cart=cart, menu_item_id=pk, quantity=1, price=price)
+            for cart in carts
+            for pk, price in basket()
+        ]
+        CartItem.objects.bulk_create(cart_items)
+
+        baskets = [basket() for _ in range(options.orders)] if customers else []
+        orders = Order.objects.bulk_create(
+            Order(
+                customer=rng.choice(customers),
+                status="COMPLETED",
+                total_amount=sum(price for _, price in lines),
+            )
+            for lines in baskets
+        )
+        order_items = [
+            OrderItem(order=order, menu_item_id=pk, quantity=1, price=price)
+            for order, lines in zip(orders, baskets)
+            for pk, price in lines
+        ]
+        OrderItem.objects.bulk_create(order_items)
+
+    # bulk_create sends no signals; build the public menus up front so
+    # the first session does not pay for them.
+    for restaurant in restaurants:
+        build_snapshot(restaurant.pk)
+
+    return {
+        "restaurants": ranked,
+        "weights": weights,
+        "menus": menus,
+        "words": dishes,
+        "customers": [customer.email for customer in customers],
+        "counts": {
+            "users": len(owners) + len(customers),
+            "restaurants": len(restaurants),
+            "menu_items": len(items),
+            "carts": len(carts),
+            "cart_items": len(cart_items),
+            "orders": len(orders),
+            "order_items": len(order_items),
+        },
+    }
+
+
+class Recorder:
+    """
+    Send requests through a test client, recording per endpoint the
+    latency, query count and unexpected statuses.
+
+    Endpoints are named by method and URL name, e.g. `GET cart-detail`.
+    """
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = Counter()
+
+    def request(self, client, method, path, expected, **kwargs):
+        from django.urls import resolve
+
+        from config.querybudget import track_queries
+
+        name = f"{method.upper()} {resolve(path).url_name}"
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = getattr(client, method)(path, **kwargs)
+        self.samples[name].append((time.perf_counter() - start) * 1000)
+        self.queries[name].append(stats.count)
+        if response.status_code != expected:
+            self.errors[name] += 1
+        return response
+
+    def results(self):
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            queries = self.queries[name]
+            endpoints[name] = {
+                "count": len(samples),
+                "errors": self.errors[name],
+                **summarize(samples),
+                "throughput_rps": round(len(samples) / (sum(samples) / 1000), 1),
+                "queries_mean": round(sum(queries) / len(queries), 2),
+                "queries_max": max(queries),
+            }
+        return endpoints
+
+
+def session(recorder, data, rng, number, new):
+    """
+    Replay one customer session.
+
+    Args:
+        recorder (Recorder): Records every request.
+        data (dict): What `seed` returned.
+        rng (random.Random): Drives the session's choices.
+        number (int): Position of the session in the run.
+        new (bool): Register and activate a new account first, instead of
+            logging in as a seeded customer.
+    """
+    from django.contrib.auth.tokens import default_token_generator
+    from djoser.utils import encode_uid
+    from rest_framework.test import APIClient
+
+    from users.models import User
+
+    client = APIClient()
+    if new:
+        email = f"new{number}@load.test"
+        response = recorder.request(
+            client,
+            "post",
+            "/api/v1/register/",
+            201,
+            data={
+                "email": email,
+                "password": PASSWORD,
+                "first_name": "New",
+                "last_name": "Customer",
+                "user_profile": {
+                    "other_name": "Load",
+                    "date_of_birth": "1990-01-01",
+                    "phone_number": "0244000000",
+                },
+            },
+            format="json",
+        )
+        if response.status_code != 201:
+            return
+        # What the link in the activation email carries.
+        user = User.objects.get(email=email)
+        recorder.request(
+            client,
+            "post",
+            "/api/v1/users/activation/",
+            204,
+            data={
+                "uid": encode_uid(user.pk),
+                "token": default_token_generator.make_token(user),
+            },
+            format="json",
+        )
+    else:
+        email = rng.choice(data["customers"])
+
+    response = recorder.request(
+        client,
+        "post",
+        "/api/v1/jwt/create/",
+        200,
+        data={"email": email, "password": PASSWORD},
+        format="json",
+    )
+    if response.status_code != 200:
+        return
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+
+    recorder.request(client, "get", "/api/v1/restaurants/catalogue/", 200)
+    restaurant = rng.choices(data["restaurants"], data["weights"])[0]
+    menu_path = f"/api/v1/customer/restaurants/{restaurant}/menu/"
+    etag = recorder.request(client, "get", menu_path, 200)["ETag"]
+    recorder.request(client, "get", menu_path, 304, HTTP_IF_NONE_MATCH=etag)
+    recorder.request(
+        client,
+        "get",
+        "/api/v1/search/menu/",
+        200,
+        data={"q": rng.choice(data["words"])[:3]},
+    )
+
+    menu = data["menus"][restaurant]
+    for pk, _ in rng.sample(menu, min(rng.randint(1, 4), len(menu))):
+        recorder.request(
+            client,
+            "post",
+            "/api/v1/cart/items/",
+            201,
+            data={"menu_item": pk, "quantity": rng.randint(1, 3)},
+            format="json",
+        )
+    recorder.request(client, "get", "/api/v1/cart/", 200)
+    recorder.request(
+        client,
+        "post",
+        "/api/v1/order/create/",
+        201,
+        HTTP_IDEMPOTENCY_KEY=str(uuid.UUID(int=rng.getrandbits(128))),
+    )
+    recorder.request(client, "get", "/api/v1/orders/", 200)
+
+
+def run(options):
+    """
+    Seed, replay the sessions and return the result document.
+    """
+    import django
+    from django.db import connection
+    from django.test.utils import override_settings
+
+    rng = random.Random(options.seed)
+    overrides = {
+        "PROFILING": {"ENABLED": False},
+        "QUERY_BUDGET": {"ACTION": "log"},
+    }
+    if options.fast_hasher:
+        overrides["PASSWORD_HASHERS"] = [
+            "django.contrib.auth.hashers.MD5PasswordHasher"
+        ]
+
+    with override_settings(**overrides):
+        start = time.perf_counter()
+        data = seed(options, rng)
+        seeded = time.perf_counter() - start
+
+        recorder = Recorder()
+        start = time.perf_counter()
+        for number in range(options.sessions):
+            new = rng.random() < options.new_ratio
+            session(recorder, data, rng, number, new)
+        elapsed = time.perf_counter() - start
+
+    endpoints = recorder.results()
+    requests = sum(endpoint["count"] for endpoint in endpoints.values())
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "options": vars(options) | {"compare": None, "output": None},
+        },
+        "seed": {**data["counts"], "seconds": round(seeded, 2)},
+        "totals": {
+            "sessions": options.sessions,
+            "requests": requests,
+            "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+            "seconds": round(elapsed, 2),
+            "throughput_rps": round(requests / elapsed, 1),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    Return a line per endpoint whose p95 grew by more than `tolerance`
+    (a fraction) or that runs more queries per request than in `baseline`.
+    """
+    regressions = []
+    for name, current in result["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {before['p95_ms']:.3f}ms -> {current['p95_ms']:.3f}ms"
+            )
+        if current["queries_mean"] > before["queries_mean"]:
+            regressions.append(
+                f"{name}: queries {before['queries_mean']} -> "
+                f"{current['queries_mean']}"
+            )
+    return regressions
+
+
+def print_summary(result, stream):
+    for name, endpoint in result["endpoints"].items():
+        print(
+            f"{name:<40} n={endpoint['count']:<5} "
+            f"p50={endpoint['p50_ms']:>8.3f}ms p95={endpoint['p95_ms']:>8.3f}ms "
+            f"p99={endpoint['p99_ms']:>8.3f}ms q={endpoint['queries_mean']:<5} "
+            f"err={endpoint['errors']}",
+            file=stream,
+        )
+    totals = result["totals"]
+    print(
+        f"{totals['requests']} requests in {totals['seconds']}s "
+        f"({totals['throughput_rps']} req/s), {totals['errors']} errors",
+        file=stream,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument(
+        "--new-ratio",
+        type=float,
+        default=0.25,
+        help="Share of sessions that register a new account.",
+    )
+    parser.add_argument("--owners", type=int, default=10)
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--menu-items", type=int, default=30)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--carts", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--fast-hasher",
+        action="store_true",
+        help="Hash passwords with MD5 so register and login do not dominate.",
+    )
+    parser.add_argument("--output", help="Write the JSON result here.")
+    parser.add_argument("--compare", help="A previous JSON result.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed p95 growth against --compare, as a fraction.",
+    )
+    args = parser.parse_args()
+    if args.customers < 1 or args.restaurants < 1 or args.owners < 1:
+        parser.error("--owners, --restaurants and --customers must be positive")
+    args.carts = min(args.carts, args.customers)
+
+    setup()
+    with test_database():
+        result = run(args)
+
+    print_summary(result, sys.stderr)
+    document = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(document + "\n")
+    else:
+        print(document)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(result, json.load(handle), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Bulk menu import benchmark.
+
+Imports N menu items into one restaurant through `POST
+restaurants/<pk>/menu/bulk/`, first as inserts and then again as updates
+of the same names, and compares with creating the first items one by one
+through `POST restaurants/<pk>/menu/`. Finally times the streaming CSV
+export of the whole menu.
+
+Usage:
+    python -m benchmarks.menu_import [--items 10000] [--single 200]
+"""
+
+import argparse
+import time
+
+from benchmarks import setup, test_database
+
+
+def timed(label, func, count):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:>8.2f}s {count / elapsed:>10.0f} items/s")
+    return result
+
+
+def run(items, single):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    restaurant = Restaurants.objects.create(
+        name="Kitchen",
+        owner=owner,
+        description="Synthetic restaurant",
+        address="1 Benchmark Street",
+        phone_number="0244000000",
+    )
+    client = APIClient()
+    client.force_authenticate(owner)
+    bulk_url = reverse("menu-bulk", args=[restaurant.pk])
+    create_url = reverse("menu-create", args=[restaurant.pk])
+
+    def batch(price):
+        return [
+            {
+                "name": f"Dish {i}",
+                "description": "Synthetic menu item",
+                "price": price,
+            }
+            for i in range(items)
+        ]
+
+    def one_by_one():
+        for item in batch("9.99")[:single]:
+            response = client.post(create_url, item, format="json")
+            assert response.status_code == 201, response.data
+
+    def bulk(price):
+        def post():
+            response = client.post(bulk_url, batch(price), format="json")
+            assert response.status_code == 200, response.data
+            return response.data["data"]
+
+        return post
+
+    print(f"{items} menu items")
+    timed(f"MenuCreateView x {single}", one_by_one, single)
+    Menu.objects.all().delete()
+    print("  ", timed("bulk insert", bulk("9.99"), items))
+    print("  ", timed("bulk update", bulk("10.50"), items))
+
+    def export():
+        response = client.get(bulk_url)
+        lines = sum(chunk.count(b"\n") for chunk in response.streaming_content)
+        assert lines == items + 1
+
+    timed("CSV export", export, items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--single", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.items, args.single)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Public menu snapshot benchmark.
+
+Seeds a restaurant with N menu items and times the customer menu view
+(one primary-key lookup of the stored snapshot) against building the
+same response from the restaurant/menu join on every request, as the
+view did before snapshots. Both must return identical bytes.
+
+Usage:
+    python -m benchmarks.menu_snapshot [--items 200]
+"""
+
+import argparse
+
+from benchmarks import measure, report, setup, test_database
+
+
+def seed(items):
+    from django.db import transaction
+
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    with transaction.atomic():
+        restaurant = Restaurants.objects.create(
+            name="Kitchen",
+            owner=owner,
+            description="Synthetic restaurant",
+            address="1 Benchmark Street",
+            phone_number="0244000000",
+        )
+        for i in range(items):
+            Menu.objects.create(
+                name=f"Dish {i}",
+                description="Synthetic menu item with a longer description",
+                price=f"{i % 100}.{i % 100:02d}",
+                restaurant=restaurant,
+            )
+    return restaurant
+
+
+def run(items):
+    from django.urls import reverse
+    from rest_framework.test import APIRequestFactory
+
+    from customer.snapshots import menu_rows, render_menu
+    from customer.views import CustomerMenuItemsView
+
+    restaurant = seed(items)
+    view = CustomerMenuItemsView.as_view()
+    request = APIRequestFactory().get(reverse("customer-menu", args=[restaurant.pk]))
+
+    def snapshot():
+        return view(request, restaurant_id=restaurant.pk).content
+
+    def join():
+        return render_menu(list(menu_rows(restaurant.pk)))[1]
+
+    assert snapshot() == join()
+    print(f"1 restaurant, {items} menu items")
+    report("join + render per request", measure(join, repeat=200))
+    report("snapshot view", measure(snapshot, repeat=200))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Order history pagination benchmark.
+
+Seeds one customer with N orders (several items each) and walks the whole
+history through OrderListView, recording the time and number of queries
+for every page. Both should stay flat from the first page to the last.
+
+Usage:
+    python -m benchmarks.order_history [--orders 10000] [--page-size 20]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+
+from benchmarks import report, setup, test_database
+
+
+def seed(orders, items_per_order):
+    from orders.models import Order, OrderItem
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    customer = User.objects.create(
+        email="bench-customer@example.com",
+        first_name="Bench",
+        last_name="Customer",
+    )
+    restaurant = Restaurants.objects.create(
+        name="Bench Kitchen",
+        owner=owner,
+        description="Synthetic restaurant",
+        address="1 Benchmark Street",
+        phone_number="0244000000",
+    )
+    menu = Menu.objects.bulk_create(
+        [
+            Menu(
+                name=f"Dish {i}",
+                description="Synthetic dish",
+                price=Decimal("5.00") + i,
+                restaurant=restaurant,
+            )
+            for i in range(items_per_order)
+        ]
+    )
+    batch = 2000
+    for start in range(0, orders, batch):
+        created = Order.objects.bulk_create(
+            [
+                Order(customer=customer, status="COMPLETED", total_amount=0)
+                for _ in range(start, min(start + batch, orders))
+            ]
+        )
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(order=order, menu_item=dish, quantity=1, price=dish.price)
+                for order in created
+                for dish in menu
+            ]
+        )
+    return customer
+
+
+def run(orders, page_size, items_per_order):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from orders.views import OrderListView
+
+    customer = seed(orders, items_per_order)
+    factory = APIRequestFactory()
+    view = OrderListView.as_view()
+
+    timings, queries = [], []
+    url = f"/api/v1/orders/?page_size={page_size}"
+    while url:
+        request = factory.get(url)
+        force_authenticate(request, user=customer)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = view(request)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        url = response.data["next"]
+
+    pages = len(timings)
+    print(f"{orders} orders x {items_per_order} items, {pages} pages of {page_size}")
+    print(f"queries per page: min={min(queries)} max={max(queries)}")
+    tenth = max(1, pages // 10)
+    report("first 10% of pages", timings[:tenth])
+    report("middle 10% of pages", timings[pages // 2 : pages // 2 + tenth])
+    report("last 10% of pages", timings[-tenth:])
+    report("all pages", timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--items-per-order", type=int, default=3)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.orders, args.page_size, args.items_per_order)
+
+
+if __name__ == "__main__":
+    main()
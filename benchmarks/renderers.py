@@ -0,0 +1,111 @@
+"""
+JSON renderer and parser benchmark.
+
+Serializes N restaurants with RestaurantsSerializers, each with its menu
+nested through MenuSerializers (Decimal prices and timestamps), and times
+rendering the payload with DRF's JSONRenderer and with FastJSONRenderer,
+then parsing it back with JSONParser and FastJSONParser. Both renderers
+must produce identical bytes.
+
+Usage:
+    python -m benchmarks.renderers [--restaurants 500] [--menu 20]
+"""
+
+import argparse
+import io
+
+from benchmarks import measure, report, setup, test_database
+
+
+def seed(restaurants, menu):
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    kitchens = Restaurants.objects.bulk_create(
+        [
+            Restaurants(
+                name=f"Kitchen {i}",
+                owner=owner,
+                description="Synthetic restaurant with a longer description",
+                address=f"{i} Benchmark Street",
+                phone_number="0244000000",
+            )
+            for i in range(restaurants)
+        ]
+    )
+    Menu.objects.bulk_create(
+        [
+            Menu(
+                name=f"Dish {i}",
+                description="Synthetic menu item",
+                price=f"{i % 100}.{i % 100:02d}",
+                restaurant=kitchen,
+            )
+            for kitchen in kitchens
+            for i in range(menu)
+        ],
+        batch_size=1000,
+    )
+
+
+def payload():
+    from collections import defaultdict
+
+    from restaurants.models import Menu, Restaurants
+    from restaurants.serializers import MenuSerializers, RestaurantsSerializers
+
+    menus = defaultdict(list)
+    for item in Menu.objects.order_by("id"):
+        menus[item.restaurant_id].append(item)
+    data = []
+    for restaurant in Restaurants.objects.order_by("id"):
+        row = RestaurantsSerializers(restaurant).data
+        row["menu"] = MenuSerializers(menus[restaurant.pk], many=True).data
+        data.append(row)
+    return {"msg": "All restaurants", "data": data, "status": True}
+
+
+def run(restaurants, menu):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from config.parsers import FastJSONParser
+    from config.renderers import FastJSONRenderer
+
+    seed(restaurants, menu)
+    data = payload()
+    body = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == body
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+
+    print(f"{restaurants} restaurants x {menu} menu items, {len(body):,} bytes")
+    for label, func in (
+        ("render JSONRenderer", lambda: JSONRenderer().render(data)),
+        ("render FastJSONRenderer", lambda: FastJSONRenderer().render(data)),
+        ("parse JSONParser", lambda: JSONParser().parse(io.BytesIO(body))),
+        ("parse FastJSONParser", lambda: FastJSONParser().parse(io.BytesIO(body))),
+    ):
+        report(label, measure(func))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--restaurants", type=int, default=500)
+    parser.add_argument("--menu", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.restaurants, args.menu)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Menu full-text search benchmark.
+
+Seeds N menu items whose names and descriptions are drawn from a small
+food vocabulary (so common prefixes match a large share of the table) and
+times MenuSearchView for selective, common and multi-word queries, next to
+the `icontains` scan the index replaces. The target is p99 under 20 ms at
+1M rows.
+
+Usage:
+    python -m benchmarks.search [--rows 1000000] [--page-size 20]
+"""
+
+import argparse
+import random
+
+from benchmarks import measure, report, setup, test_database
+
+DISHES = [
+    "jollof",
+    "waakye",
+    "banku",
+    "fufu",
+    "kenkey",
+    "kelewele",
+    "tilapia",
+    "omotuo",
+    "yam",
+    "plantain",
+    "groundnut",
+    "palava",
+    "shito",
+    "chicken",
+    "goat",
+    "beef",
+]
+WORDS = DISHES + [
+    "rice",
+    "beans",
+    "soup",
+    "stew",
+    "spicy",
+    "smoky",
+    "grilled",
+    "fried",
+    "pepper",
+    "sauce",
+    "served",
+    "with",
+    "fresh",
+    "house",
+    "special",
+]
+
+
+def seed(rows, restaurants=100):
+    from restaurants.models import Menu, Restaurants
+    from users.models import User
+
+    owner = User.objects.create(
+        email="bench-owner@example.com",
+        first_name="Bench",
+        last_name="Owner",
+        role="owner",
+    )
+    kitchens = Restaurants.objects.bulk_create(
+        [
+            Restaurants(
+                name=f"Kitchen {i}",
+                owner=owner,
+                description="Synthetic restaurant",
+                address=f"{i} Benchmark Street",
+                phone_number="0244000000",
+            )
+            for i in range(restaurants)
+        ]
+    )
+    rng = random.Random(42)
+    batch = 10_000
+    for start in range(0, rows, batch):
+        Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"{rng.choice(DISHES).title()} {i}",
+                    description=" ".join(rng.choices(WORDS, k=8)),
+                    price="10.00",
+                    is_available=rng.random() < 0.9,
+                    restaurant=kitchens[i % restaurants],
+                )
+                for i in range(start, min(start + batch, rows))
+            ]
+        )
+
+
+def run(rows, page_size):
+    from rest_framework.test import APIRequestFactory
+
+    from restaurants.models import Menu
+    from restaurants.views import MenuSearchView
+
+    seed(rows)
+    factory = APIRequestFactory()
+    view = MenuSearchView.as_view()
+
+    print(f"{rows} menu items, page size {page_size}")
+    for label, params in (
+        ("selective, ranked", {"q": "12345"}),
+        ("common prefix", {"q": "jol"}),
+        ("two words", {"q": "tilapia pep"}),
+        ("common + available", {"q": "jol", "available": "true"}),
+        ("description only", {"q": "smoky"}),
+    ):
+        params = {**params, "page_size": page_size}
+
+        def search():
+            response = view(factory.get("/api/v1/search/menu/", params))
+            assert response.status_code == 200, response.data
+
+        report(f"fts {label} ({params['q']!r})", measure(search))
+
+    deep = view(factory.get("/api/v1/search/menu/", {"q": "smoky pep"}))
+    for _ in range(50):
+        deep = view(factory.get(deep.data["next"]))
+
+    def next_page():
+        view(factory.get(deep.data["next"]))
+
+    report("fts 51st page ('smoky pep')", measure(next_page))
+
+    for term in ("jol", "12345"):
+
+        def scan():
+            list(Menu.objects.filter(name__icontains=term).order_by("id")[:page_size])
+
+        report(f"icontains scan ({term!r})", measure(scan, repeat=10, warmup=1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.page_size)
+
+
+if __name__ == "__main__":
+    main()
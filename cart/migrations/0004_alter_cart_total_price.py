@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0003_rename_user_cart_customer_alter_cartitem_price'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cart',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+    ]
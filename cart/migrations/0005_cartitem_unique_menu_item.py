@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-17 06:01
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_items(apps, schema_editor):
+    # Adding an item used to insert a new row each time; fold those rows
+    # into one per (cart, menu_item) before the unique constraint lands.
+    CartItem = apps.get_model("cart", "CartItem")
+    duplicates = (
+        CartItem.objects.values("cart_id", "menu_item_id")
+        .annotate(rows=Count("id"), keep=Min("id"), total=Sum("quantity"))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates:
+        rows = CartItem.objects.filter(
+            cart_id=group["cart_id"], menu_item_id=group["menu_item_id"]
+        )
+        rows.exclude(id=group["keep"]).delete()
+        rows.filter(id=group["keep"]).update(quantity=group["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0004_alter_cart_total_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'menu_item'), name='cart_item_unique_menu_item'),
+        ),
+    ]
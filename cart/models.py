@@ -1,35 +1,182 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from restaurants.models import Menu
 from users.models import User
 
 
+def items_total(prefix=""):
+    """
+    Return a `SUM(menu_item.price * quantity)` expression over cart items.
+
+    Args:
+        prefix (str): Lookup path from the queried model to CartItem, e.g.
+            "items__" when aggregating from Cart.
+    """
+    money = models.DecimalField(max_digits=10, decimal_places=2)
+    return Coalesce(
+        Sum(
+            F(f"{prefix}menu_item__price") * F(f"{prefix}quantity"),
+            output_field=money,
+        ),
+        Value(Decimal("0.00")),
+        output_field=money,
+    )
+
+
+class CartQuerySet(models.QuerySet):
+    def with_totals(self):
+        """
+        Annotate each cart with `items_total`, computed in the database.
+        """
+        return self.annotate(items_total=items_total("items__"))
+
+
 # Create your models here.
 class Cart(models.Model):
     customer = models.OneToOneField(User, on_delete=models.CASCADE)
-    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     added_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CartQuerySet.as_manager()
+
     def __str__(self):
         return self.customer.username
 
     def calculate_total_price(self):
-        total = sum(item.cart_item_price() for item in self.items.all())
+        """
+        Recompute and persist the cart total in two queries, regardless of
+        how many items the cart holds: one aggregate and one UPDATE of
+        `total_price` (and `updated_at`) only.
+        """
+        total = self.items.aggregate(total=items_total())["total"]
+        self.updated_at = timezone.now()
+        Cart.objects.filter(pk=self.pk).update(
+            total_price=total, updated_at=self.updated_at
+        )
         self.total_price = total
-        self.save()
         return self.total_price
 
 
+class CartItemQuerySet(models.QuerySet):
+    def add_item(self, cart, menu_item, quantity=1):
+        """
+        Add `quantity` of `menu_item` to `cart` and refresh the cart total.
+
+        The item is written in a single atomic upsert. On databases
+        supporting it (SQLite, PostgreSQL) this is one ``INSERT ... ON
+        CONFLICT (cart_id, menu_item_id) DO UPDATE SET quantity = quantity +
+        excluded.quantity RETURNING *`` round-trip, so concurrent adds of
+        the same dish can never lose an increment or create a second row.
+        Other databases fall back to an ``UPDATE ... SET quantity =
+        quantity + n`` followed by an INSERT when no row exists yet.
+
+        The cart row is locked first, as `cart.services.apply_batch` does,
+        so a single add and a batch on the same cart run one after the
+        other. `total_price` and `updated_at` are recomputed in the same
+        transaction.
+
+        Args:
+            cart (Cart): The cart to add to. Its `total_price` and
+                `updated_at` are refreshed.
+            menu_item (Menu): The dish being added.
+            quantity (int): How many to add.
+
+        Returns:
+            CartItem: The row as stored after the upsert.
+        """
+        connection = connections[self.db]
+        features = connection.features
+        with transaction.atomic(using=self.db):
+            # Taken before touching the items, like apply_batch.
+            list(
+                Cart.objects.using(self.db)
+                .select_for_update()
+                .filter(pk=cart.pk)
+                .values_list("pk")
+            )
+            if (
+                features.supports_update_conflicts_with_target
+                and features.can_return_columns_from_insert
+            ):
+                item = self._upsert(connection, cart, menu_item, quantity)
+            else:
+                item = self._update_or_insert(cart, menu_item, quantity)
+            cart.calculate_total_price()
+        return item
+
+    def _upsert(self, connection, cart, menu_item, quantity):
+        opts = self.model._meta
+        now = timezone.now()
+        qn = connection.ops.quote_name
+        table = qn(opts.db_table)
+        values = {
+            "cart": cart.pk,
+            "menu_item": menu_item.pk,
+            "quantity": quantity,
+            "price": Decimal("0.00"),
+            "added_at": now,
+            "updated_at": now,
+        }
+        fields = [opts.get_field(name) for name in values]
+        columns = [qn(field.column) for field in fields]
+        params = [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, values.values())
+        ]
+        quantity_column = qn(opts.get_field("quantity").column)
+        updated_column = qn(opts.get_field("updated_at").column)
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))}) "
+            f"ON CONFLICT ({columns[0]}, {columns[1]}) DO UPDATE SET "
+            f"{quantity_column} = {table}.{quantity_column} "
+            f"+ excluded.{quantity_column}, "
+            f"{updated_column} = excluded.{updated_column} "
+            f"RETURNING *"
+        )
+        item = next(iter(self.model.objects.using(self.db).raw(sql, params)))
+        item._state.adding = False
+        return item
+
+    def _update_or_insert(self, cart, menu_item, quantity):
+        lookup = {"cart": cart, "menu_item": menu_item}
+        increment = {"quantity": F("quantity") + quantity, "updated_at": timezone.now()}
+        with transaction.atomic(using=self.db):
+            if not self.filter(**lookup).update(**increment):
+                try:
+                    with transaction.atomic(using=self.db):
+                        return self.create(quantity=quantity, **lookup)
+                except IntegrityError:
+                    # Lost the race to insert; the row exists now.
+                    self.filter(**lookup).update(**increment)
+            return self.get(**lookup)
+
+
 class CartItem(models.Model):
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name="items")
     menu_item = models.ForeignKey(Menu, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     added_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CartItemQuerySet.as_manager()
 
     def cart_item_price(self):
         return self.menu_item.price * self.quantity
 
     def __str__(self):
         return f"{self.quantity} of {self.menu_item.name} in {self.cart.customer.username}'s cart"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cart", "menu_item"], name="cart_item_unique_menu_item"
+            ),
+        ]
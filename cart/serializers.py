@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from restaurants.models import Menu
 from .models import Cart, CartItem
 
 
@@ -12,11 +14,14 @@ class CartItemSerializer(serializers.ModelSerializer):
             "price",
             "added_at",
         ]
-        read_only_fields = ["added_at"]
+        read_only_fields = ["cart", "price", "added_at"]
+        extra_kwargs = {"quantity": {"min_value": 1}}
 
 
 class CartSerializer(serializers.ModelSerializer):
-    cart_items = CartItemSerializer(many=True, read_only=True, required=False)
+    cart_items = CartItemSerializer(
+        source="items", many=True, read_only=True, required=False
+    )
 
     class Meta:
         model = Cart
@@ -27,3 +32,48 @@ class CartSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["total_price", "added_at", "updated_at"]
+
+
+class CartBatchOperationSerializer(serializers.Serializer):
+    OPERATIONS = [
+        ("add", "Add quantity to the item"),
+        ("set", "Set the item quantity (0 removes it)"),
+        ("remove", "Remove the item"),
+    ]
+
+    menu_item = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=0, default=1)
+    op = serializers.ChoiceField(choices=OPERATIONS, default="add")
+
+    def validate(self, attrs):
+        if attrs["op"] == "add" and attrs["quantity"] < 1:
+            raise serializers.ValidationError(
+                {"quantity": "Must be at least 1 when adding."}
+            )
+        return attrs
+
+
+class CartBatchSerializer(serializers.Serializer):
+    operations = CartBatchOperationSerializer(many=True, allow_empty=False)
+
+    max_operations = 100
+
+    def validate_operations(self, operations):
+        """
+        Check every referenced menu item exists with a single query and
+        attach the Menu instances to the operations.
+        """
+        if len(operations) > self.max_operations:
+            raise serializers.ValidationError(
+                f"At most {self.max_operations} operations per batch."
+            )
+        ids = {operation["menu_item"] for operation in operations}
+        menu = Menu.objects.only("id").in_bulk(ids)
+        missing = sorted(ids - menu.keys())
+        if missing:
+            raise serializers.ValidationError(
+                f"Unknown menu items: {', '.join(map(str, missing))}"
+            )
+        for operation in operations:
+            operation["menu_item"] = menu[operation["menu_item"]]
+        return operations
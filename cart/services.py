@@ -0,0 +1,76 @@
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+
+from .models import Cart, CartItem
+
+
+def apply_batch(customer, operations):
+    """
+    Apply a list of cart operations atomically and return the updated cart.
+
+    Operations on the same menu item are folded in order into one final
+    quantity, then written with at most one bulk INSERT, one bulk UPDATE
+    and one DELETE. The cart and the affected items are locked for the
+    duration, so concurrent single-item adds are not lost.
+
+    Args:
+        customer (users.models.User): Owner of the cart.
+        operations (list[dict]): Validated operations, each with a
+            `menu_item` (Menu instance), `quantity` and `op` of "add",
+            "set" or "remove".
+
+    Returns:
+        Cart: The cart with its recomputed `total_price` and prefetched
+        items.
+    """
+    with transaction.atomic():
+        cart, _ = Cart.objects.select_for_update().get_or_create(customer=customer)
+
+        menu = {
+            operation["menu_item"].pk: operation["menu_item"]
+            for operation in operations
+        }
+        existing = {
+            item.menu_item_id: item
+            for item in CartItem.objects.select_for_update().filter(
+                cart=cart, menu_item_id__in=menu
+            )
+        }
+
+        quantities = {pk: item.quantity for pk, item in existing.items()}
+        for operation in operations:
+            pk = operation["menu_item"].pk
+            if operation["op"] == "add":
+                quantities[pk] = quantities.get(pk, 0) + operation["quantity"]
+            elif operation["op"] == "set":
+                quantities[pk] = operation["quantity"]
+            else:
+                quantities[pk] = 0
+
+        now = timezone.now()
+        to_create, to_update, to_delete = [], [], []
+        for pk, quantity in quantities.items():
+            item = existing.get(pk)
+            if item is None:
+                if quantity:
+                    to_create.append(
+                        CartItem(cart=cart, menu_item=menu[pk], quantity=quantity)
+                    )
+            elif not quantity:
+                to_delete.append(item.pk)
+            elif quantity != item.quantity:
+                item.quantity = quantity
+                item.updated_at = now
+                to_update.append(item)
+
+        if to_create:
+            CartItem.objects.bulk_create(to_create)
+        if to_update:
+            CartItem.objects.bulk_update(to_update, ["quantity", "updated_at"])
+        if to_delete:
+            CartItem.objects.filter(pk__in=to_delete).delete()
+
+        cart.calculate_total_price()
+    prefetch_related_objects([cart], "items")
+    return cart
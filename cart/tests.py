@@ -1,3 +1,435 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.testing import QueryBudgetTestMixin
+from restaurants.models import Restaurants, Menu
+from users.models import User
+from .models import Cart, CartItem
+from .services import apply_batch
+from .views import AsyncCartView, CartView, CartItemBatchView
+
+
+class CartTestMixin:
+    def create_cart(self, items):
+        self.customer = User.objects.create_user(
+            email="customer@example.com",
+            password="check@123",
+            first_name="John",
+            last_name="Doe",
+        )
+        owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        self.menu = Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"Dish {i}",
+                    description="Tasty",
+                    price=Decimal("2.50") * (i + 1),
+                    restaurant=self.restaurant,
+                )
+                for i in range(items)
+            ]
+        )
+        self.cart = Cart.objects.create(customer=self.customer)
+        CartItem.objects.bulk_create(
+            [CartItem(cart=self.cart, menu_item=menu, quantity=2) for menu in self.menu]
+        )
+        return sum(menu.price * 2 for menu in self.menu)
+
+
+class CartTotalTests(CartTestMixin, APITestCase):
+    def test_calculate_total_price(self):
+        expected = self.create_cart(items=3)
+        self.assertEqual(self.cart.calculate_total_price(), expected)
+        self.cart.refresh_from_db()
+        self.assertEqual(self.cart.total_price, expected)
+
+    def test_calculate_total_price_of_empty_cart(self):
+        self.create_cart(items=0)
+        self.assertEqual(self.cart.calculate_total_price(), Decimal("0.00"))
+
+    def test_calculate_total_price_query_count_is_constant(self):
+        for items in (1, 50):
+            with self.subTest(items=items):
+                Cart.objects.all().delete()
+                User.objects.all().delete()
+                self.create_cart(items=items)
+                with self.assertNumQueries(2):
+                    self.cart.calculate_total_price()
+
+    def test_with_totals(self):
+        expected = self.create_cart(items=4)
+        cart = Cart.objects.with_totals().get(pk=self.cart.pk)
+        self.assertEqual(cart.items_total, expected)
+
+    def test_cart_view_query_count_is_constant(self):
+        view = CartView.as_view()
+        for items in (1, 50):
+            with self.subTest(items=items):
+                Cart.objects.all().delete()
+                User.objects.all().delete()
+                expected = self.create_cart(items=items)
+                request = APIRequestFactory().get("/api/v1/cart/")
+                force_authenticate(request, user=self.customer)
+                # Validator aggregate, cart with totals, prefetched items.
+                with self.assertNumQueries(3):
+                    response = view(request)
+                self.assertEqual(
+                    Decimal(response.data["data"]["total_price"]), expected
+                )
+                self.assertEqual(len(response.data["data"]["cart_items"]), items)
+
+
+class CartQueryBudgetTests(QueryBudgetTestMixin, CartTestMixin, APITestCase):
+    def request(self, method):
+        request = getattr(APIRequestFactory(), method.lower())("/api/v1/cart/")
+        force_authenticate(request, user=self.customer)
+        return request
+
+    def test_get_within_budget(self):
+        self.create_cart(items=30)
+        request = self.request("GET")
+        with self.assertQueryBudget(CartView, "GET"):
+            CartView.as_view()(request)
+
+    def test_get_creating_the_cart_within_budget(self):
+        self.create_cart(items=0)
+        self.cart.delete()
+        request = self.request("GET")
+        with self.assertQueryBudget(CartView, "GET"):
+            CartView.as_view()(request)
+
+    def test_delete_within_budget(self):
+        self.create_cart(items=30)
+        request = self.request("DELETE")
+        with self.assertQueryBudget(CartView, "DELETE"):
+            with self.captureOnCommitCallbacks(execute=True):
+                CartView.as_view()(request)
+        self.assertFalse(CartItem.objects.exists())
+
+
+class CartConditionalGetTests(CartTestMixin, APITestCase):
+    def setUp(self):
+        self.create_cart(items=2)
+        self.url = reverse("cart-detail")
+        self.client.force_authenticate(self.customer)
+        self.etag = self.client.get(self.url)["ETag"]
+
+    def poll(self):
+        return self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+
+    def test_unchanged_cart_is_not_modified(self):
+        request = APIRequestFactory().get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        force_authenticate(request, user=self.customer)
+        # Only the validator runs; the cart is neither loaded nor serialized.
+        with self.assertNumQueries(1):
+            response = CartView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["X-Conditional"], "HIT")
+
+    def test_full_response_reports_miss(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Conditional"], "MISS")
+        self.assertEqual(response["ETag"], self.etag)
+        self.assertIn("Last-Modified", response)
+
+    def test_adding_an_item_changes_the_etag(self):
+        CartItem.objects.add_item(self.cart, self.menu[0], 1)
+        self.assertEqual(self.poll().status_code, status.HTTP_200_OK)
+
+    def test_removing_an_item_changes_the_etag(self):
+        CartItem.objects.filter(menu_item=self.menu[0]).delete()
+        self.assertEqual(self.poll().status_code, status.HTTP_200_OK)
+
+    def test_menu_price_change_changes_the_etag(self):
+        self.menu[0].price = Decimal("99.00")
+        self.menu[0].save()
+        self.assertEqual(self.poll().status_code, status.HTTP_200_OK)
+
+    def test_etag_is_per_user(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="check@123",
+            first_name="Ama",
+            last_name="Doe",
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(self.poll().status_code, status.HTTP_200_OK)
+
+
+class AsyncCartViewTests(QueryBudgetTestMixin, CartTestMixin, APITestCase):
+    def setUp(self):
+        self.create_cart(items=3)
+        self.url = reverse("cart-detail")
+        self.login(self.customer)
+
+    def login(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def aget(self, **headers):
+        return async_to_sync(self.async_client.get)(
+            self.url, headers={**self.headers, **headers}
+        )
+
+    def test_matches_sync_view(self):
+        sync = self.client.get(self.url, headers=self.headers)
+        response = self.aget()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, sync.content)
+        self.assertEqual(response["ETag"], sync["ETag"])
+        self.assertEqual(response["X-Conditional"], "MISS")
+        self.assertEqual(len(response.json()["data"]["cart_items"]), 3)
+
+    def test_unchanged_cart_is_not_modified(self):
+        etag = self.aget()["ETag"]
+        response = self.aget(if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["X-Conditional"], "HIT")
+
+        CartItem.objects.filter(menu_item=self.menu[0]).delete()
+        self.assertEqual(self.aget(if_none_match=etag).status_code, 200)
+
+    def test_creates_a_missing_cart(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="check@123",
+            first_name="Ama",
+            last_name="Doe",
+        )
+        self.login(other)
+        with self.assertQueryBudget(AsyncCartView, "GET"):
+            response = self.aget()
+        data = response.json()["data"]
+        self.assertEqual(data["total_price"], "0.00")
+        self.assertEqual(data["cart_items"], [])
+        self.assertTrue(Cart.objects.filter(customer=other).exists())
+        self.assertEqual(
+            response.content, self.client.get(self.url, headers=self.headers).content
+        )
+
+    def test_requires_a_token(self):
+        self.headers = {}
+        response = self.aget()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+    def test_query_budget(self):
+        with self.assertQueryBudget(AsyncCartView, "GET", budget=4):
+            self.aget()
+
+    def test_delete_goes_to_the_sync_view(self):
+        response = async_to_sync(self.async_client.delete)(
+            self.url, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+
+
+class CartItemUpsertTests(CartTestMixin, APITestCase):
+    def setUp(self):
+        self.create_cart(items=1)
+        CartItem.objects.all().delete()
+        self.dish = self.menu[0]
+
+    def test_adding_twice_increments_one_row(self):
+        self.client.force_authenticate(self.customer)
+        url = reverse("cart-item-create")
+        first = self.client.post(url, {"menu_item": self.dish.pk, "quantity": 2})
+        second = self.client.post(url, {"menu_item": self.dish.pk, "quantity": 3})
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data["data"]["quantity"], 5)
+        self.assertEqual(CartItem.objects.get().quantity, 5)
+
+    def test_quantity_must_be_positive(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(
+            reverse("cart-item-create"), {"menu_item": self.dish.pk, "quantity": 0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_add_item_query_count_is_constant(self):
+        # Lock the cart, upsert, aggregate and update the total, plus the
+        # two savepoint statements.
+        with self.assertNumQueries(6):
+            CartItem.objects.add_item(self.cart, self.dish, 2)
+        with self.assertNumQueries(6) as queries:
+            item = CartItem.objects.add_item(self.cart, self.dish, 2)
+        # The item itself is written by a single upsert.
+        writes = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "cart_cartitem" in query["sql"].split("(")[0]
+        ]
+        self.assertEqual(len(writes), 1)
+        self.assertIn("ON CONFLICT", writes[0])
+        self.assertEqual(item.quantity, 4)
+        self.assertIsNotNone(item.added_at)
+
+    def test_adding_refreshes_the_cart_total(self):
+        Cart.objects.filter(pk=self.cart.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        before = Cart.objects.get(pk=self.cart.pk).updated_at
+        CartItem.objects.add_item(self.cart, self.dish, 2)
+        CartItem.objects.add_item(self.cart, self.dish, 1)
+
+        cart = Cart.objects.get(pk=self.cart.pk)
+        self.assertEqual(cart.total_price, self.dish.price * 3)
+        self.assertEqual(self.cart.total_price, cart.total_price)
+        self.assertGreater(cart.updated_at, before)
+
+    def test_fallback_update_or_insert(self):
+        CartItem.objects.all()._update_or_insert(self.cart, self.dish, 2)
+        item = CartItem.objects.all()._update_or_insert(self.cart, self.dish, 1)
+        self.assertEqual(item.quantity, 3)
+        self.assertEqual(CartItem.objects.count(), 1)
+
+
+class ConcurrentCartItemUpsertTests(CartTestMixin, TransactionTestCase):
+    def test_concurrent_adds_lose_no_increment(self):
+        self.create_cart(items=1)
+        CartItem.objects.all().delete()
+        threads = 20
+        barrier = threading.Barrier(threads)
+
+        def add():
+            try:
+                barrier.wait()
+                CartItem.objects.add_item(self.cart, self.menu[0], 1)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=add) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(CartItem.objects.get().quantity, threads)
+
+    def test_concurrent_add_and_batch_insert_one_row(self):
+        self.create_cart(items=1)
+        CartItem.objects.all().delete()
+        dish = self.menu[0]
+        rounds = 10
+        quantities = []
+        errors = []
+
+        def settle():
+            # Runs between rounds, so both writers race to insert the item.
+            quantities.extend(CartItem.objects.values_list("quantity", flat=True))
+            CartItem.objects.all().delete()
+
+        barrier = threading.Barrier(2, action=settle)
+
+        def run(write):
+            try:
+                for _ in range(rounds):
+                    barrier.wait()
+                    write()
+                barrier.wait()
+            except Exception as exc:
+                errors.append(exc)
+                barrier.abort()
+            finally:
+                connection.close()
+
+        def add():
+            CartItem.objects.add_item(self.cart, dish, 1)
+
+        def batch():
+            apply_batch(
+                self.customer, [{"menu_item": dish, "quantity": 1, "op": "add"}]
+            )
+
+        workers = [
+            threading.Thread(target=run, args=(write,)) for write in (add, batch)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(quantities, [2] * rounds)
+
+
+class CartItemBatchTests(CartTestMixin, APITestCase):
+    def setUp(self):
+        self.create_cart(items=20)
+        CartItem.objects.all().delete()
+        self.url = reverse("cart-item-batch")
+        self.client.force_authenticate(self.customer)
+
+    def test_add_set_and_remove(self):
+        first, second, third = self.menu[:3]
+        CartItem.objects.create(cart=self.cart, menu_item=third, quantity=4)
+        response = self.client.post(
+            self.url,
+            {
+                "operations": [
+                    {"menu_item": first.pk, "quantity": 2},
+                    {"menu_item": first.pk, "quantity": 1, "op": "add"},
+                    {"menu_item": second.pk, "quantity": 5, "op": "set"},
+                    {"menu_item": third.pk, "op": "remove"},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        quantities = dict(CartItem.objects.values_list("menu_item_id", "quantity"))
+        self.assertEqual(quantities, {first.pk: 3, second.pk: 5})
+        expected = first.price * 3 + second.price * 5
+        self.assertEqual(Decimal(response.data["data"]["total_price"]), expected)
+        self.assertEqual(len(response.data["data"]["cart_items"]), 2)
+
+    def test_unknown_menu_item_applies_nothing(self):
+        response = self.client.post(
+            self.url,
+            {
+                "operations": [
+                    {"menu_item": self.menu[0].pk, "quantity": 1},
+                    {"menu_item": 9999, "quantity": 1},
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_twenty_item_basket_query_budget(self):
+        operations = [{"menu_item": dish.pk, "quantity": 2} for dish in self.menu]
+        request = APIRequestFactory().post(
+            self.url, {"operations": operations}, format="json"
+        )
+        force_authenticate(request, user=self.customer)
+        # Validate, lock cart, lock items, insert, aggregate, update total and
+        # prefetch items, plus the two savepoint statements.
+        with self.assertNumQueries(9):
+            response = CartItemBatchView.as_view()(request)
+        self.assertEqual(len(response.data["data"]["cart_items"]), 20)
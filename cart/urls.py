@@ -1,10 +1,19 @@
 from django.urls import path
-from .views import CartView, CartItemCreateView, CartItemDeleteView
-
+from .views import (
+    CartView,
+    CartItemCreateView,
+    CartItemBatchView,
+    CartItemDeleteView,
+)
 
 urlpatterns = [
     path("cart/", CartView.as_view(), name="cart-detail"),
     path("cart/items/", CartItemCreateView.as_view(), name="cart-item-create"),
+    path(
+        "cart/items/batch/",
+        CartItemBatchView.as_view(),
+        name="cart-item-batch",
+    ),
     path(
         "cart/items/<int:pk>/",
         CartItemDeleteView.as_view(),
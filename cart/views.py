@@ -2,9 +2,28 @@ from rest_framework.generics import GenericAPIView, get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Count, Max
 from drf_spectacular.utils import extend_schema
+from config.asyncviews import AsyncAPIView
+from config.conditional import conditional
+from config.serializers import FastSerializer
+from idempotency.decorators import idempotent
 from .models import Cart, CartItem
-from .serializers import CartSerializer, CartItemSerializer
+from .serializers import CartSerializer, CartItemSerializer, CartBatchSerializer
+from .services import apply_batch
+
+
+def cart_validators():
+    """
+    Return what a cart body depends on: the cart row, its items and the
+    prices of their menu items, as aggregates over the user's cart.
+    """
+    return {
+        "updated": Max("updated_at"),
+        "count": Count("items"),
+        "items_updated": Max("items__updated_at"),
+        "menu_updated": Max("items__menu_item__updated_at"),
+    }
 
 
 @extend_schema(tags=["cart"])
@@ -18,12 +37,15 @@ class CartView(GenericAPIView):
 
     Methods:
         get_object(): Return or create a Cart for `request.user`.
+        get_queryset(): Return carts annotated with their totals.
         get(request): Return serialized cart data.
         delete(request): Remove all items from the cart (clears cart).
     """
 
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
+    # GET: validators, cart with totals, items; one more creating the cart.
+    query_budget = {"GET": 4, "DELETE": 2}
 
     def get_object(self):
         """
@@ -41,6 +63,22 @@ class CartView(GenericAPIView):
         cart, _ = Cart.objects.get_or_create(customer=self.request.user)
         return cart
 
+    def get_queryset(self):
+        """
+        Return carts annotated with their database-computed `items_total`
+        and with items prefetched, so reading a cart costs two queries no
+        matter how many items it holds.
+        """
+        return Cart.objects.with_totals().prefetch_related("items")
+
+    def get_validators(self, request):
+        """
+        Return what the cart body depends on: the cart row, its items and
+        the prices of their menu items, in one aggregate query.
+        """
+        return Cart.objects.filter(customer=request.user).aggregate(**cart_validators())
+
+    @conditional
     def get(self, request):
         """
         Retrieve the authenticated user's cart.
@@ -52,7 +90,9 @@ class CartView(GenericAPIView):
             rest_framework.response.Response: JSON response containing the
             serialized cart data and a success message (HTTP 200).
         """
-        cart = self.get_object()
+        cart, _ = self.get_queryset().get_or_create(customer=request.user)
+        # A freshly created cart is not annotated and has no items.
+        cart.total_price = getattr(cart, "items_total", cart.total_price)
         serializer = self.serializer_class(cart)
         return Response(
             {
@@ -88,15 +128,70 @@ class CartView(GenericAPIView):
         )
 
 
+class AsyncCartView(AsyncAPIView):
+    """
+    CartView with an async GET, served under ASGI (see
+    `config.asyncviews`). DELETE goes to CartView.
+    """
+
+    sync_view = CartView
+    # GET: as CartView, but creating the cart costs an empty read, the
+    # get_or_create pair and a re-read, once per user.
+    query_budget = {**CartView.query_budget, "GET": 7}
+    # The database-computed total replaces the stored column, as in CartView.
+    sources = {"total_price": "items_total"}
+
+    async def get_validators(self, request):
+        return await Cart.objects.filter(customer=request.user).aaggregate(
+            **cart_validators()
+        )
+
+    @conditional
+    async def get(self, request):
+        """
+        Retrieve the authenticated user's cart, creating it if missing.
+
+        Args:
+            request (django.http.HttpRequest): The incoming request, with
+                `request.user` set from its bearer token.
+
+        Returns:
+            django.http.HttpResponse: The same JSON as `CartView.get`
+            (HTTP 200).
+
+        Side effects:
+            May create a new Cart in the database.
+        """
+        fast = FastSerializer.for_serializer(CartSerializer)
+        carts = fast.values(
+            Cart.objects.with_totals().filter(customer=request.user),
+            sources=self.sources,
+        )
+        rows = [row async for row in carts]
+        if not rows:
+            await Cart.objects.aget_or_create(customer=request.user)
+            rows = [row async for row in carts.all()]
+        data = await fast.aserialize(rows, sources=self.sources)
+        return self.render(
+            {
+                "msg": "User cart retrieved successfully",
+                "data": data[0],
+                "status": True,
+            }
+        )
+
+
 @extend_schema(tags=["cart-items"])
 class CartItemCreateView(GenericAPIView):
     """
     Add an item to the authenticated user's cart or update its quantity.
 
-    Expects request.data to contain at least a `menu` field (menu id) and
-    optional `quantity` (defaults to 1). If the cart item already exists,
-    its quantity is incremented by the requested amount; otherwise a new
-    CartItem is created.
+    Expects request.data to contain at least a `menu_item` field (menu id)
+    and optional `quantity` (defaults to 1). If the cart item already
+    exists, its quantity is incremented by the requested amount; otherwise a
+    new CartItem is created. Both cases are a single atomic upsert under the
+    cart's lock, after which the cart total is recomputed, see
+    `CartItemQuerySet.add_item`.
 
     Methods:
         post(request): Validate input and create/update a CartItem.
@@ -105,40 +200,36 @@ class CartItemCreateView(GenericAPIView):
     serializer_class = CartItemSerializer
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         """
         Create or update a CartItem for the authenticated user's cart.
 
         Args:
             request (rest_framework.request.Request): The incoming request.
-                Expected payload: {"menu": <int>, "quantity": <int, optional>}.
+                Expected payload: {"menu_item": <int>, "quantity": <int, optional>}.
 
         Returns:
             rest_framework.response.Response: JSON response containing the
-            serialized CartItem and a success message (HTTP 201).
+            serialized CartItem and a success message (HTTP 201). Retries
+            carrying the same `Idempotency-Key` header replay the original
+            response.
 
         Side effects:
-            Creates the user's Cart if it does not exist. Creates or updates
-            a CartItem and saves it to the database.
+            Creates the user's Cart if it does not exist. Inserts the
+            CartItem or atomically increments its quantity, and updates the
+            cart's `total_price`.
         """
-        cart, created = Cart.objects.get_or_create(customer=request.user)
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
+        cart, _ = Cart.objects.get_or_create(customer=request.user)
 
-        menu = serializer.validated_data["menu"]
-        quantity = serializer.validated_data.get("quantity", 1)
-
-        cart_item, created = CartItem.objects.get_or_create(
-            cart=cart, menu=menu, quantity=quantity
+        cart_item = CartItem.objects.add_item(
+            cart,
+            serializer.validated_data["menu_item"],
+            serializer.validated_data.get("quantity", 1),
         )
 
-        if not created:
-            cart_item.quantity += quantity
-        else:
-            cart_item.quantity = quantity
-
-        cart_item.save()
-
         serializer = self.serializer_class(cart_item)
         data = {
             "msg": "Item added to cart successfully",
@@ -148,6 +239,58 @@ class CartItemCreateView(GenericAPIView):
         return Response(data, status=status.HTTP_201_CREATED)
 
 
+@extend_schema(tags=["cart-items"], responses=CartSerializer)
+class CartItemBatchView(GenericAPIView):
+    """
+    Apply several cart item changes in one request.
+
+    Expects request.data to be {"operations": [...]} where each operation is
+    {"menu_item": <int>, "quantity": <int>, "op": "add" | "set" | "remove"}.
+    All referenced menu items are validated with one query and the changes
+    are written in bulk inside a single transaction, so a 20-item basket
+    costs a handful of queries instead of one request per item.
+
+    Methods:
+        post(request): Validate and apply the operations, return the cart.
+    """
+
+    serializer_class = CartBatchSerializer
+    permission_classes = [IsAuthenticated]
+
+    @idempotent
+    def post(self, request, *args, **kwargs):
+        """
+        Apply a batch of operations to the authenticated user's cart.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Expected payload: {"operations": [{"menu_item": <int>,
+                "quantity": <int, optional>, "op": <str, optional>}]}.
+
+        Returns:
+            rest_framework.response.Response: JSON response containing the
+            recomputed cart (HTTP 200), or validation errors (HTTP 400) if
+            any operation is invalid, in which case nothing is applied.
+
+        Side effects:
+            Creates the user's Cart if it does not exist. Creates, updates
+            and deletes CartItems and persists the new cart total.
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cart = apply_batch(request.user, serializer.validated_data["operations"])
+
+        return Response(
+            {
+                "msg": "Cart updated successfully",
+                "data": CartSerializer(cart).data,
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 @extend_schema(tags=["cart-items"])
 class CartItemDeleteView(GenericAPIView):
     """
@@ -0,0 +1,160 @@
+"""
+Async read views for ASGI deployments.
+
+DRF's APIView is synchronous, so under ASGI every request to it runs on
+a worker thread. The most read-heavy endpoints also have an
+`AsyncAPIView` counterpart which authenticates, queries and renders on
+the event loop with Django's async ORM (`aget`, `aaggregate`, `async
+for`). `ASGIURLConfMiddleware` routes ASGI requests through
+`settings.ASGI_URLCONF`, where those views replace the sync ones at the
+same paths; WSGI requests never see them.
+
+Responses are the same as the sync views': the same body, status,
+conditional headers and error payloads (through DRF's exception handler).
+Only JSON is rendered here: a request for which DRF's content negotiation
+picks another renderer (`?format=api`, `Accept: text/html`) or none at
+all (406) is handed to the sync view. Only JWT bearer authentication is
+accepted.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from users.authentication import CachedJWTAuthentication
+from .renderers import FastJSONRenderer
+
+# Headers DRF's exception handler adds that the response must keep.
+EXCEPTION_HEADERS = ("WWW-Authenticate", "Retry-After")
+
+
+class AsyncAPIView(View):
+    """
+    Base class of async GET views mirroring a DRF view.
+
+    GET and HEAD negotiating JSON run `get()` on the event loop, for an
+    authenticated user only. Every other request is handed to `sync_view`,
+    so the URL keeps its writes, OPTIONS, browsable API and 406 responses
+    exactly as before.
+
+    Attributes:
+        sync_view (type[APIView]): The DRF view serving the same URL.
+        authentication_class (type): Authentication with an async
+            `aauthenticate(request)`.
+        renderer_class (type): Renderer of the JSON body.
+    """
+
+    sync_view = None
+    sync_handler = None
+    authentication_class = CachedJWTAuthentication
+    renderer_class = FastJSONRenderer
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        initkwargs.setdefault("sync_handler", sync_to_async(cls.sync_view.as_view()))
+        view = super().as_view(**initkwargs)
+        # Bearer tokens only, like the DRF views, which are exempt too.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Run JSON GET and HEAD requests here, delegate the rest.
+
+        Raises:
+            Exception: Anything DRF's exception handler does not handle.
+        """
+        if request.method not in ("GET", "HEAD") or not self.renders_json(request):
+            return await self.sync_handler(request, *args, **kwargs)
+        try:
+            await self.authenticate(request)
+            return await self.get(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+
+    def renders_json(self, request):
+        """
+        Return whether `sync_view` would render `request` as JSON, through
+        its own content negotiation and renderers.
+        """
+        view = self.sync_view
+        try:
+            renderer, _ = view.content_negotiation_class().select_renderer(
+                Request(request), [renderer() for renderer in view.renderer_classes]
+            )
+        except (exceptions.NotAcceptable, Http404):
+            return False
+        return renderer.format == "json"
+
+    async def authenticate(self, request):
+        """
+        Set `request.user` and `request.auth` from the bearer token.
+
+        Raises:
+            NotAuthenticated: If the request carries no token.
+            AuthenticationFailed: If the token or its user is not valid.
+        """
+        result = await self.authentication_class().aauthenticate(request)
+        if result is None:
+            raise exceptions.NotAuthenticated()
+        request.user, request.auth = result
+
+    def handle_exception(self, request, exc):
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = self.authentication_class().authenticate_header(request)
+        response = exception_handler(
+            exc,
+            {
+                "request": request,
+                "view": self,
+                "args": self.args,
+                "kwargs": self.kwargs,
+            },
+        )
+        if response is None:
+            raise exc
+        rendered = self.render(response.data, response.status_code)
+        for name in EXCEPTION_HEADERS:
+            if name in response:
+                rendered[name] = response[name]
+        return rendered
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        """
+        Return `data` rendered as a JSON HttpResponse.
+        """
+        return HttpResponse(
+            self.renderer_class().render(data),
+            status=status_code,
+            content_type=self.renderer_class.media_type,
+        )
+
+
+class ASGIURLConfMiddleware:
+    """
+    Resolve requests that arrived through ASGI with `settings.ASGI_URLCONF`.
+
+    Requests from WSGI, and every request when ASGI_URLCONF is not set,
+    keep ROOT_URLCONF.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.urlconf = getattr(settings, "ASGI_URLCONF", None)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.urlconf and isinstance(request, ASGIRequest):
+            request.urlconf = self.urlconf
+        return self.get_response(request)
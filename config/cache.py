@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+class LocMemLRUBackend:
+    """
+    Thread-safe, bounded, in-process LRU store.
+
+    Entries live in this process only, so it is the right default for a
+    single worker or development. With several workers, an invalidation
+    only reaches the worker that made it, and the others keep their
+    entries until they time out; such deployments should point MENU_CACHE
+    at a shared Django cache instead.
+
+    Args:
+        max_entries (int): Maximum number of keys kept before the least
+            recently used one is evicted.
+        timeout (int | None): Seconds an entry stays valid, None for ever.
+    """
+
+    def __init__(self, max_entries=1024, timeout=None):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expiry(self):
+        if self.timeout is None:
+            return None
+        return time.monotonic() + self.timeout
+
+    def _set(self, key, value):
+        self._data[key] = (value, self._expiry())
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._set(key, value)
+
+    def add(self, key, value):
+        with self._lock:
+            if key in self._data:
+                return False
+            self._set(key, value)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            if key not in self._data:
+                raise ValueError(f"Key '{key}' not found")
+            value = self._data[key][0] + 1
+            self._set(key, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoCacheBackend:
+    """
+    Adapter exposing a configured Django cache (`settings.CACHES`) through
+    the same small interface as LocMemLRUBackend.
+
+    Args:
+        alias (str): Name of the cache in `settings.CACHES`.
+        timeout (int | None): Seconds an entry stays valid, None for ever.
+    """
+
+    def __init__(self, alias="default", timeout=None):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key, default=None):
+        return self.cache.get(key, default)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def add(self, key, value):
+        return self.cache.add(key, value, self.timeout)
+
+    def incr(self, key):
+        return self.cache.incr(key)
+
+    def clear(self):
+        self.cache.clear()
+
+
+class VersionedCache:
+    """
+    Read cache whose entries are grouped by an owning object id.
+
+    Each owner (a restaurant, a user, ...) has a version number stored
+    alongside the payloads. Payloads are stored under a key that embeds the
+    current version, so invalidating everything of an owner is a single
+    `bump()` and stale entries simply become unreachable and age out of the
+    LRU.
+
+    Version keys start from a nanosecond timestamp rather than 0, so a
+    version key that gets evicted can never be recreated with a value that
+    points back at an older payload.
+    """
+
+    def __init__(self, backend, prefix):
+        self.backend = backend
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def version_key(self, owner_id):
+        return f"{self.prefix}:{owner_id}:version"
+
+    def get_version(self, owner_id):
+        key = self.version_key(owner_id)
+        version = self.backend.get(key)
+        if version is None:
+            self.backend.add(key, time.time_ns())
+            version = self.backend.get(key)
+        return version
+
+    def bump(self, owner_id):
+        """
+        Invalidate every cached payload of `owner_id`.
+        """
+        key = self.version_key(owner_id)
+        try:
+            self.backend.incr(key)
+        except ValueError:
+            self.backend.add(key, time.time_ns())
+
+    def get_or_build(self, owner_id, build, *parts):
+        """
+        Return the cached payload for `owner_id`, building it on a miss.
+
+        Args:
+            owner_id (int): Primary key of the owning object.
+            build (callable): Zero-argument callable returning the payload.
+            *parts: Extra key components, for owners with several payloads.
+
+        Returns:
+            tuple: (payload, hit) where hit is True when served from cache.
+        """
+        key = self.payload_key(owner_id, *parts)
+        payload = self.backend.get(key)
+        if payload is not None:
+            self._count(hit=True)
+            return payload, True
+
+        self._count(hit=False)
+        payload = build()
+        self.backend.set(key, payload)
+        return payload, False
+
+    async def aget_or_build(self, owner_id, build, *parts):
+        """
+        Async `get_or_build()`: `build` is a zero-argument coroutine
+        function, awaited on a miss.
+
+        The backend is still called synchronously, which costs nothing
+        with the in-process LRU; a network cache blocks the event loop for
+        its round trip.
+        """
+        key = self.payload_key(owner_id, *parts)
+        payload = self.backend.get(key)
+        if payload is not None:
+            self._count(hit=True)
+            return payload, True
+
+        self._count(hit=False)
+        payload = await build()
+        self.backend.set(key, payload)
+        return payload, False
+
+    def payload_key(self, owner_id, *parts):
+        return ":".join(
+            map(str, (self.prefix, owner_id, self.get_version(owner_id), *parts))
+        )
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """
+        Return hit/miss counters and the hit rate since startup.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+BACKENDS = {
+    "locmem": LocMemLRUBackend,
+    "django": DjangoCacheBackend,
+}
+
+
+def build_backend(config):
+    """
+    Instantiate the backend described by a cache settings dict, such as
+    MENU_CACHE.
+
+    `BACKEND` is either a short name from BACKENDS or a dotted path to a
+    class; the remaining keys are passed to it lowercased.
+    """
+    config = dict(config)
+    backend = config.pop("BACKEND", "locmem")
+    backend_class = BACKENDS.get(backend) or import_string(backend)
+    return backend_class(**{key.lower(): value for key, value in config.items()})
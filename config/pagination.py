@@ -0,0 +1,226 @@
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination:
+    """
+    Forward-only cursor (keyset) pagination over a composite ordering.
+
+    Unlike offset pagination, the cost of fetching a page does not grow with
+    its depth: the cursor carries the ordering values of the last row that
+    was returned, and the next page is selected with a lexicographic
+    ``WHERE (a, b) < (x, y)`` predicate that can be answered straight from a
+    composite index on the ordering fields.
+
+    Attributes:
+        ordering (tuple[str]): Model fields to order by. Prefix with "-" for
+            descending order. The last field must be unique (usually "id")
+            so that every row has a distinct position.
+        page_size (int): Default number of rows per page.
+        max_page_size (int): Upper bound for the `page_size` query parameter.
+        cursor_query_param (str): Query parameter holding the cursor.
+        page_size_query_param (str): Query parameter overriding page_size.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, ordering=None, page_size=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        if page_size is not None:
+            self.page_size = page_size
+        self.next_position = None
+        self.request = None
+
+    def get_page_size(self, request):
+        """
+        Return the page size requested by the client, capped at max_page_size.
+        """
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, position):
+        """
+        Encode a list of ordering values into an opaque URL-safe string.
+        """
+        raw = json.dumps(position, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, queryset, cursor):
+        """
+        Decode a cursor back into Python values for the ordering fields.
+
+        Raises:
+            NotFound: If the cursor is malformed or does not match ordering.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+            values = json.loads(raw.decode("utf-8"))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        opts = queryset.model._meta
+        try:
+            return [
+                opts.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, row):
+        """
+        Return the ordering values for a row (model instance or dict).
+        """
+        names = [field.lstrip("-") for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+        return [getattr(row, name) for name in names]
+
+    def build_filter(self, position):
+        """
+        Build the lexicographic "after this position" predicate.
+
+        For ordering (a, b) and position (x, y) this is
+        ``a <op>= x AND (a <op> x OR (a = x AND b <op> y))`` where <op> is
+        `lt` for descending fields and `gt` for ascending ones. The leading
+        inclusive bound on `a` is redundant logically but lets the database
+        turn the predicate into an index range scan instead of a full scan.
+        """
+        predicate = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            predicate |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = self.ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & predicate
+
+    def page_queryset(self, queryset, request):
+        """
+        Return the unevaluated queryset of the requested page.
+
+        It holds up to page_size + 1 rows; the extra one tells whether a
+        next page exists. Aggregating over it validates a page without
+        loading it.
+        """
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(
+                self.build_filter(self.decode_cursor(queryset, cursor))
+            )
+        return queryset[: self.get_page_size(request) + 1]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return a single page of rows from `queryset` as a list.
+
+        One extra row is fetched to find out whether a next page exists,
+        so a page costs exactly one query.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = list(self.page_queryset(queryset, request))
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            self.next_position = self.get_position(rows[-1])
+        else:
+            self.next_position = None
+        return rows
+
+    def get_next_link(self):
+        """
+        Return the absolute URL of the next page, or None on the last page.
+        """
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+
+class RankedPagination(KeysetPagination):
+    """
+    Keyset pagination over ranked search results.
+
+    Works like KeysetPagination, but pages a search function instead of a
+    queryset. The cursor carries the ordering mode of the search and the
+    (score, id) of the last result, so the next page continues after it
+    rather than re-counting an offset. A cursor taken in a mode the search
+    no longer uses is rejected, since its position means nothing in the
+    new order.
+    """
+
+    ordering = ("mode", "score", "id")
+    stale_cursor_message = "Search results changed; start again from the first page"
+
+    def decode_cursor(self, queryset, cursor):
+        """
+        Decode a cursor into a (mode, score, id) triple.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii"))
+            mode, score, pk = json.loads(raw.decode("utf-8"))
+            if not isinstance(mode, str):
+                raise TypeError(mode)
+            return mode, float(score), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_search(self, search, request):
+        """
+        Return a single page of (id, score) results from `search`.
+
+        Args:
+            search (Callable): Called as ``search(after=..., limit=...)``;
+                must return its ordering mode and (id, score) pairs ordered
+                by score then id and starting after the `after` position.
+            request (rest_framework.request.Request): The incoming request.
+
+        Raises:
+            NotFound: If the cursor is malformed, or was taken in another
+                mode than the one `search` now uses.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        after = self.decode_cursor(None, cursor) if cursor else None
+
+        mode, rows = search(after=after, limit=page_size + 1)
+        if after is not None and after[0] != mode:
+            raise NotFound(self.stale_cursor_message)
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            pk, score = rows[-1]
+            self.next_position = [mode, score, pk]
+        else:
+            self.next_position = None
+        return rows
@@ -0,0 +1,62 @@
+import codecs
+import csv
+import io
+
+from django.conf import settings
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONParser(parsers.JSONParser):
+    """
+    JSONParser backed by orjson when it is installed.
+
+    orjson only reads UTF-8 and always rejects NaN and infinity, which
+    matches the default STRICT_JSON. Other request encodings, a non-strict
+    setting or a missing orjson use the stdlib parser. A body orjson
+    rejects is handed to the stdlib parser as well, so malformed JSON gets
+    the usual `JSON parse error - ...` message.
+
+    Integers wider than 64 bits are read as floats by orjson.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class CSVParser(parsers.BaseParser):
+    """
+    Parse a `text/csv` body with a header row into a list of dicts.
+
+    Empty cells are left out of their row, so optional fields fall back to
+    their defaults as they would when omitted from JSON.
+    """
+
+    media_type = "text/csv"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            text = io.StringIO(stream.read().decode(encoding), newline="")
+            return [
+                {key: value for key, value in row.items() if key and value}
+                for row in csv.DictReader(text)
+            ]
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ParseError(f"CSV parse error - {exc}")
@@ -0,0 +1,256 @@
+"""
+Per-request query budgets and N+1 detection.
+
+`QueryBudgetMiddleware` counts the queries a request runs and the time
+spent in them through `connection.execute_wrapper`, which costs a
+function call per query and writes nothing anywhere. Every response
+gets a `Server-Timing` header, so browser dev tools show the database
+share of each request. When a view runs more queries than its budget,
+or the same SQL shape over and over (the signature of an N+1 loop), the
+middleware logs a warning or raises, depending on QUERY_BUDGET["ACTION"].
+
+A view's budget is its `query_budget` attribute: an int, or a dict of
+HTTP method to int. QUERY_BUDGET["VIEWS"] overrides it by dotted view
+class path, and QUERY_BUDGET["DEFAULT"] applies to views without one.
+A view can set `query_budget_action` to override QUERY_BUDGET["ACTION"].
+
+The check runs after the view returned, when its transaction has already
+committed, so raising turns a request that succeeded into a 500. Keep
+ACTION at "log" outside of tests and opt single views into "raise".
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "DEFAULT": None,
+    "VIEWS": {},
+    "REPEAT_THRESHOLD": 5,
+    "ACTION": "log",
+    "SERVER_TIMING": True,
+}
+
+# Transaction control (BEGIN IMMEDIATE on SQLite, savepoints) and the
+# EXPLAINs a profiler such as silk adds are not part of a view's budget.
+IGNORED = re.compile(
+    r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE SAVEPOINT|EXPLAIN)\b", re.I
+)
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PLACEHOLDER_LISTS = re.compile(r"%s(?:\s*,\s*%s)+")
+# An INSERT of several rows, i.e. one batch of a bulk_create.
+MULTI_ROW_INSERT = re.compile(
+    r"^\s*INSERT\b.*\bVALUES\s*\([^()]*\)\s*,\s*\(", re.I | re.S
+)
+
+_current = ContextVar("query_stats", default=None)
+
+
+def budget_settings():
+    return {**DEFAULTS, **getattr(settings, "QUERY_BUDGET", {})}
+
+
+def shape(sql):
+    """
+    Reduce a statement to its shape: literals and IN lists of any length
+    become `%s`, so the queries of an N+1 loop compare equal.
+    """
+    return PLACEHOLDER_LISTS.sub("%s", LITERALS.sub("%s", sql))
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when QUERY_BUDGET["ACTION"] is "raise" and a request goes over
+    its query budget or repeats a query shape.
+    """
+
+
+class QueryStats:
+    """
+    Query count, database time and repeated shapes of a block of code.
+
+    Install it with `track_queries()`. Each call to `execute()` or
+    `executemany()` counts as one query. Consecutive batches of the same
+    multi-row INSERT or `executemany()`, as one `bulk_create` sends them,
+    count as one shape, so they are not reported as an N+1.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.paused = 0
+        self.last_batch = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.paused:
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            if not IGNORED.match(sql):
+                self.count += 1
+                self.add_shape(sql, many)
+
+    def add_shape(self, sql, many):
+        sql_shape = shape(sql)
+        batch = many or MULTI_ROW_INSERT.match(sql) is not None
+        if not (batch and sql_shape == self.last_batch):
+            self.shapes[sql_shape] += 1
+        self.last_batch = sql_shape if batch else None
+
+    def repeated(self, threshold):
+        """
+        Return (shape, count) for every shape run at least `threshold`
+        times, most frequent first.
+        """
+        return [
+            (sql, count)
+            for sql, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def problems(self, budget=None, threshold=None):
+        """
+        Return a description of each budget or repeat violation.
+        """
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f"{self.count} queries, budget is {budget}")
+        if threshold:
+            problems.extend(
+                f"possible N+1, {count} x {sql}"
+                for sql, count in self.repeated(threshold)
+            )
+        return problems
+
+
+@contextmanager
+def track_queries(using=None):
+    """
+    Count the queries run inside the block, on every database or only on
+    `using`.
+
+    Yields:
+        QueryStats: Filled in as the block runs.
+    """
+    stats = QueryStats()
+    aliases = [using] if using else list(connections)
+    token = _current.set(stats)
+    try:
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(connections[alias].execute_wrapper(stats))
+            yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def untracked():
+    """
+    Leave the queries of the block out of the current count, e.g. polling
+    while waiting on another request, which is neither the view's cost nor
+    an N+1 loop.
+    """
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    stats.paused += 1
+    try:
+        yield
+    finally:
+        stats.paused -= 1
+
+
+def view_budget(view_class, method):
+    """
+    Return the query budget of `method` requests to `view_class`, or None.
+    """
+    config = budget_settings()
+    budget = None
+    if view_class is not None:
+        path = f"{view_class.__module__}.{view_class.__qualname__}"
+        budget = config["VIEWS"].get(path, getattr(view_class, "query_budget", None))
+    if isinstance(budget, dict):
+        budget = budget.get(method)
+    return config["DEFAULT"] if budget is None else budget
+
+
+def view_action(view_class, action):
+    """
+    Return what to do about a budget violation of `view_class`: its
+    `query_budget_action`, or the configured `action`.
+    """
+    return getattr(view_class, "query_budget_action", action)
+
+
+def server_timing(stats, total):
+    return (
+        f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+        f"total;dur={total * 1000:.1f}"
+    )
+
+
+class QueryBudgetMiddleware:
+    """
+    Count each request's queries, add a `Server-Timing` header and report
+    requests over their view's budget or with repeated query shapes.
+
+    Place it after SilkyMiddleware (or any middleware that writes its own
+    bookkeeping rows) so those writes are not charged to the view.
+
+    It is sync only on purpose. `execute_wrapper` hooks the connection of
+    the current thread, and under ASGI an async middleware would hook the
+    event loop's, while the views' queries run on a worker thread. Run as
+    a sync middleware, Django gives each request its own thread, and the
+    async views' ORM calls come back to that thread.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries() as stats:
+            response = self.get_response(request)
+        return self.finish(request, response, stats, start)
+
+    def finish(self, request, response, stats, start):
+        total = time.perf_counter() - start
+        config = budget_settings()
+        if config["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(stats, total)
+        view_class = getattr(request, "query_budget_view", None)
+        action = view_action(view_class, config["ACTION"])
+        if action:
+            problems = stats.problems(
+                view_budget(view_class, request.method), config["REPEAT_THRESHOLD"]
+            )
+            if problems:
+                self.report(request, view_class, problems, action)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget_view = getattr(view_func, "view_class", None)
+
+    def report(self, request, view_class, problems, action):
+        name = view_class.__qualname__ if view_class else request.path
+        message = f"{request.method} {name}: " + "; ".join(problems)
+        if action == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,74 @@
+import decimal
+
+from rest_framework import renderers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# U+2028 and U+2029 in UTF-8. DRF escapes both so the output stays a
+# strict JavaScript subset; orjson leaves them raw.
+LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """
+    DRF's JSONEncoder, except that Decimals are written as exact strings.
+
+    Serializer DecimalFields already return strings; this covers Decimals
+    that reach the renderer directly, such as aggregates, so they are not
+    rounded through a float. COERCE_DECIMAL_TO_STRING = False restores the
+    float output.
+    """
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal) and api_settings.COERCE_DECIMAL_TO_STRING:
+            return format(obj, "f")
+        return super().default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer backed by orjson when it is installed.
+
+    The output is byte for byte what JSONRenderer produces with the
+    default UNICODE_JSON and COMPACT_JSON settings. Datetimes and other
+    non-JSON types go through the same encoder as the stdlib path, so
+    their formatting does not depend on orjson. The stdlib renderer is
+    used instead when orjson is missing, when indentation is requested (the
+    browsable API, `Accept: application/json; indent=4`), when the settings
+    ask for ASCII-only or non-compact output, or when orjson rejects the
+    data (e.g. integers wider than 64 bits).
+
+    Unlike STRICT_JSON in the stdlib path, orjson writes NaN and infinity
+    as null instead of raising.
+    """
+
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
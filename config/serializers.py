@@ -0,0 +1,309 @@
+import decimal
+import functools
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import ISO_8601, api_settings
+
+# Field types whose representation of a database value is the value itself.
+PASSTHROUGH = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    PrimaryKeyRelatedField,
+)
+
+
+def decimal_converter(field):
+    coerce = getattr(field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+    if (
+        field.decimal_places is None
+        or getattr(field, "normalize_output", False)
+        or field.localize
+    ):
+        return field.to_representation
+    exponent = decimal.Decimal(".1") ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        value = value.quantize(exponent, rounding=rounding, context=context)
+        return f"{value:f}" if coerce else value
+
+    return convert
+
+
+def datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    tz = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if tz is None:
+        return field.to_representation
+
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def build_converter(field):
+    """
+    Return a callable turning a database value into the same output as
+    `field.to_representation`, skipping DRF's generic checks when the
+    field type allows it.
+    """
+    if isinstance(field, PASSTHROUGH):
+        return None
+    if isinstance(field, serializers.DecimalField):
+        return decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field)
+    return field.to_representation
+
+
+class FastSerializer:
+    """
+    Read-only fast path for a ModelSerializer over `.values()` rows.
+
+    The ModelSerializer is inspected once: each readable field becomes a
+    `.values()` lookup plus a converter reproducing its
+    `to_representation`. Nested `many=True` ModelSerializers over reverse
+    foreign keys are loaded with one extra `.values()` query each. No
+    model instances are created and no DRF field objects run per row, while
+    the output matches the ModelSerializer's.
+
+    Fields DRF would skip because the instance has no such attribute are
+    skipped as well. Anything that needs an instance, such as
+    SerializerMethodField or `source="*"`, is rejected with
+    ImproperlyConfigured.
+
+    Use `FastSerializer.for_serializer(cls)` to share the compiled form.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.names = []  # output names, in serializer field order
+        self.columns = {}  # output name -> (values() lookup, field)
+        self.children = {}  # output name -> (relation, FastSerializer)
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            self._add(name, field)
+
+    @classmethod
+    @functools.cache
+    def for_serializer(cls, serializer_class):
+        return cls(serializer_class)
+
+    def _add(self, name, field):
+        root = field.source.split(".")[0]
+        if field.source == "*" or isinstance(field, serializers.SerializerMethodField):
+            raise ImproperlyConfigured(
+                f"{self.serializer_class.__name__}.{name} needs a model instance "
+                "and cannot be served by FastSerializer"
+            )
+        if not hasattr(self.model, root):
+            # DRF skips read-only fields whose attribute is missing.
+            return
+        if isinstance(field, serializers.ListSerializer) and isinstance(
+            field.child, serializers.ModelSerializer
+        ):
+            relation = self.model._meta.get_field(root)
+            if not relation.one_to_many:
+                raise ImproperlyConfigured(
+                    f"{self.serializer_class.__name__}.{name}: only reverse "
+                    "foreign keys can be nested in a FastSerializer"
+                )
+            self.children[name] = (
+                relation,
+                FastSerializer.for_serializer(type(field.child)),
+            )
+            self.names.append(name)
+            return
+        if isinstance(field, serializers.BaseSerializer):
+            raise ImproperlyConfigured(
+                f"{self.serializer_class.__name__}.{name}: nested serializers "
+                "must be many=True ModelSerializers"
+            )
+        self.columns[name] = (field.source.replace(".", "__"), field)
+        self.names.append(name)
+
+    def values(self, queryset, sources=None, extra=()):
+        """
+        Return `queryset.values()` with the lookups this serializer needs.
+
+        Args:
+            queryset (QuerySet): Rows of the serializer's model.
+            sources (dict | None): Output field name to a different lookup,
+                e.g. an annotation to read instead of a stored column.
+            extra (Iterable[str]): Additional lookups to fetch, e.g. the
+                ordering fields a paginator needs.
+        """
+        sources = sources or {}
+        lookups = {"pk"}
+        lookups.update(
+            sources.get(name, lookup) for name, (lookup, _) in self.columns.items()
+        )
+        lookups.update(extra)
+        return queryset.values(*lookups)
+
+    def serialize(self, rows, sources=None, children=None):
+        """
+        Convert `.values()` rows (from `values()`) into output dicts.
+
+        Args:
+            rows (Iterable[dict]): Rows returned by `self.values(...)`.
+            sources (dict | None): The same mapping given to `values()`.
+            children (dict | None): Output name of a nested field to the
+                queryset its rows are read from, instead of every row of
+                the related model.
+
+        Returns:
+            list[dict]: One dict per row, keys in serializer field order.
+        """
+        children = children or {}
+        rows = list(rows)
+        nested = {
+            name: self._load_children(name, rows, children.get(name))
+            for name in self.children
+        }
+        return self._convert(rows, nested, sources)
+
+    async def aserialize(self, rows, sources=None, children=None):
+        """
+        Async `serialize()`: `rows` may be an async iterable, e.g. the
+        `values()` queryset itself, and nested rows are read with the
+        async ORM.
+        """
+        children = children or {}
+        if hasattr(rows, "__aiter__"):
+            rows = [row async for row in rows]
+        else:
+            rows = list(rows)
+        nested = {}
+        for name in self.children:
+            nested[name] = await self._aload_children(name, rows, children.get(name))
+        return self._convert(rows, nested, sources)
+
+    def _convert(self, rows, nested, sources):
+        sources = sources or {}
+        plan = []
+        for name in self.names:
+            if name in nested:
+                plan.append((name, None, None, nested[name]))
+            else:
+                lookup, field = self.columns[name]
+                plan.append(
+                    (name, sources.get(name, lookup), build_converter(field), None)
+                )
+
+        output = []
+        for row in rows:
+            data = {}
+            for name, lookup, convert, by_parent in plan:
+                if by_parent is not None:
+                    data[name] = by_parent.get(row["pk"], [])
+                    continue
+                value = row[lookup]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                data[name] = value
+            output.append(data)
+        return output
+
+    def _children_values(self, name, rows, queryset):
+        relation, child = self.children[name]
+        if queryset is None:
+            queryset = relation.related_model._default_manager.all()
+        parent = relation.field.attname
+        queryset = queryset.filter(**{f"{parent}__in": [row["pk"] for row in rows]})
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        return child, parent, child.values(queryset, extra=[parent])
+
+    def _load_children(self, name, rows, queryset):
+        if not rows:
+            return {}
+        child, parent, values = self._children_values(name, rows, queryset)
+        child_rows = list(values)
+        return group_by_parent(parent, child_rows, child.serialize(child_rows))
+
+    async def _aload_children(self, name, rows, queryset):
+        if not rows:
+            return {}
+        child, parent, values = self._children_values(name, rows, queryset)
+        child_rows = [row async for row in values]
+        return group_by_parent(parent, child_rows, await child.aserialize(child_rows))
+
+
+def group_by_parent(parent, rows, output):
+    grouped = defaultdict(list)
+    for row, data in zip(rows, output):
+        grouped[row[parent]].append(data)
+    return grouped
+
+
+class FastSerializerMixin:
+    """
+    Let a view opt into FastSerializer for its list responses.
+
+    `serializer_class` stays the ModelSerializer, so the OpenAPI schema
+    and writes are unchanged. With `fast_serializer = True`, reads go
+    through `.values()` rows and FastSerializer instead of model instances
+    and the ModelSerializer.
+
+    Attributes:
+        fast_serializer (bool): Serve reads through FastSerializer.
+        fast_sources (dict): Output field name to the lookup it is read
+            from, e.g. a database-computed annotation.
+    """
+
+    fast_serializer = False
+    fast_sources = {}
+
+    def get_fast_serializer(self):
+        return FastSerializer.for_serializer(self.serializer_class)
+
+    def get_serializer_rows(self, queryset, extra=()):
+        """
+        Return `queryset` itself, or its `.values()` rows on the fast path.
+
+        Args:
+            queryset (QuerySet): Rows of the serializer's model. Prefetches
+                are dropped on the fast path; nested fields are loaded by
+                FastSerializer instead.
+            extra (Iterable[str]): Lookups to fetch besides the serializer
+                fields, e.g. the ordering fields of a paginator.
+        """
+        if not self.fast_serializer:
+            return queryset
+        return self.get_fast_serializer().values(
+            queryset.prefetch_related(None), sources=self.fast_sources, extra=extra
+        )
+
+    def serialize_rows(self, rows, children=None):
+        """
+        Serialize rows from `get_serializer_rows` into a list of dicts.
+
+        Args:
+            rows (Iterable): Model instances, or dicts on the fast path.
+            children (dict | None): Passed to `FastSerializer.serialize`
+                to restrict nested rows; ignored on the regular path, where
+                the queryset's prefetches do the same.
+        """
+        if not self.fast_serializer:
+            return self.serializer_class(rows, many=True).data
+        return self.get_fast_serializer().serialize(
+            rows, sources=self.fast_sources, children=children
+        )
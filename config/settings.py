@@ -41,15 +41,21 @@ INSTALLED_APPS = [
     "rest_framework",
     "djoser",
     "drf_spectacular",
-    "silk",
     "users.apps.UsersConfig",
     "restaurants.apps.RestaurantsConfig",
     "cart.apps.CartConfig",
     "orders.apps.OrdersConfig",
     "customer.apps.CustomerConfig",
+    "idempotency.apps.IdempotencyConfig",
+    "analytics.apps.AnalyticsConfig",
+    "notifications.apps.NotificationsConfig",
+    "profiling.apps.ProfilingConfig",
+    "seeding.apps.SeedingConfig",
 ]
 
 MIDDLEWARE = [
+    "profiling.recorder.ProfilingMiddleware",
+    "config.asyncviews.ASGIURLConfMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -57,15 +63,19 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "silk.middleware.SilkyMiddleware",
+    # Innermost, so a profiler's own writes are not counted.
+    "config.querybudget.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
+# Requests served through config.asgi resolve here instead, where the
+# read-heavy GETs are async views (see config.asyncviews).
+ASGI_URLCONF = "config.urls_async"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "template"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -87,6 +97,17 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Take the write lock when a transaction starts, so concurrent
+        # checkouts queue on the busy timeout instead of failing with
+        # "database is locked" when upgrading a read lock.
+        "OPTIONS": {
+            "transaction_mode": "IMMEDIATE",
+        },
+        # A file-backed test database lets threaded tests use real
+        # cross-connection locking (in-memory shared cache cannot).
+        "TEST": {
+            "NAME": BASE_DIR / "test_db.sqlite3",
+        },
     }
 }
 
@@ -138,7 +159,17 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
+    ],
+    # orjson-backed JSON with a stdlib fallback; see benchmarks/renderers.py.
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
@@ -177,9 +208,9 @@ DJOSER = {
         "current_user": "users.serializers.CurrentUserSerializer",
     },
     "EMAIL": {
-        "activation": "users.emails.CustomActivationEmail",
-        "password_reset": "users.emails.CustomPasswordResetEmail",
-        "username_reset": "users.emails.CustomUsernameResetEmail",
+        "activation": "users.email.CustomActivationEmail",
+        "password_reset": "users.email.CustomPasswordResetEmail",
+        "username_reset": "users.email.CustomUsernameResetEmail",
     },
 }
 
@@ -197,3 +228,93 @@ DEFAULT_FROM_EMAIL = "Multi Restaurant <multi-restaurant@info.example.com>"
 
 
 SITE_ID = 1
+
+
+# Idempotency-Key handling for retried POSTs (see idempotency.decorators).
+# Expired keys are removed by `manage.py purge_idempotency_keys`. A key
+# still in flight after IN_FLIGHT_TTL is treated as abandoned by a request
+# that died, and a retry may claim it again.
+IDEMPOTENCY = {
+    "KEY_TTL": timedelta(hours=24),
+    "IN_FLIGHT_TTL": timedelta(minutes=5),
+    "WAIT_TIMEOUT": 10,
+    "POLL_INTERVAL": 0.05,
+}
+
+
+# Email outbox (see notifications.outbox). Requests only queue emails;
+# `manage.py send_outbox_emails` delivers them through EMAIL_BACKEND.
+NOTIFICATIONS = {
+    "BATCH_SIZE": 100,
+    "MAX_ATTEMPTS": 6,
+    "BACKOFF": 30,
+    "MAX_BACKOFF": 3600,
+    "LEASE": timedelta(minutes=5),
+    "POLL_INTERVAL": 5,
+}
+
+
+# Sampled request profiling (see profiling.recorder). ENABLED None follows
+# DEBUG, so profiling is off in production unless turned on explicitly.
+# SAMPLE_RATE of requests, plus those sending HEADER (with HEADER_TOKEN as
+# its value when set), are timed with their SQL and written by a
+# background thread in batches of BATCH_SIZE every FLUSH_INTERVAL seconds.
+# With SILK on, silk records the same sample too.
+PROFILING = {
+    "ENABLED": None,
+    "SAMPLE_RATE": 0.01,
+    "HEADER": "X-Profile",
+    "HEADER_TOKEN": "",
+    "MAX_QUERIES": 100,
+    "BUFFER_SIZE": 1000,
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 5.0,
+    "BACKGROUND": True,
+    "SILK": False,
+}
+
+if PROFILING["SILK"]:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("users.apps.UsersConfig"), "silk")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("config.querybudget.QueryBudgetMiddleware"),
+        "silk.middleware.SilkyMiddleware",
+    )
+    SILKY_INTERCEPT_FUNC = lambda request: getattr(request, "profiled", False)
+
+
+# Per-request query budgets (see config.querybudget). Views declare
+# `query_budget`; VIEWS overrides it by dotted class path and DEFAULT
+# applies to views without one. ACTION is "log", "raise" or None (only the
+# Server-Timing header); a view's `query_budget_action` overrides it. The
+# check runs after the response is built and committed, so "raise" is for
+# tests (see config.testing) and opted-in views only. A query shape
+# repeated REPEAT_THRESHOLD times in one request is reported as a possible
+# N+1.
+QUERY_BUDGET = {
+    "DEFAULT": None,
+    "VIEWS": {},
+    "REPEAT_THRESHOLD": 5,
+    "ACTION": "log",
+    "SERVER_TIMING": True,
+}
+
+
+# Read cache for restaurant menus. "locmem" is a per-process LRU, and a
+# write only invalidates the copy of the worker that handled it: with
+# several workers, the others can serve the old menu for up to TIMEOUT
+# seconds. Set BACKEND to "django" (with ALIAS naming a shared entry in
+# CACHES, such as Redis or Memcached) to share the cache between workers.
+MENU_CACHE = {
+    "BACKEND": "locmem",
+    "MAX_ENTRIES": 1024,
+    "TIMEOUT": 300,
+}
+
+# Snapshots of authenticated users (see users.authentication), keyed by
+# user id and token id. Kept short-lived: with the in-process backend, a
+# user saved by another worker is only seen here once the entry expires.
+AUTH_USER_CACHE = {
+    "BACKEND": "locmem",
+    "MAX_ENTRIES": 4096,
+    "TIMEOUT": 60,
+}
@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+
+from .querybudget import budget_settings, track_queries, view_budget
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin to hold a view to its query budget.
+
+    Usage::
+
+        with self.assertQueryBudget(CartView, "GET"):
+            view(request)
+
+    Fails when the block runs more queries than the view's budget (see
+    `config.querybudget.view_budget`) or repeats a query shape
+    QUERY_BUDGET["REPEAT_THRESHOLD"] times or more. Unlike
+    `assertNumQueries`, the budget lives on the view, so the middleware
+    enforces the same number at runtime.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, view_class, method="GET", budget=None):
+        if budget is None:
+            budget = view_budget(view_class, method)
+        with track_queries() as stats:
+            yield stats
+        problems = stats.problems(budget, budget_settings()["REPEAT_THRESHOLD"])
+        if problems:
+            self.fail(f"{method} {view_class.__qualname__}: " + "; ".join(problems))
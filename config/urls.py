@@ -15,6 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (
@@ -39,10 +40,14 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc",
     ),
-    path("silk/", include("silk.urls", namespace="silk")),
     # Local Apps
     path("api/v1/", include("users.urls"), name="users"),
     path("api/v1/", include("restaurants.urls"), name="restaurants"),
     path("api/v1/", include("cart.urls"), name="cart"),
     path("api/v1/", include("orders.urls"), name="orders"),
+    path("api/v1/", include("analytics.urls"), name="analytics"),
+    path("api/v1/", include("customer.urls"), name="customer"),
 ]
+
+if settings.PROFILING["SILK"]:
+    urlpatterns.append(path("silk/", include("silk.urls", namespace="silk")))
@@ -0,0 +1,28 @@
+"""
+URL configuration of requests served through ASGI (`config.asgi`).
+
+Same as `config.urls`, except that the read-heavy endpoints below are
+async views. They answer GET on the event loop and hand every other
+method to the DRF view they replace, so the API is unchanged.
+"""
+
+from django.urls import path
+
+from cart.views import AsyncCartView
+from restaurants.views import AsyncMenuListView, AsyncRestaurantDetailView
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path(
+        "api/v1/restaurants/<int:pk>/",
+        AsyncRestaurantDetailView.as_view(),
+        name="restaurant-detail",
+    ),
+    path(
+        "api/v1/restaurants/<int:restaurant_pk>/menu/",
+        AsyncMenuListView.as_view(),
+        name="menu-create",
+    ),
+    path("api/v1/cart/", AsyncCartView.as_view(), name="cart-detail"),
+    *sync_urlpatterns,
+]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-17 06:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('restaurants', '0004_menu_restaurant_name_uniq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RestaurantMenuSnapshot',
+            fields=[
+                ('restaurant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='menu_snapshot', serialize=False, to='restaurants.restaurants')),
+                ('body', models.BinaryField()),
+                ('etag', models.CharField(max_length=40)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -1,3 +1,29 @@
 from django.db import models
 
-# Create your models here.
+from restaurants.models import Restaurants
+
+
+class RestaurantMenuSnapshot(models.Model):
+    """
+    The public menu response of one restaurant, rendered ahead of time.
+
+    `body` holds the exact JSON bytes CustomerMenuItemsView returns, so a
+    read is one primary-key lookup. Snapshots are rebuilt by
+    `customer.snapshots` after a transaction that changed the restaurant
+    or its menu commits; `version` counts the rebuilds that changed the
+    body.
+    """
+
+    restaurant = models.OneToOneField(
+        Restaurants,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="menu_snapshot",
+    )
+    body = models.BinaryField()
+    etag = models.CharField(max_length=40)
+    version = models.PositiveIntegerField(default=1)
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.restaurant_id} v{self.version}"
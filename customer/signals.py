@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from restaurants.models import Menu, Restaurants
+from restaurants.signals import menu_bulk_changed
+from .snapshots import schedule_rebuild
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def rebuild_menu_snapshot(sender, instance, **kwargs):
+    schedule_rebuild([instance.restaurant_id])
+
+
+@receiver(post_save, sender=Restaurants)
+def rebuild_restaurant_snapshot(sender, instance, **kwargs):
+    schedule_rebuild([instance.pk])
+
+
+@receiver(menu_bulk_changed)
+def rebuild_imported_snapshot(sender, restaurant_id, **kwargs):
+    schedule_rebuild([restaurant_id])
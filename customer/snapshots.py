@@ -0,0 +1,196 @@
+"""
+Maintenance of RestaurantMenuSnapshot rows.
+
+Writes to a restaurant or its menu items only schedule a rebuild. The
+restaurants touched in a transaction are collected and rebuilt once,
+after it commits, so a bulk edit wrapped in `transaction.atomic()` (or a
+menu import) costs one rebuild per restaurant however many rows it
+changed. Outside a transaction every write commits, and rebuilds, on
+its own.
+
+A restaurant without a snapshot yet (created before the table existed)
+gets one on its first read.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, FilteredRelation, Q
+from django.utils import timezone
+from django.utils.http import quote_etag
+
+from config.renderers import FastJSONRenderer
+from restaurants.models import Restaurants
+from .models import RestaurantMenuSnapshot
+
+RESTAURANT_FIELDS = ("id", "name", "description", "address", "phone_number")
+ITEM_FIELDS = ("id", "name", "description", "price")
+# Restaurants rebuild() remembers per thread. Forgetting the oldest one
+# only costs a redundant rebuild if a callback scheduled before it runs.
+REBUILT_LIMIT = 1024
+# Renders of one rebuild before it gives way to concurrent rebuilds.
+MAX_BUILD_ATTEMPTS = 5
+
+
+def menu_etag(restaurant_updated_at, items_updated_at):
+    """
+    Build the ETag of a public menu.
+
+    The number of available items catches items that are deleted or made
+    unavailable; the newest `updated_at` catches every other change,
+    because any edit to an item or the restaurant bumps it.
+    """
+    newest = max(items_updated_at, default=None)
+    raw = f"{restaurant_updated_at.isoformat()}|{len(items_updated_at)}|{newest}"
+    return quote_etag(hashlib.md5(raw.encode("utf-8")).hexdigest())
+
+
+def menu_rows(restaurant_id):
+    """
+    Return the restaurant and its available items as tuples, one row per
+    item (a single row with NULL item columns when it has none), in one
+    query (a LEFT JOIN via FilteredRelation).
+    """
+    return (
+        Restaurants.objects.filter(pk=restaurant_id)
+        .annotate(item=FilteredRelation("menu", condition=Q(menu__is_available=True)))
+        .order_by("item__name", "item__id")
+        .values_list(
+            *RESTAURANT_FIELDS,
+            "updated_at",
+            *(f"item__{field}" for field in ITEM_FIELDS),
+            "item__updated_at",
+        )
+    )
+
+
+def render_menu(rows):
+    """
+    Render the public menu response of `menu_rows`.
+
+    Returns:
+        tuple[str, bytes]: The ETag and the compact JSON body.
+    """
+    restaurant_width = len(RESTAURANT_FIELDS)
+    items = [row[restaurant_width + 1 :] for row in rows if row[-1] is not None]
+    etag = menu_etag(rows[0][restaurant_width], [item[-1] for item in items])
+    payload = {
+        "msg": "Restaurant menu",
+        "data": {
+            "restaurant": dict(zip(RESTAURANT_FIELDS, rows[0])),
+            "menu": [dict(zip(ITEM_FIELDS, item)) for item in items],
+        },
+        "status": True,
+    }
+    return etag, FastJSONRenderer().render(payload)
+
+
+def build_snapshot(restaurant_id):
+    """
+    Render a restaurant's public menu and store it as its snapshot.
+
+    The row is only written when the ETag changed, bumping `version`, and
+    only if it still holds the ETag read before rendering. When another
+    rebuild wrote in between, the menu is rendered again, so an older
+    render never overwrites a newer one.
+
+    Returns:
+        tuple[str, bytes] | None: The ETag and body, or None if the
+        restaurant does not exist.
+    """
+    snapshots = RestaurantMenuSnapshot.objects.filter(pk=restaurant_id)
+    for _ in range(MAX_BUILD_ATTEMPTS):
+        current = snapshots.values_list("etag", flat=True).first()
+        rows = list(menu_rows(restaurant_id))
+        if not rows:
+            return None
+        etag, body = render_menu(rows)
+        if current == etag:
+            return etag, body
+        if current is None:
+            try:
+                with transaction.atomic():
+                    RestaurantMenuSnapshot.objects.create(
+                        restaurant_id=restaurant_id, body=body, etag=etag
+                    )
+                return etag, body
+            except IntegrityError:
+                # Built concurrently; render against that one.
+                continue
+        written = snapshots.filter(etag=current).update(
+            body=body, etag=etag, version=F("version") + 1, built_at=timezone.now()
+        )
+        if written:
+            return etag, body
+    # Other rebuilds keep winning; theirs are at least as new as this one.
+    return etag, body
+
+
+def get_snapshot(restaurant_id):
+    """
+    Return the stored (etag, body) of a restaurant's public menu, building
+    it on first use.
+
+    Returns:
+        tuple[str, bytes] | None: None if the restaurant does not exist.
+    """
+    snapshot = (
+        RestaurantMenuSnapshot.objects.filter(pk=restaurant_id)
+        .values_list("etag", "body")
+        .first()
+    )
+    if snapshot is None:
+        return build_snapshot(restaurant_id)
+    return snapshot
+
+
+_state = threading.local()
+
+
+def tick():
+    """
+    Advance and return this thread's rebuild clock.
+    """
+    _state.clock = getattr(_state, "clock", 0) + 1
+    return _state.clock
+
+
+def rebuild(restaurant_ids, scheduled_at):
+    """
+    Rebuild the snapshots of `restaurant_ids`, skipping those rebuilt on
+    this thread after `scheduled_at`: that rebuild ran after the commit,
+    so it already saw the change. Only the latest REBUILT_LIMIT
+    restaurants are remembered.
+    """
+    if not hasattr(_state, "rebuilt"):
+        _state.rebuilt = OrderedDict()
+    rebuilt = _state.rebuilt
+    for restaurant_id in sorted(set(restaurant_ids)):
+        if rebuilt.get(restaurant_id, 0) > scheduled_at:
+            continue
+        rebuilt[restaurant_id] = tick()
+        rebuilt.move_to_end(restaurant_id)
+        while len(rebuilt) > REBUILT_LIMIT:
+            rebuilt.popitem(last=False)
+        build_snapshot(restaurant_id)
+
+
+def schedule_rebuild(restaurant_ids):
+    """
+    Rebuild the snapshots of `restaurant_ids` once the current transaction
+    commits, together with any others scheduled in it.
+
+    Each call registers its own `on_commit` callback, so a rolled back
+    transaction or savepoint drops its restaurants with it. After the
+    commit, the first callback rebuilds a restaurant and the others
+    scheduled in the same transaction skip it.
+    """
+    restaurant_ids = list(restaurant_ids)
+    scheduled_at = tick()
+    if not transaction.get_connection().in_atomic_block:
+        rebuild(restaurant_ids, scheduled_at)
+        return
+    transaction.on_commit(partial(rebuild, restaurant_ids, scheduled_at))
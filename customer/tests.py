@@ -1,3 +1,220 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+
+from restaurants.models import Restaurants, Menu
+from users.models import User
+from . import snapshots
+from .models import RestaurantMenuSnapshot
+from .views import CustomerMenuItemsView
+
+
+class CustomerMenuTests(APITestCase):
+    def setUp(self):
+        owner = User.objects.create(
+            email="owner@example.com",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        # Snapshots are rebuilt once the writes commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant = Restaurants.objects.create(
+                name="Chop Bar",
+                owner=owner,
+                description="Food",
+                address="Accra",
+                phone_number="0244000000",
+            )
+            self.items = Menu.objects.bulk_create(
+                [
+                    Menu(
+                        name=name,
+                        description="Tasty",
+                        price=Decimal("10.00"),
+                        is_available=available,
+                        restaurant=self.restaurant,
+                    )
+                    for name, available in (
+                        ("Waakye", True),
+                        ("Banku", True),
+                        ("Fufu", False),
+                    )
+                ]
+            )
+        self.url = reverse("customer-menu", args=[self.restaurant.pk])
+
+    def test_public_menu_lists_available_items(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()["data"]
+        self.assertEqual(data["restaurant"]["name"], "Chop Bar")
+        self.assertEqual([item["name"] for item in data["menu"]], ["Banku", "Waakye"])
+        self.assertEqual(data["menu"][0]["price"], "10.00")
+
+    def test_restaurant_without_available_items(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for item in self.items:
+                item.is_available = False
+                item.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["menu"], [])
+
+    def test_unknown_restaurant(self):
+        response = self.client.get(reverse("customer-menu", args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unchanged_menu_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_changes_invalidate_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        waakye = self.items[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            waakye.is_available = False
+            waakye.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_single_query(self):
+        view = CustomerMenuItemsView.as_view()
+        request = APIRequestFactory().get(self.url)
+        with self.assertNumQueries(1):
+            view(request, restaurant_id=self.restaurant.pk)
+
+
+class MenuSnapshotTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create(
+            email="owner@example.com",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant = Restaurants.objects.create(
+                name="Chop Bar",
+                owner=self.owner,
+                description="Food",
+                address="Accra",
+                phone_number="0244000000",
+            )
+        self.url = reverse("customer-menu", args=[self.restaurant.pk])
+
+    def snapshot(self):
+        return RestaurantMenuSnapshot.objects.get(pk=self.restaurant.pk)
+
+    def test_read_returns_stored_bytes(self):
+        response = self.client.get(self.url)
+        snapshot = self.snapshot()
+        self.assertEqual(response.content, bytes(snapshot.body))
+        self.assertEqual(response["ETag"], snapshot.etag)
+
+    def test_bulk_edit_rebuilds_once(self):
+        with mock.patch.object(
+            snapshots, "build_snapshot", wraps=snapshots.build_snapshot
+        ) as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(20):
+                    Menu.objects.create(
+                        name=f"Dish {i}",
+                        description="Tasty",
+                        price="5.00",
+                        restaurant=self.restaurant,
+                    )
+                self.restaurant.name = "Chop House"
+                self.restaurant.save()
+        build.assert_called_once_with(self.restaurant.pk)
+
+        data = self.client.get(self.url).json()["data"]
+        self.assertEqual(data["restaurant"]["name"], "Chop House")
+        self.assertEqual(len(data["menu"]), 20)
+        self.assertEqual(self.snapshot().version, 2)
+
+    def test_rebuild_clock_is_bounded(self):
+        with mock.patch.object(snapshots, "REBUILT_LIMIT", 2):
+            for restaurant_id in range(1000, 1005):
+                snapshots.rebuild([restaurant_id], snapshots.tick())
+            snapshots.rebuild([self.restaurant.pk], snapshots.tick())
+        self.assertEqual(list(snapshots._state.rebuilt), [1004, self.restaurant.pk])
+
+    def test_unchanged_rebuild_keeps_version(self):
+        snapshots.build_snapshot(self.restaurant.pk)
+        self.assertEqual(self.snapshot().version, 1)
+
+    def test_stale_render_does_not_overwrite_newer_snapshot(self):
+        # Commit callbacks are not run here, so the snapshot stays behind.
+        Menu.objects.create(
+            name="Waakye", description="Tasty", price="5.00", restaurant=self.restaurant
+        )
+        stale = list(snapshots.menu_rows(self.restaurant.pk))
+        Menu.objects.create(
+            name="Kenkey", description="Tasty", price="4.00", restaurant=self.restaurant
+        )
+        menu_rows = snapshots.menu_rows
+        renders = []
+
+        def rows(restaurant_id):
+            renders.append(restaurant_id)
+            if len(renders) == 1:
+                # A newer rebuild writes while this one is rendering.
+                snapshots.build_snapshot(restaurant_id)
+                return stale
+            return menu_rows(restaurant_id)
+
+        with mock.patch.object(snapshots, "menu_rows", side_effect=rows):
+            etag, body = snapshots.build_snapshot(self.restaurant.pk)
+
+        snapshot = self.snapshot()
+        self.assertEqual(snapshot.etag, etag)
+        self.assertIn(b"Kenkey", bytes(snapshot.body))
+        self.assertEqual(snapshot.version, 2)
+        self.assertEqual(len(renders), 3)
+
+    def test_rolled_back_transaction_does_not_block_later_rebuilds(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Menu.objects.create(
+                        name="Ghost",
+                        description="Rolled back",
+                        price="1.00",
+                        restaurant=self.restaurant,
+                    )
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            Menu.objects.create(
+                name="Waakye",
+                description="Tasty",
+                price="5.00",
+                restaurant=self.restaurant,
+            )
+        menu = self.client.get(self.url).json()["data"]["menu"]
+        self.assertEqual([item["name"] for item in menu], ["Waakye"])
+
+    def test_menu_import_rebuilds(self):
+        self.client.force_authenticate(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("menu-bulk", args=[self.restaurant.pk]),
+                [{"name": "Kenkey", "description": "Corn", "price": "8.00"}],
+                format="json",
+            )
+        self.assertEqual(self.snapshot().version, 2)
+        self.assertIn(b"Kenkey", bytes(self.snapshot().body))
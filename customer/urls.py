@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import CustomerMenuItemsView
+
+urlpatterns = [
+    path(
+        "customer/restaurants/<int:restaurant_id>/menu/",
+        CustomerMenuItemsView.as_view(),
+        name="customer-menu",
+    ),
+]
@@ -1,34 +1,57 @@
-from restaurants.models import Restaurants, Menu, MenuItem
-from rest_framework.generics import GenericAPIView, get_object_or_404
-from rest_framework.response import Response
-from rest_framework import status
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 
+from .snapshots import get_snapshot
 
+
+@extend_schema(tags=["customer"])
 class CustomerMenuItemsView(GenericAPIView):
     """
-    View to retrieve menu items for a specific restaurant.
+    Public menu of a restaurant: its details and available menu items.
+
+    The response is served from the restaurant's RestaurantMenuSnapshot:
+    one primary-key lookup returns the stored JSON bytes and their ETag,
+    with no join, serializer or encoder on the read path. Snapshots are
+    rebuilt by `customer.snapshots` when the restaurant or its menu
+    changes. A request whose `If-None-Match` matches the ETag gets an
+    empty 304.
+
+    Methods:
+        get(request, restaurant_id): Return the restaurant's public menu.
     """
 
-    def get(self, request: Request, restaurant_id: int) -> Response:
-        # Retrieve the restaurant or return 404 if not found
-        restaurant = get_object_or_404(Restaurants, id=restaurant_id)
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request: Request, restaurant_id: int) -> HttpResponse:
+        """
+        Retrieve the public menu of a restaurant.
 
-        # Retrieve the menu associated with the restaurant
-        menu = get_object_or_404(Menu, restaurant=restaurant)
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Optional header: `If-None-Match` with a previous ETag.
+            restaurant_id (int): Path parameter for the restaurant.
 
-        # Retrieve all menu items for the menu
-        menu_items = MenuItem.objects.filter(menu=menu)
+        Returns:
+            django.http.HttpResponse: Compact JSON with the restaurant and
+            its available menu items (HTTP 200), or an empty HTTP 304 when
+            the menu has not changed since the given ETag.
 
-        # Prepare the response data
-        items_data = [
-            {
-                "id": item.id,
-                "name": item.name,
-                "description": item.description,
-                "price": item.price,
-            }
-            for item in menu_items
-        ]
+        Raises:
+            Http404 if the restaurant does not exist.
+        """
+        snapshot = get_snapshot(restaurant_id)
+        if snapshot is None:
+            raise Http404("Restaurant not found")
+        etag, body = snapshot
 
-        return Response(items_data, status=status.HTTP_200_OK)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        return response
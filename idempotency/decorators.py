@@ -0,0 +1,184 @@
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from config.querybudget import untracked
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Set when the response is rendered, so not stored for replay.
+RENDERED_HEADERS = {"content-type", "content-length"}
+
+
+def fingerprint(request):
+    """
+    Hash the parts of a request that must match for a key to be replayed.
+    """
+    payload = json.dumps(
+        [request.method, request.path, request.data],
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def stored_headers(response):
+    """
+    Return the headers of `response` to store for replay.
+    """
+    return {
+        name: value
+        for name, value in response.items()
+        if name.lower() not in RENDERED_HEADERS
+    }
+
+
+def replay(record):
+    response = Response(
+        record.response_body,
+        status=record.status_code,
+        headers=record.response_headers,
+    )
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def error(msg, status_code):
+    return Response({"msg": msg, "status": False}, status=status_code)
+
+
+def claim(user, key, request_hash):
+    """
+    Try to register `key` as in flight for `user`.
+
+    A key that expired, or that has been in flight for longer than
+    IDEMPOTENCY["IN_FLIGHT_TTL"] because its request died, is removed and
+    claimed again.
+
+    Returns:
+        tuple: (record, created). When another request already holds the
+        key, `record` is that request's row and `created` is False.
+    """
+    while True:
+        try:
+            with transaction.atomic():
+                return (
+                    IdempotencyKey.objects.create(
+                        user=user, key=key, request_hash=request_hash
+                    ),
+                    True,
+                )
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is None:
+                # The holder failed and released the key in between; retry.
+                continue
+            if record.is_expired or record.is_abandoned:
+                IdempotencyKey.objects.filter(pk=record.pk).delete()
+                continue
+            return record, False
+
+
+def wait_for(record):
+    """
+    Poll an in-flight key until its response is stored or the wait times out.
+
+    Returns:
+        IdempotencyKey | None: The latest state of the record, or None if
+        the original request failed and released the key.
+    """
+    config = settings.IDEMPOTENCY
+    deadline = time.monotonic() + config["WAIT_TIMEOUT"]
+    with untracked():
+        while not record.is_complete and time.monotonic() < deadline:
+            time.sleep(config["POLL_INTERVAL"])
+            record = IdempotencyKey.objects.filter(pk=record.pk).first()
+            if record is None:
+                return None
+    return record
+
+
+def idempotent(handler):
+    """
+    Make a view handler safe to retry with an `Idempotency-Key` header.
+
+    The first request carrying a given key runs the handler and its response
+    is stored. Retries with the same key and payload get the stored response
+    back, marked with `Idempotent-Replayed: true`, without the handler
+    running again. A retry that arrives while the first request is still in
+    flight waits for it and replays its response; once that request has
+    been in flight for IDEMPOTENCY["IN_FLIGHT_TTL"], a retry takes the key
+    over and runs the handler. Requests without the header, or from
+    anonymous users, are passed straight through.
+
+    Responses with a 5xx status, or handlers that raise, release the key so
+    the client can retry.
+
+    Errors:
+        400 if the key is longer than 255 characters.
+        409 if the original request is still in flight after
+            IDEMPOTENCY["WAIT_TIMEOUT"] seconds.
+        422 if the key was already used for a different request.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return handler(self, request, *args, **kwargs)
+        if len(key) > 255:
+            return error(
+                f"{HEADER} must be at most 255 characters",
+                status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = fingerprint(request)
+        while True:
+            # Like the polling in wait_for(), claiming is bookkeeping whose
+            # cost depends on the other requests, not the view's own.
+            with untracked():
+                record, created = claim(request.user, key, request_hash)
+            if created:
+                break
+            if record.request_hash != request_hash:
+                return error(
+                    f"{HEADER} was already used for a different request",
+                    status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            record = wait_for(record)
+            if record is None:
+                # The original request failed; take the key over.
+                continue
+            if not record.is_complete:
+                return error(
+                    f"A request with this {HEADER} is still in progress",
+                    status.HTTP_409_CONFLICT,
+                )
+            return replay(record)
+
+        try:
+            response = handler(self, request, *args, **kwargs)
+        except Exception:
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+            raise
+
+        if response.status_code >= 500:
+            IdempotencyKey.objects.filter(pk=record.pk).delete()
+            return response
+
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            status_code=response.status_code,
+            response_body=response.data,
+            response_headers=stored_headers(response),
+        )
+        return response
+
+    return wrapper
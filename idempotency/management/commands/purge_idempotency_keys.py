@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from idempotency.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than IDEMPOTENCY['KEY_TTL']."
+
+    def handle(self, *args, **options):
+        deleted = IdempotencyKey.objects.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} idempotency keys"))
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from users.models import User
+
+
+def key_ttl():
+    return settings.IDEMPOTENCY["KEY_TTL"]
+
+
+def in_flight_ttl():
+    return settings.IDEMPOTENCY["IN_FLIGHT_TTL"]
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self):
+        """
+        Return keys older than the configured IDEMPOTENCY["KEY_TTL"].
+        """
+        return self.filter(created_at__lt=timezone.now() - key_ttl())
+
+    def purge_expired(self):
+        """
+        Delete expired keys and return how many were removed.
+        """
+        deleted, _ = self.expired().delete()
+        return deleted
+
+
+class IdempotencyKey(models.Model):
+    """
+    A client-supplied `Idempotency-Key` and the response it produced.
+
+    A row is inserted before the view runs, with `status_code` left null
+    while the request is in flight; the response is stored once the view
+    returns so retries can be replayed without running it again. A key
+    still in flight after IDEMPOTENCY["IN_FLIGHT_TTL"] is taken to belong
+    to a request that died and can be claimed again.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    # Headers the view set on the response, such as Location or ETag.
+    response_headers = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.key} by {self.user_id}"
+
+    @property
+    def is_complete(self):
+        return self.status_code is not None
+
+    @property
+    def is_expired(self):
+        return self.created_at < timezone.now() - key_ttl()
+
+    @property
+    def is_abandoned(self):
+        return (
+            not self.is_complete and self.created_at < timezone.now() - in_flight_ttl()
+        )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="idempotency_unique_user_key"
+            ),
+        ]
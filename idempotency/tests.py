@@ -0,0 +1,207 @@
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    APITestCase,
+    force_authenticate,
+)
+from rest_framework.views import APIView
+
+from cart.models import Cart, CartItem
+from config.testing import QueryBudgetTestMixin
+from orders.models import Order
+from orders.views import OrderCreateView
+from restaurants.models import Restaurants, Menu
+from users.models import User
+from .decorators import fingerprint, idempotent
+from .models import IdempotencyKey
+
+
+class IdempotencyFixturesMixin:
+    def setUp(self):
+        self.url = reverse("order-create")
+        owner = User.objects.create(
+            email="owner@example.com",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        self.menu = Menu.objects.create(
+            name="Jollof",
+            description="Rice",
+            price=Decimal("20.00"),
+            restaurant=restaurant,
+        )
+        self.customer = User.objects.create(
+            email="customer@example.com",
+            first_name="John",
+            last_name="Doe",
+        )
+        cart = Cart.objects.create(customer=self.customer)
+        CartItem.objects.create(cart=cart, menu_item=self.menu, quantity=2)
+
+
+class IdempotencyTests(QueryBudgetTestMixin, IdempotencyFixturesMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.customer)
+
+    def test_retry_replays_stored_response(self):
+        first = self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        second = self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_without_key_the_view_runs_again(self):
+        self.client.post(self.url)
+        response = self.client.post(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_key_reused_for_different_request(self):
+        self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        response = self.client.post(
+            self.url, {"note": "other"}, HTTP_IDEMPOTENCY_KEY="order-1"
+        )
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_scoped_per_user(self):
+        self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        other = User.objects.create(
+            email="other@example.com", first_name="Ama", last_name="Doe"
+        )
+        self.client.force_authenticate(other)
+        response = self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_keys_are_purged(self):
+        self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(IdempotencyKey.objects.purge_expired(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    @override_settings(
+        IDEMPOTENCY={
+            "KEY_TTL": timedelta(hours=24),
+            "IN_FLIGHT_TTL": timedelta(minutes=5),
+            "WAIT_TIMEOUT": 0,
+            "POLL_INTERVAL": 0,
+        }
+    )
+    def test_in_flight_key_conflicts_until_its_lease_ends(self):
+        # Claimed by the same request, which never finished.
+        record = IdempotencyKey.objects.create(
+            user=self.customer,
+            key="order-1",
+            request_hash=fingerprint(Request(APIRequestFactory().post(self.url))),
+        )
+
+        response = self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            created_at=timezone.now() - timedelta(minutes=6)
+        )
+        response = self.client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_taking_over_an_abandoned_key_stays_within_budget(self):
+        IdempotencyKey.objects.create(
+            user=self.customer,
+            key="order-1",
+            request_hash=fingerprint(Request(APIRequestFactory().post(self.url))),
+        )
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=1))
+        request = APIRequestFactory().post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+        force_authenticate(request, user=self.customer)
+
+        with self.assertQueryBudget(OrderCreateView, "POST"):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = OrderCreateView.as_view()(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_replay_keeps_response_headers(self):
+        calls = []
+
+        class CreateView(APIView):
+            @idempotent
+            def post(self, request):
+                calls.append(request)
+                return Response(
+                    {"status": True},
+                    status=status.HTTP_201_CREATED,
+                    headers={"Location": "/things/1/", "ETag": '"v1"'},
+                )
+
+        view = CreateView.as_view()
+        responses = []
+        for _ in range(2):
+            request = APIRequestFactory().post(
+                "/things/", HTTP_IDEMPOTENCY_KEY="thing-1"
+            )
+            force_authenticate(request, user=self.customer)
+            responses.append(view(request).render())
+
+        first, second = responses
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(second["Location"], "/things/1/")
+        self.assertEqual(second["ETag"], '"v1"')
+        self.assertEqual(second["Content-Type"], first["Content-Type"])
+        self.assertEqual(second.content, first.content)
+
+
+class ConcurrentIdempotencyTests(IdempotencyFixturesMixin, TransactionTestCase):
+    def test_concurrent_duplicates_coalesce(self):
+        threads = 10
+        barrier = threading.Barrier(threads)
+        responses = []
+        lock = threading.Lock()
+
+        def post():
+            try:
+                client = APIClient()
+                client.force_authenticate(self.customer)
+                barrier.wait()
+                response = client.post(self.url, HTTP_IDEMPOTENCY_KEY="order-1")
+                with lock:
+                    responses.append(response)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=post) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(len(responses), threads)
+        bodies = {response.content for response in responses}
+        self.assertEqual(len(bodies), 1)
+        self.assertTrue(
+            all(r.status_code == status.HTTP_201_CREATED for r in responses)
+        )
+        replayed = [r for r in responses if r.has_header("Idempotent-Replayed")]
+        self.assertEqual(len(replayed), threads - 1)
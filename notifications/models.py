@@ -0,0 +1,82 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEmailQuerySet(models.QuerySet):
+    def due(self, now=None):
+        """
+        Return pending emails whose next attempt is due.
+        """
+        return self.filter(
+            status=OutboxEmail.PENDING, next_attempt_at__lte=now or timezone.now()
+        )
+
+    def create_from_message(self, message):
+        """
+        Store a Django EmailMessage (or EmailMultiAlternatives) as a pending
+        outbox row.
+        """
+        return self.create(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            alternatives=[
+                [content, mimetype]
+                for content, mimetype in getattr(message, "alternatives", [])
+            ],
+            headers=dict(message.extra_headers),
+        )
+
+
+class OutboxEmail(models.Model):
+    """
+    An email waiting to be delivered by `manage.py send_outbox_emails`.
+
+    Rows are written by `notifications.outbox.enqueue` once the request's
+    transaction commits, so a response never waits on SMTP and a rolled
+    back request never sends mail. Failed sends are retried with
+    exponential backoff until NOTIFICATIONS["MAX_ATTEMPTS"] is reached.
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    subject = models.TextField()
+    body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    alternatives = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    objects = OutboxEmailQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
+
+    class Meta:
+        indexes = [
+            # Serves the worker's "pending and due, oldest first" claim.
+            models.Index(
+                fields=["status", "next_attempt_at", "id"],
+                name="outbox_due_idx",
+            ),
+        ]
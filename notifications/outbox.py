@@ -0,0 +1,150 @@
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def outbox_settings():
+    return settings.NOTIFICATIONS
+
+
+def enqueue(message):
+    """
+    Queue an EmailMessage for delivery by the outbox worker.
+
+    The row is written once the current transaction commits (straight away
+    outside one), so nothing is queued for a request that rolls back.
+
+    Args:
+        message (django.core.mail.EmailMessage): The message to deliver;
+            alternatives such as an HTML body are kept.
+    """
+    transaction.on_commit(partial(OutboxEmail.objects.create_from_message, message))
+
+
+def enqueue_templated(email, to):
+    """
+    Render a Djoser templated email and queue it for `to`.
+
+    Djoser's `BaseEmailMessage.send()` renders and delivers in one step;
+    this renders the subject and bodies right away, so a template error
+    fails the request before it commits, and hands only the rendered
+    message to the outbox.
+
+    Args:
+        email (djoser.email.BaseEmailMessage): E.g. an ActivationEmail built
+            with the request and its context.
+        to (list[str]): Recipient addresses.
+    """
+    email.render()
+    email.to = list(to)
+    enqueue(email)
+
+
+def backoff(attempts):
+    """
+    Return the delay before retry number `attempts` (1-based): BACKOFF
+    seconds doubled per failed attempt, capped at MAX_BACKOFF.
+    """
+    config = outbox_settings()
+    return timedelta(
+        seconds=min(config["BACKOFF"] * 2 ** (attempts - 1), config["MAX_BACKOFF"])
+    )
+
+
+def claim(batch_size):
+    """
+    Lease up to `batch_size` due emails to this worker.
+
+    The claimed rows' next attempt is pushed LEASE into the future, so
+    other workers skip them while they are being sent, and a worker that
+    dies mid-batch only delays them until the lease runs out.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.due(now)
+            .select_for_update(skip_locked=True)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=now + outbox_settings()["LEASE"]
+        )
+    return emails
+
+
+def build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+        connection=connection,
+    )
+    for content, mimetype in email.alternatives:
+        message.attach_alternative(content, mimetype)
+    return message
+
+
+def deliver_pending(batch_size=None):
+    """
+    Send one batch of due emails over a single backend connection.
+
+    Sent emails are marked SENT. A failed one is rescheduled with
+    exponential backoff, or marked FAILED after MAX_ATTEMPTS; if the
+    connection cannot even be opened the whole batch is rescheduled.
+
+    Args:
+        batch_size (int | None): Maximum number of emails to send,
+            NOTIFICATIONS["BATCH_SIZE"] by default.
+
+    Returns:
+        tuple[int, int]: (sent, failed) counts for this batch.
+    """
+    config = outbox_settings()
+    emails = claim(batch_size or config["BATCH_SIZE"])
+    if not emails:
+        return 0, 0
+
+    sent, failed = [], []
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        failed = [(email, exc) for email in emails]
+    else:
+        try:
+            for email in emails:
+                try:
+                    build_message(email, connection).send()
+                except Exception as exc:
+                    failed.append((email, exc))
+                else:
+                    sent.append(email)
+        finally:
+            connection.close()
+
+    now = timezone.now()
+    OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+        status=OutboxEmail.SENT, sent_at=now, last_error=""
+    )
+    for email, exc in failed:
+        email.attempts += 1
+        email.last_error = f"{type(exc).__name__}: {exc}"
+        if email.attempts >= config["MAX_ATTEMPTS"]:
+            email.status = OutboxEmail.FAILED
+        else:
+            email.next_attempt_at = now + backoff(email.attempts)
+        email.save(
+            update_fields=["attempts", "last_error", "status", "next_attempt_at"]
+        )
+    return len(sent), len(failed)
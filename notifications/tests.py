@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.template import TemplateSyntaxError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.email import CustomActivationEmail
+from users.models import User
+from .models import OutboxEmail
+from .outbox import deliver_pending, enqueue
+
+
+def message(subject="Hello"):
+    message = EmailMultiAlternatives(
+        subject, "Plain body", "from@example.com", ["to@example.com"]
+    )
+    message.attach_alternative("<p>HTML body</p>", "text/html")
+    return message
+
+
+class OutboxTests(APITestCase):
+    def test_enqueue_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            enqueue(message())
+            self.assertFalse(OutboxEmail.objects.exists())
+        callbacks[0]()
+        self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.PENDING)
+
+    def test_worker_sends_batch_over_one_connection(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(3):
+                enqueue(message(f"Hello {i}"))
+
+        with mock.patch(
+            "notifications.outbox.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            self.assertEqual(deliver_pending(), (3, 0))
+        get_connection.assert_called_once()
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].alternatives[0][0], "<p>HTML body</p>")
+        self.assertEqual(OutboxEmail.objects.filter(status=OutboxEmail.SENT).count(), 3)
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    def test_failures_back_off_then_give_up(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(message())
+        email = OutboxEmail.objects.get()
+
+        with mock.patch.object(
+            EmailMultiAlternatives, "send", side_effect=OSError("SMTP down")
+        ):
+            for attempt in range(1, 7):
+                self.assertEqual(deliver_pending(), (0, 1))
+                email.refresh_from_db()
+                self.assertEqual(email.attempts, attempt)
+                # Not due again until the backoff has passed.
+                self.assertEqual(deliver_pending(), (0, 0))
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual(email.status, OutboxEmail.FAILED)
+        self.assertEqual(email.last_error, "OSError: SMTP down")
+
+    def test_backoff_doubles(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(message())
+        with mock.patch.object(EmailMultiAlternatives, "send", side_effect=OSError):
+            before = timezone.now()
+            deliver_pending()
+            first = OutboxEmail.objects.get().next_attempt_at - before
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            before = timezone.now()
+            deliver_pending()
+            second = OutboxEmail.objects.get().next_attempt_at - before
+        self.assertAlmostEqual(second / first, 2, delta=0.1)
+        self.assertLess(first, timedelta(seconds=31))
+
+    def test_command_drains_outbox(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue(message())
+        call_command("send_outbox_emails", "--once", stdout=mock.Mock())
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class QueuedUserEmailTests(APITestCase):
+    def test_registration_queues_activation_email(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("register_customer"),
+                {
+                    "email": "user@example.com",
+                    "password": "check@123",
+                    "first_name": "John",
+                    "last_name": "Doe",
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(mail.outbox), 0)
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ["user@example.com"])
+        self.assertIn("Activation", email.subject)
+        self.assertEqual(deliver_pending(), (1, 0))
+
+    def test_render_error_rolls_back_registration(self):
+        with mock.patch.object(
+            CustomActivationEmail,
+            "render",
+            side_effect=TemplateSyntaxError("broken"),
+        ):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(TemplateSyntaxError):
+                    self.client.post(
+                        reverse("register_customer"),
+                        {
+                            "email": "user@example.com",
+                            "password": "check@123",
+                            "first_name": "John",
+                            "last_name": "Doe",
+                        },
+                        format="json",
+                    )
+        self.assertEqual(callbacks, [])
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_role_change_queues_email(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com",
+            password="check@123",
+            first_name="Ada",
+            last_name="Admin",
+        )
+        user = User.objects.create_user(
+            email="user@example.com",
+            password="check@123",
+            first_name="John",
+            last_name="Doe",
+        )
+        self.client.force_authenticate(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("update_user_role", args=[user.pk]),
+                {"role": "owner"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().to, ["user@example.com"])
@@ -7,6 +7,23 @@ from users.models import User
 # Create your models here.
 
 
+class OrderQuerySet(models.QuerySet):
+    def with_items(self, items=None):
+        """
+        Prefetch order items together with their menu items, one extra
+        query per page of orders regardless of its size.
+
+        Args:
+            items (QuerySet | None): Optional OrderItem queryset used to
+                restrict which items are attached to each order.
+        """
+        if items is None:
+            items = OrderItem.objects.all()
+        return self.prefetch_related(
+            models.Prefetch("order_items", queryset=items.select_related("menu_item"))
+        )
+
+
 class Order(models.Model):
     ORDERCHOICES = [
         ("PENDING", "Pending"),
@@ -21,11 +38,22 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrderQuerySet.as_manager()
+
     def __str__(self):
         return f"Order {self.id} by {self.customer.email}"
 
     class Meta:
         ordering = ["-order_date"]
+        indexes = [
+            # Serves customer order history, paginated on (order_date, id).
+            models.Index(
+                fields=["customer", "-order_date", "-id"],
+                name="orders_customer_date_idx",
+            ),
+            # Serves restaurant order listings walked by (order_date, id).
+            models.Index(fields=["-order_date", "-id"], name="orders_date_idx"),
+        ]
 
 
 class OrderItem(models.Model):
@@ -3,9 +3,19 @@ from .models import Order, OrderItem
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
+    menu_item_name = serializers.CharField(source="menu_item.name", read_only=True)
+
     class Meta:
         model = OrderItem
-        fields = ["id", "menu_item", "quantity", "price", "created_at", "updated_at"]
+        fields = [
+            "id",
+            "menu_item",
+            "menu_item_name",
+            "quantity",
+            "price",
+            "created_at",
+            "updated_at",
+        ]
         read_only_fields = ["id", "updated_at", "created_at"]
 
 
@@ -15,6 +25,7 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = [
+            "id",
             "order_date",
             "status",
             "total_amount",
@@ -22,4 +33,10 @@ class OrderSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["updated_at", "created_at", "status", "total_amount"]
+        read_only_fields = [
+            "id",
+            "updated_at",
+            "created_at",
+            "status",
+            "total_amount",
+        ]
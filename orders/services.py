@@ -0,0 +1,87 @@
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from analytics.services import record_order
+from cart.models import Cart, CartItem
+from .models import Order, OrderItem
+
+
+class EmptyCartError(Exception):
+    """
+    Raised when an order is placed from a missing or empty cart.
+    """
+
+
+def place_order(customer):
+    """
+    Convert the customer's cart into an Order in a single transaction.
+
+    The cart row is locked with SELECT ... FOR UPDATE, so concurrent
+    checkouts of the same cart are serialized: the first one consumes the
+    items and the others find the cart empty. The pipeline runs a fixed
+    number of queries regardless of cart size:
+
+    1. lock the cart,
+    2. load items joined with their menu prices,
+    3. insert the order,
+    4. bulk-insert the order items,
+    5. add the order to the daily sales rollups (two upserts),
+    6. delete the cart items,
+    7. reset the cart total.
+
+    Args:
+        customer (users.models.User): The customer placing the order.
+
+    Returns:
+        Order: The newly created order.
+
+    Raises:
+        EmptyCartError: If the customer has no cart or it holds no items.
+    """
+    with transaction.atomic():
+        cart = (
+            Cart.objects.select_for_update()
+            .only("id")
+            .filter(customer=customer)
+            .first()
+        )
+        if cart is None:
+            raise EmptyCartError
+
+        items = list(
+            CartItem.objects.filter(cart=cart)
+            .select_related("menu_item")
+            .only("quantity", "menu_item__price", "menu_item__restaurant_id")
+        )
+        if not items:
+            raise EmptyCartError
+
+        lines = [(item.menu_item, item.quantity) for item in items]
+        total = sum(
+            (menu_item.price * quantity for menu_item, quantity in lines),
+            Decimal("0.00"),
+        )
+
+        order = Order.objects.create(
+            customer=customer,
+            status="PENDING",
+            total_amount=total,
+        )
+        OrderItem.objects.bulk_create(
+            [
+                OrderItem(
+                    order=order,
+                    menu_item=menu_item,
+                    quantity=quantity,
+                    price=menu_item.price * quantity,
+                )
+                for menu_item, quantity in lines
+            ]
+        )
+        record_order(order, lines)
+
+        CartItem.objects.filter(cart=cart).delete()
+        Cart.objects.filter(pk=cart.pk).update(total_price=0, updated_at=timezone.now())
+    return order
@@ -1,3 +1,318 @@
-from django.test import TestCase
+import json
+import threading
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
+
+from cart.models import Cart, CartItem
+from config.testing import QueryBudgetTestMixin
+from restaurants.models import Restaurants, Menu
+from users.models import User
+from .models import Order, OrderItem
+from .services import EmptyCartError, place_order
+from .views import OrderCreateView, OrderListView, RestaurantOrderListView
+
+
+class OrderFixturesMixin:
+    def create_menu(self, items):
+        owner = User.objects.create(
+            email="owner@example.com",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        return Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"Dish {i}",
+                    description="Tasty",
+                    price=Decimal("3.00") + i,
+                    restaurant=restaurant,
+                )
+                for i in range(items)
+            ]
+        )
+
+    def create_customers(self, count):
+        return User.objects.bulk_create(
+            [
+                User(
+                    email=f"customer{i}@example.com",
+                    first_name="John",
+                    last_name="Doe",
+                    password="!",
+                )
+                for i in range(count)
+            ]
+        )
+
+    def fill_cart(self, customer, menu, quantity=2):
+        cart = Cart.objects.create(customer=customer)
+        CartItem.objects.bulk_create(
+            [CartItem(cart=cart, menu_item=item, quantity=quantity) for item in menu]
+        )
+        return sum(item.price * quantity for item in menu)
+
+
+class PlaceOrderTests(QueryBudgetTestMixin, OrderFixturesMixin, APITestCase):
+    def test_place_order(self):
+        menu = self.create_menu(items=3)
+        customer = self.create_customers(1)[0]
+        expected = self.fill_cart(customer, menu)
+
+        order = place_order(customer)
+
+        self.assertEqual(order.total_amount, expected)
+        self.assertEqual(order.order_items.count(), 3)
+        self.assertFalse(CartItem.objects.filter(cart__customer=customer).exists())
+
+    def test_empty_cart(self):
+        customer = self.create_customers(1)[0]
+        with self.assertRaises(EmptyCartError):
+            place_order(customer)
+        Cart.objects.create(customer=customer)
+        with self.assertRaises(EmptyCartError):
+            place_order(customer)
+
+    def test_query_count_is_constant(self):
+        menu = self.create_menu(items=40)
+        small, large = self.create_customers(2)
+        self.fill_cart(small, menu[:1])
+        self.fill_cart(large, menu)
+        # Two savepoint statements wrap the eight pipeline queries in tests.
+        with self.assertNumQueries(10):
+            place_order(small)
+        with self.assertNumQueries(10):
+            place_order(large)
+
+    def test_order_create_view_within_budget(self):
+        menu = self.create_menu(items=40)
+        customers = self.create_customers(2)
+        view = OrderCreateView.as_view()
+        for customer, headers in zip(
+            customers, ({}, {"HTTP_IDEMPOTENCY_KEY": "checkout-1"})
+        ):
+            with self.subTest(idempotency_key=bool(headers)):
+                self.fill_cart(customer, menu)
+                request = APIRequestFactory().post("/api/v1/order/create/", **headers)
+                force_authenticate(request, user=customer)
+                with self.assertQueryBudget(OrderCreateView, "POST"):
+                    with self.captureOnCommitCallbacks(execute=True):
+                        response = view(request)
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_order_create_view(self):
+        menu = self.create_menu(items=2)
+        customer = self.create_customers(1)[0]
+        self.fill_cart(customer, menu)
+        self.client.force_authenticate(customer)
+
+        response = self.client.post(reverse("order-create"))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["data"]["order_items"]), 2)
+
+        response = self.client.post(reverse("order-create"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderHistoryTests(OrderFixturesMixin, APITestCase):
+    def setUp(self):
+        self.menu = self.create_menu(items=3)
+        self.restaurant = self.menu[0].restaurant
+        self.customer, self.other = self.create_customers(2)
+
+    def place_orders(self, customer, count, items=2):
+        for _ in range(count):
+            self.fill_cart(customer, self.menu[:items])
+            place_order(customer)
+            Cart.objects.filter(customer=customer).delete()
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(order["id"] for order in response.data["data"])
+            url = response.data["next"]
+        return ids
+
+    def test_customer_sees_only_own_orders_newest_first(self):
+        self.place_orders(self.customer, 7)
+        self.place_orders(self.other, 2)
+        self.client.force_authenticate(self.customer)
+
+        ids = self.walk(reverse("order-list") + "?page_size=3")
+
+        expected = list(
+            Order.objects.filter(customer=self.customer)
+            .order_by("-order_date", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_owner_sees_restaurant_orders(self):
+        self.place_orders(self.customer, 3)
+        self.client.force_authenticate(self.restaurant.owner)
+
+        ids = self.walk(reverse("restaurant-order-list", args=[self.restaurant.pk]))
+
+        self.assertEqual(len(ids), 3)
+
+    def test_owner_sees_only_own_share_of_mixed_orders(self):
+        owner = User.objects.create(
+            email="rival@example.com",
+            first_name="Ama",
+            last_name="Doe",
+            role="owner",
+        )
+        rival = Restaurants.objects.create(
+            name="Rival Bar",
+            owner=owner,
+            description="Food",
+            address="Kumasi",
+            phone_number="0244000001",
+        )
+        dish = Menu.objects.create(
+            name="Kenkey", description="Corn", price=Decimal("50.00"), restaurant=rival
+        )
+        own = self.fill_cart(self.customer, self.menu[:2])
+        CartItem.objects.create(
+            cart=Cart.objects.get(customer=self.customer), menu_item=dish, quantity=1
+        )
+        order = place_order(self.customer)
+        self.client.force_authenticate(self.restaurant.owner)
+
+        response = self.client.get(
+            reverse("restaurant-order-list", args=[self.restaurant.pk])
+        )
+
+        (data,) = response.data["data"]
+        self.assertEqual(order.total_amount, own + dish.price)
+        self.assertEqual(Decimal(data["total_amount"]), own)
+        self.assertEqual(len(data["order_items"]), 2)
+
+    def test_owner_cannot_see_other_restaurants(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(
+            reverse("restaurant-order-list", args=[self.restaurant.pk])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_query_count_is_constant(self):
+        self.place_orders(self.customer, 12, items=3)
+        factory = APIRequestFactory()
+        for view, user, kwargs, queries in (
+            # Each page adds the conditional GET validator query.
+            (OrderListView.as_view(), self.customer, {}, 3),
+            (
+                RestaurantOrderListView.as_view(),
+                self.restaurant.owner,
+                {"pk": self.restaurant.pk},
+                4,
+            ),
+        ):
+            url = "/orders/?page_size=5"
+            for _ in range(3):
+                request = factory.get(url)
+                force_authenticate(request, user=user)
+                with self.assertNumQueries(queries):
+                    response = view(request, **kwargs)
+                self.assertTrue(response.data["data"])
+                url = response.data["next"]
+
+    def test_fast_serializer_matches_order_serializer(self):
+        self.place_orders(self.customer, 4, items=3)
+        factory = APIRequestFactory()
+        for view_class, user, kwargs in (
+            (OrderListView, self.customer, {}),
+            (
+                RestaurantOrderListView,
+                self.restaurant.owner,
+                {"pk": self.restaurant.pk},
+            ),
+        ):
+            pages = []
+            for fast in (True, False):
+                request = factory.get("/orders/?page_size=3")
+                force_authenticate(request, user=user)
+                with mock.patch.object(view_class, "fast_serializer", fast):
+                    response = view_class.as_view()(request, **kwargs)
+                pages.append((response.data["data"], response.data["next"]))
+            # Compared as JSON so the key order has to match too.
+            self.assertEqual(json.dumps(pages[0]), json.dumps(pages[1]))
+            self.assertEqual(len(pages[0][0][0]["order_items"]), 3)
+
+
+class ConcurrentPlaceOrderTests(OrderFixturesMixin, TransactionTestCase):
+    threads = 50
+
+    def run_concurrently(self, customers):
+        barrier = threading.Barrier(len(customers))
+        results = []
+        lock = threading.Lock()
+
+        def checkout(customer):
+            try:
+                barrier.wait()
+                try:
+                    outcome = place_order(customer).pk
+                except EmptyCartError:
+                    outcome = None
+                with lock:
+                    results.append(outcome)
+            finally:
+                connection.close()
+
+        workers = [
+            threading.Thread(target=checkout, args=(customer,))
+            for customer in customers
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def test_same_cart_is_ordered_once(self):
+        menu = self.create_menu(items=5)
+        customer = self.create_customers(1)[0]
+        expected = self.fill_cart(customer, menu)
+
+        results = self.run_concurrently([customer] * self.threads)
+
+        self.assertEqual(len(results), self.threads)
+        placed = [pk for pk in results if pk is not None]
+        self.assertEqual(len(placed), 1)
+        self.assertEqual(Order.objects.count(), 1)
+        order = Order.objects.get()
+        self.assertEqual(order.total_amount, expected)
+        self.assertEqual(order.order_items.count(), 5)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_many_carts_lose_no_items(self):
+        menu = self.create_menu(items=3)
+        customers = self.create_customers(self.threads)
+        expected = {
+            customer.pk: self.fill_cart(customer, menu) for customer in customers
+        }
+
+        results = self.run_concurrently(customers)
+
+        self.assertEqual(len([pk for pk in results if pk is not None]), self.threads)
+        self.assertEqual(Order.objects.count(), self.threads)
+        self.assertEqual(OrderItem.objects.count(), self.threads * 3)
+        for order in Order.objects.all():
+            self.assertEqual(order.total_amount, expected[order.customer_id])
+        self.assertFalse(CartItem.objects.exists())
@@ -1,7 +1,13 @@
 from django.urls import path
-from .views import OrderCreateView
+from .views import OrderCreateView, OrderListView, RestaurantOrderListView
 
 
 urlpatterns = [
+    path("orders/", OrderListView.as_view(), name="order-list"),
     path("order/create/", OrderCreateView.as_view(), name="order-create"),
+    path(
+        "restaurants/<int:pk>/orders/",
+        RestaurantOrderListView.as_view(),
+        name="restaurant-order-list",
+    ),
 ]
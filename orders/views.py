@@ -1,11 +1,18 @@
+from django.db.models import OuterRef, Subquery, Sum
+from django.shortcuts import get_object_or_404
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
+from config.conditional import conditional, queryset_validators
+from config.pagination import KeysetPagination
+from config.serializers import FastSerializerMixin
+from idempotency.decorators import idempotent
+from restaurants.models import Restaurants
 from .models import Order, OrderItem
 from .serializers import OrderSerializer
-from cart.models import Cart
+from .services import EmptyCartError, place_order
 
 
 @extend_schema(tags=["orders"], request=None)
@@ -14,8 +21,9 @@ class OrderCreateView(GenericAPIView):
     Place an order for the authenticated user using their cart contents.
 
     This view converts the user's Cart and CartItems into an Order and
-    related OrderItem records, computes totals, and deletes the cart after
-    successfully placing the order.
+    related OrderItem records through `orders.services.place_order`, which
+    runs the whole checkout in one transaction with the cart row locked and
+    empties the cart after successfully placing the order.
 
     Methods:
         post(request): Create an Order from the authenticated user's Cart.
@@ -23,7 +31,12 @@ class OrderCreateView(GenericAPIView):
 
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    # The checkout pipeline, the order reload and, with an Idempotency-Key,
+    # storing the response. Claiming the key is not counted (see
+    # `idempotency.decorators.idempotent`).
+    query_budget = 11
 
+    @idempotent
     def post(self, request, *args, **kwargs):
         """
         Create an Order from the authenticated user's Cart.
@@ -35,13 +48,16 @@ class OrderCreateView(GenericAPIView):
         Returns:
             rest_framework.response.Response: JSON response containing the
             created order data and HTTP 201 on success, or an error response
-            (HTTP 400) if the cart is empty.
+            (HTTP 400) if the cart is empty. Retries carrying the same
+            `Idempotency-Key` header replay the original response.
 
         Side effects:
-            Reads the Cart, creates Order and OrderItem records, and deletes
-            the Cart after successful order creation.
+            Locks the Cart, creates Order and OrderItem records, and removes
+            the CartItems after successful order creation.
         """
-        if not Cart.objects.filter(user=self.request.user).exists():
+        try:
+            order = place_order(request.user)
+        except EmptyCartError:
             return Response(
                 {
                     "msg": "Cart is empty. Cannot place order.",
@@ -50,36 +66,153 @@ class OrderCreateView(GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        cart = Cart.objects.prefetch_related("items").get(user=request.user)
-        cart.calculate_total_price()
+        order = Order.objects.with_items().get(pk=order.pk)
+        serializer = self.serializer_class(order)
+        return Response(
+            {
+                "msg": "Order placed successfully",
+                "data": serializer.data,
+                "status": True,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class OrderPagination(KeysetPagination):
+    ordering = ("-order_date", "-id")
+
+
+@extend_schema(tags=["orders"])
+class OrderListView(FastSerializerMixin, GenericAPIView):
+    """
+    List the authenticated customer's order history, newest first.
+
+    Orders are cursor-paginated on (order_date, id) using the
+    `orders_customer_date_idx` index. Rows are read with `.values()` and
+    serialized by FastSerializer, which loads the order items and their
+    menu item names in one more query, so every page costs two queries
+    however deep it is.
 
-        order = Order.objects.create(
-            customer=request.user,
-            status="PENDING",
-            total_amount=cart.total_price,
+    Methods:
+        get(request): Return one page of the user's orders.
+    """
+
+    serializer_class = OrderSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = OrderPagination
+    fast_serializer = True
+
+    def get_queryset(self):
+        return Order.objects.filter(customer=self.request.user).with_items()
+
+    def get_validators(self, request):
+        paginator = self.pagination_class()
+        return queryset_validators(
+            paginator.page_queryset(self.get_queryset(), request)
         )
 
-        order_item_to_create = []
+    @conditional
+    def get(self, request):
+        """
+        Retrieve a page of the authenticated user's orders.
 
-        for item in cart.items.all():
-            order_item_to_create.append(
-                OrderItem(
-                    order=order,
-                    menu_item=item.menu_item,
-                    quantity=item.quantity,
-                    price=item.cart_item_price(),
-                )
-            )
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Optional query params: `cursor` and `page_size` (max 100).
+
+        Returns:
+            rest_framework.response.Response: JSON response with the page of
+            orders and the `next` page URL, or null on the last page
+            (HTTP 200).
+        """
+        paginator = self.pagination_class()
+        orders = paginator.paginate_queryset(
+            self.get_serializer_rows(self.get_queryset(), extra=["order_date"]),
+            request,
+            view=self,
+        )
+        return Response(
+            {
+                "msg": "Your orders",
+                "data": self.serialize_rows(orders),
+                "next": paginator.get_next_link(),
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
 
-        OrderItem.objects.bulk_create(order_item_to_create)
 
-        cart.delete()
-        serializer = self.serializer_class(order)
+@extend_schema(tags=["orders"])
+class RestaurantOrderListView(FastSerializerMixin, GenericAPIView):
+    """
+    List orders containing items from a restaurant owned by the requester.
+
+    Only the order items belonging to the restaurant are included in each
+    order, and `total_amount` is the sum of those items' prices rather than
+    the whole order's. Pagination and item loading work as in
+    OrderListView.
+
+    Methods:
+        get(request, pk): Return one page of the restaurant's orders.
+    """
+
+    serializer_class = OrderSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = OrderPagination
+    fast_serializer = True
+    fast_sources = {"total_amount": "restaurant_total"}
+
+    def get_queryset(self):
+        items = OrderItem.objects.filter(menu_item__restaurant_id=self.kwargs["pk"])
+        restaurant_total = (
+            items.filter(order=OuterRef("pk"))
+            .values("order")
+            .annotate(total=Sum("price"))
+            .values("total")
+        )
+        return (
+            Order.objects.filter(pk__in=items.values("order_id"))
+            .annotate(restaurant_total=Subquery(restaurant_total))
+            .with_items(items)
+        )
+
+    def get_validators(self, request, pk):
+        paginator = self.pagination_class()
+        return queryset_validators(
+            paginator.page_queryset(self.get_queryset(), request)
+        )
+
+    @conditional
+    def get(self, request, pk):
+        """
+        Retrieve a page of orders for a restaurant owned by the user.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Optional query params: `cursor` and `page_size` (max 100).
+            pk (int): Path parameter for the restaurant primary key.
+
+        Returns:
+            rest_framework.response.Response: JSON response with the page of
+            orders and the `next` page URL (HTTP 200).
+
+        Raises:
+            Http404 if the restaurant does not exist or is not owned by user.
+        """
+        get_object_or_404(Restaurants.objects.only("id"), pk=pk, owner=request.user)
+        paginator = self.pagination_class()
+        orders = paginator.paginate_queryset(
+            self.get_serializer_rows(self.get_queryset(), extra=["order_date"]),
+            request,
+            view=self,
+        )
+        items = OrderItem.objects.filter(menu_item__restaurant_id=pk)
         return Response(
             {
-                "msg": "Order placed successfully",
-                "data": serializer.data,
+                "msg": "Restaurant orders",
+                "data": self.serialize_rows(orders, children={"order_items": items}),
+                "next": paginator.get_next_link(),
                 "status": True,
             },
-            status=status.HTTP_201_CREATED,
+            status=status.HTTP_200_OK,
         )
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import RequestProfile
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = [
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "query_ms",
+    ]
+    list_filter = ["method", "sampled_by", "status_code"]
+    search_fields = ["path", "view"]
+    ordering = ["-created_at"]
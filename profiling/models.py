@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class RequestProfile(models.Model):
+    """
+    Timing and SQL of one sampled request.
+
+    Written in batches by the background flusher of `profiling.recorder`,
+    never on the request path. Only requests picked by
+    PROFILING["SAMPLE_RATE"] or carrying the profiling header are stored.
+    """
+
+    RATE = "rate"
+    HEADER = "header"
+    SAMPLED_BY_CHOICES = [(RATE, "Sample rate"), (HEADER, "Header")]
+
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2000)
+    view = models.CharField(max_length=255, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_ms = models.FloatField()
+    # [sql, duration in ms] per statement, up to PROFILING["MAX_QUERIES"].
+    queries = models.JSONField(default=list)
+    sampled_by = models.CharField(max_length=10, choices=SAMPLED_BY_CHOICES)
+    created_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.method} {self.path} {self.duration_ms:.1f}ms"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="request_profile_created_idx"),
+        ]
@@ -0,0 +1,263 @@
+"""
+Sampled request profiling.
+
+`ProfilingMiddleware` profiles a fraction of requests (PROFILING
+["SAMPLE_RATE"]) plus those carrying the profiling header. For each
+sampled request it records the wall time and every SQL statement with
+its duration. Requests that are not sampled only pay for one
+`random.random()` call.
+
+Profiles are not written on the request path. They go into a bounded
+in-memory queue that a background thread drains every FLUSH_INTERVAL
+seconds, or as soon as BATCH_SIZE profiles are waiting, with one
+`bulk_create` per batch on the thread's own connection. When the queue is
+full new profiles are dropped and counted in `ProfileBuffer.dropped`, so a
+slow database never backs up into request latency.
+"""
+
+import atexit
+import hmac
+import logging
+import queue
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import timezone
+
+from .models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # None follows DEBUG.
+    "ENABLED": None,
+    "SAMPLE_RATE": 0.01,
+    "HEADER": "X-Profile",
+    "HEADER_TOKEN": "",
+    "MAX_QUERIES": 100,
+    "BUFFER_SIZE": 1000,
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 5.0,
+    "BACKGROUND": True,
+}
+
+
+def profiling_settings():
+    return {**DEFAULTS, **getattr(settings, "PROFILING", {})}
+
+
+def sampled_by(request, config):
+    """
+    Return why `request` should be profiled (a RequestProfile.SAMPLED_BY
+    value), or None.
+
+    The header is honoured when its value matches HEADER_TOKEN, or with
+    any value under DEBUG when no token is set, so clients cannot turn on
+    profiling in production at will.
+    """
+    value = request.headers.get(config["HEADER"])
+    if value:
+        token = config["HEADER_TOKEN"]
+        if hmac.compare_digest(value, token) if token else settings.DEBUG:
+            return RequestProfile.HEADER
+    if random.random() < config["SAMPLE_RATE"]:
+        return RequestProfile.RATE
+    return None
+
+
+class SQLRecorder:
+    """
+    `execute_wrapper` recording each statement and its duration, keeping
+    the text of the first `limit` statements.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.queries) < self.limit:
+                self.queries.append([sql, round(elapsed * 1000, 3)])
+
+
+class ProfileBuffer:
+    """
+    Bounded queue of unsaved RequestProfile rows and the thread that
+    writes them.
+
+    Args:
+        size (int): Profiles kept in memory before new ones are dropped.
+        batch_size (int): Profiles written per `bulk_create`.
+        interval (float): Seconds between flushes of the background thread.
+    """
+
+    def __init__(self, size, batch_size, interval):
+        self.queue = queue.Queue(maxsize=size)
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.registered = False
+
+    def add(self, profile):
+        try:
+            self.queue.put_nowait(profile)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.queue.qsize() >= self.batch_size:
+            self.wakeup.set()
+
+    def drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """
+        Write every buffered profile now.
+
+        Returns:
+            int: The number of profiles written.
+        """
+        written = 0
+        while batch := self.drain(self.batch_size):
+            RequestProfile.objects.bulk_create(batch)
+            written += len(batch)
+        return written
+
+    def start(self):
+        """
+        Start the background flusher, once per process.
+        """
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(
+                target=self.run, name="profiling-flusher", daemon=True
+            )
+            self.thread.start()
+            if not self.registered:
+                atexit.register(self.flush)
+                self.registered = True
+
+    def run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Could not write request profiles")
+            finally:
+                # The thread's own connection; reopened on the next flush.
+                connection.close()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """
+    Return the process-wide ProfileBuffer, created from PROFILING and, with
+    BACKGROUND on, with its flusher running.
+    """
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            config = profiling_settings()
+            _buffer = ProfileBuffer(
+                config["BUFFER_SIZE"], config["BATCH_SIZE"], config["FLUSH_INTERVAL"]
+            )
+            if config["BACKGROUND"]:
+                _buffer.start()
+    return _buffer
+
+
+@contextmanager
+def recording(recorder):
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield
+
+
+class ProfilingMiddleware:
+    """
+    Profile sampled requests into the background buffer.
+
+    Sets `request.profiled`, which `SILKY_INTERCEPT_FUNC` reuses when silk
+    is enabled, so silk records the same sample. Place it first in
+    MIDDLEWARE so the time of every other middleware is included. It is
+    sync only, like QueryBudgetMiddleware, so that under ASGI it records
+    the connection of the thread the request's queries run on.
+    """
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reason = self.sample(request)
+        if reason is None:
+            return self.get_response(request)
+
+        recorder = SQLRecorder(profiling_settings()["MAX_QUERIES"])
+        start = time.perf_counter()
+        with recording(recorder):
+            response = self.get_response(request)
+        self.save(request, response, recorder, reason, start)
+        return response
+
+    def sample(self, request):
+        config = profiling_settings()
+        enabled = config["ENABLED"]
+        if enabled is None:
+            enabled = settings.DEBUG
+        reason = sampled_by(request, config) if enabled else None
+        request.profiled = reason is not None
+        return reason
+
+    def save(self, request, response, recorder, reason, start):
+        duration = time.perf_counter() - start
+        get_buffer().add(
+            RequestProfile(
+                method=request.method,
+                path=request.get_full_path()[:2000],
+                view=getattr(request, "profiled_view", ""),
+                status_code=response.status_code,
+                duration_ms=duration * 1000,
+                query_count=recorder.count,
+                query_ms=recorder.duration * 1000,
+                queries=recorder.queries,
+                sampled_by=reason,
+                created_at=timezone.now(),
+            )
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.profiled:
+            view = getattr(view_func, "view_class", view_func)
+            request.profiled_view = f"{view.__module__}.{view.__qualname__}"
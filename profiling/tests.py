@@ -0,0 +1,122 @@
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from restaurants.models import Restaurants
+from users.models import User
+from . import recorder
+from .models import RequestProfile
+from .recorder import ProfileBuffer
+
+PROFILING = {
+    "ENABLED": True,
+    "SAMPLE_RATE": 0,
+    "HEADER_TOKEN": "secret",
+    "BACKGROUND": False,
+}
+
+
+def profile(path="/"):
+    return RequestProfile(
+        method="GET",
+        path=path,
+        status_code=200,
+        duration_ms=1.0,
+        query_count=0,
+        query_ms=0.0,
+        sampled_by=RequestProfile.RATE,
+        created_at=timezone.now(),
+    )
+
+
+@override_settings(PROFILING=PROFILING)
+class ProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.buffer = ProfileBuffer(size=10, batch_size=5, interval=1)
+        patcher = mock.patch.object(recorder, "_buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        owner = User.objects.create(
+            email="owner@example.com",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        Restaurants.objects.create(
+            name="Chop Bar",
+            owner=owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        self.url = reverse("restaurant-catalogue")
+
+    def test_header_with_token_is_profiled(self):
+        self.client.get(self.url, HTTP_X_PROFILE="secret")
+        self.assertFalse(RequestProfile.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 1)
+        saved = RequestProfile.objects.get()
+        self.assertEqual(saved.sampled_by, RequestProfile.HEADER)
+        self.assertEqual(saved.view, "restaurants.views.RestaurantCatalogueView")
+        self.assertEqual(saved.status_code, 200)
+        self.assertEqual(saved.query_count, len(saved.queries))
+        self.assertIn("restaurants_restaurants", saved.queries[-1][0])
+
+    def test_asgi_requests_record_their_queries(self):
+        async_to_sync(self.async_client.get)(self.url, headers={"X-Profile": "secret"})
+        self.assertEqual(self.buffer.flush(), 1)
+        saved = RequestProfile.objects.get()
+        self.assertGreater(saved.query_count, 0)
+        self.assertIn("restaurants_restaurants", saved.queries[-1][0])
+
+    def test_wrong_token_is_ignored(self):
+        self.client.get(self.url, HTTP_X_PROFILE="guess")
+        self.assertEqual(self.buffer.flush(), 0)
+
+    def test_sample_rate(self):
+        with override_settings(PROFILING={**PROFILING, "SAMPLE_RATE": 1}):
+            self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(RequestProfile.objects.get().sampled_by, RequestProfile.RATE)
+
+    @override_settings(PROFILING={"SAMPLE_RATE": 1}, DEBUG=False)
+    def test_off_by_default_outside_debug(self):
+        self.client.get(self.url)
+        self.assertEqual(self.buffer.flush(), 0)
+
+
+class ProfileBufferTests(TransactionTestCase):
+    def test_full_buffer_drops_new_profiles(self):
+        buffer = ProfileBuffer(size=3, batch_size=2, interval=1)
+        for i in range(5):
+            buffer.add(profile(f"/{i}"))
+        self.assertEqual(buffer.dropped, 2)
+        self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(
+            sorted(RequestProfile.objects.values_list("path", flat=True)),
+            ["/0", "/1", "/2"],
+        )
+
+    def test_background_thread_flushes_in_batches(self):
+        buffer = ProfileBuffer(size=100, batch_size=10, interval=60)
+        buffer.start()
+        with mock.patch.object(
+            RequestProfile.objects,
+            "bulk_create",
+            wraps=RequestProfile.objects.bulk_create,
+        ) as bulk_create:
+            for i in range(10):
+                buffer.add(profile(f"/{i}"))
+            # A full batch wakes the thread well before the interval.
+            deadline = time.monotonic() + 5
+            while RequestProfile.objects.count() < 10 and time.monotonic() < deadline:
+                time.sleep(0.02)
+        self.assertEqual(RequestProfile.objects.count(), 10)
+        bulk_create.assert_called_once()
@@ -0,0 +1,21 @@
+from django.conf import settings
+
+from config.cache import (  # noqa: F401
+    DjangoCacheBackend,
+    LocMemLRUBackend,
+    VersionedCache,
+    build_backend,
+)
+
+
+class MenuCache(VersionedCache):
+    """
+    Versioned read cache for a restaurant's serialized menu, keyed by
+    restaurant id. See VersionedCache.
+    """
+
+    def __init__(self, backend):
+        super().__init__(backend, prefix="menu")
+
+
+menu_cache = MenuCache(build_backend(getattr(settings, "MENU_CACHE", {})))
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurants import menu_io
+from restaurants.models import Restaurants
+
+
+class Command(BaseCommand):
+    help = (
+        "Import a restaurant's menu from a CSV or JSON file, upserting on "
+        "dish name, or export it as CSV."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["import", "export"])
+        parser.add_argument("restaurant", type=int, help="Restaurant id.")
+        parser.add_argument(
+            "path",
+            nargs="?",
+            help="File to import. Export writes to stdout.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "json"],
+            help="Import file format. Defaults to the file extension.",
+        )
+
+    def handle(self, *args, **options):
+        restaurant_id = options["restaurant"]
+        if not Restaurants.objects.filter(pk=restaurant_id).exists():
+            raise CommandError(f"Restaurant {restaurant_id} does not exist")
+
+        if options["action"] == "export":
+            for line in menu_io.export_csv(restaurant_id):
+                self.stdout.write(line, ending="")
+            return
+
+        if not options["path"]:
+            raise CommandError("import needs a file path")
+        start = time.perf_counter()
+        try:
+            items = menu_io.read_items(options["path"], options["format"])
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise CommandError(f"Cannot read {options['path']}: {exc!r}")
+        serializer = menu_io.validate_items(items)
+        if not serializer.is_valid():
+            errors = serializer.errors
+            if isinstance(errors, dict):
+                raise CommandError(errors)
+            for number, error in enumerate(errors, start=1):
+                if error:
+                    self.stderr.write(f"item {number}: {error}")
+            raise CommandError("Nothing imported; fix the items above")
+
+        created, updated = menu_io.upsert_menu(restaurant_id, serializer.validated_data)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created + updated} items ({created} created, "
+                f"{updated} updated) in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,111 @@
+"""
+Bulk import and export of a restaurant's menu.
+
+An import is validated as a whole with `MenuImportSerializer(many=True)`
+and written with one `bulk_create(update_conflicts=True)` upsert on
+(restaurant, name): new dishes are inserted, existing ones get the
+imported description, price and availability. An export streams the menu
+as CSV in the same columns, so it can be edited and imported again.
+"""
+
+import csv
+import json
+
+from django.db import transaction
+
+from .models import Menu
+from .serializers import MenuImportSerializer
+from .signals import menu_bulk_changed
+
+FIELDS = ["name", "description", "price", "is_available"]
+UPDATE_FIELDS = ["description", "price", "is_available", "updated_at"]
+BATCH_SIZE = 1000
+
+
+def read_items(path, format=None):
+    """
+    Load menu items from a CSV (with a header row) or JSON file.
+
+    The format defaults to the file extension. A JSON file holds a list of
+    items, or an object with an `items` list. Empty CSV cells are left
+    out, as the CSV request parser does.
+    """
+    format = format or ("json" if str(path).endswith(".json") else "csv")
+    with open(path, newline="", encoding="utf-8") as handle:
+        if format == "csv":
+            return [
+                {key: value for key, value in row.items() if key and value}
+                for row in csv.DictReader(handle)
+            ]
+        data = json.load(handle)
+    return data["items"] if isinstance(data, dict) else data
+
+
+def validate_items(items, max_length=None):
+    """
+    Validate a batch of menu items.
+
+    Returns:
+        MenuImportSerializer: The bound list serializer; check `is_valid()`.
+    """
+    return MenuImportSerializer(data=items, many=True, max_length=max_length)
+
+
+def upsert_menu(restaurant_id, items):
+    """
+    Insert or update validated menu items of a restaurant.
+
+    Args:
+        restaurant_id (int): The restaurant the items belong to.
+        items (list[dict]): `validated_data` of `validate_items`.
+
+    Returns:
+        tuple[int, int]: (created, updated) counts.
+
+    Side effects:
+        Sends `menu_bulk_changed`, since `bulk_create` does not send the
+        per-row signals that invalidate the menu cache and snapshot.
+    """
+    with transaction.atomic():
+        existing = set(
+            Menu.objects.filter(restaurant_id=restaurant_id).values_list(
+                "name", flat=True
+            )
+        )
+        Menu.objects.bulk_create(
+            [Menu(restaurant_id=restaurant_id, **item) for item in items],
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["restaurant", "name"],
+            update_fields=UPDATE_FIELDS,
+        )
+        menu_bulk_changed.send(sender=Menu, restaurant_id=restaurant_id)
+    updated = sum(item["name"] in existing for item in items)
+    return len(items) - updated, updated
+
+
+class Echo:
+    # csv.writer writes to a file; hand each line back instead.
+    def write(self, value):
+        return value
+
+
+def export_csv(restaurant_id):
+    """
+    Yield a restaurant's menu as CSV lines, header first, in id order.
+
+    Rows are read with a server-side cursor where the database has one,
+    so memory stays flat however long the menu is.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(FIELDS)
+    rows = (
+        Menu.objects.filter(restaurant_id=restaurant_id)
+        .order_by("id")
+        .values_list(*FIELDS)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for name, description, price, is_available in rows:
+        yield writer.writerow(
+            [name, description, price, "true" if is_available else "false"]
+        )
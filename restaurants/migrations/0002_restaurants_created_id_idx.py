@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-17 05:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurants', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restaurants',
+            index=models.Index(fields=['created_at', 'id'], name='restaurants_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 6.0 on 2026-10-17 06:20
+
+from django.db import migrations
+
+# (table, indexed columns) for each searchable model.
+INDEXES = [
+    ("restaurants_menu", ("name", "description")),
+    ("restaurants_restaurants", ("name", "address")),
+]
+
+
+def sqlite_fts(table, columns, fts):
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', "
+        f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', "
+        f"prefix='2 3 4 5 6')",
+        f"CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+        f"VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def sqlite_forwards(table, columns):
+    # One index over every column, and one over the primary column alone.
+    return sqlite_fts(table, columns, f"{table}_fts") + sqlite_fts(
+        table, columns[:1], f"{table}_{columns[0]}_fts"
+    )
+
+
+def sqlite_backwards(table, columns):
+    statements = []
+    for fts in (f"{table}_fts", f"{table}_{columns[0]}_fts"):
+        statements += [
+            f"DROP TRIGGER IF EXISTS {fts}_insert",
+            f"DROP TRIGGER IF EXISTS {fts}_delete",
+            f"DROP TRIGGER IF EXISTS {fts}_update",
+            f"DROP TABLE IF EXISTS {fts}",
+        ]
+    return statements
+
+
+def postgresql_forwards(table, columns):
+    vector = " || ".join(
+        f"setweight(to_tsvector('simple', coalesce({column}, '')), '{label}')"
+        for column, label in zip(columns, "ABCD")
+    )
+    primary = f"to_tsvector('simple', coalesce({columns[0]}, ''))"
+    return [
+        f"CREATE INDEX {table}_search_idx ON {table} USING GIN (({vector}))",
+        f"CREATE INDEX {table}_{columns[0]}_search_idx ON {table} "
+        f"USING GIN (({primary}))",
+    ]
+
+
+def postgresql_backwards(table, columns):
+    return [
+        f"DROP INDEX IF EXISTS {table}_search_idx",
+        f"DROP INDEX IF EXISTS {table}_{columns[0]}_search_idx",
+    ]
+
+
+STATEMENTS = {
+    "sqlite": (sqlite_forwards, sqlite_backwards),
+    "postgresql": (postgresql_forwards, postgresql_backwards),
+}
+
+
+def run(direction):
+    def operation(apps, schema_editor):
+        builders = STATEMENTS.get(schema_editor.connection.vendor)
+        if builders is None:
+            return
+        for table, columns in INDEXES:
+            for sql in builders[direction](table, columns):
+                schema_editor.execute(sql)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0002_restaurants_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(run(0), run(1)),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0 on 2026-10-17 06:51
+
+from django.db import migrations, models
+from django.db.models import Count
+
+CONSTRAINT = models.UniqueConstraint(
+    fields=("restaurant", "name"), name="menu_restaurant_name_uniq"
+)
+
+
+def rename_duplicate_dishes(apps, schema_editor):
+    # Keep the oldest item of each (restaurant, name) pair and suffix the
+    # others with their id, so the unique constraint can be added.
+    Menu = apps.get_model("restaurants", "Menu")
+    duplicates = (
+        Menu.objects.values("restaurant", "name")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for group in duplicates:
+        items = Menu.objects.filter(
+            restaurant=group["restaurant"], name=group["name"]
+        ).order_by("id")
+        for item in items[1:]:
+            item.name = f"{item.name[:240]} ({item.pk})"
+            item.save(update_fields=["name"])
+
+
+def add_constraint(apps, schema_editor):
+    # SQLite adds constraints by copying the table, which would drop the
+    # full-text search triggers of 0003_search_index. A unique index is
+    # equivalent there, and serves ON CONFLICT the same way.
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE UNIQUE INDEX menu_restaurant_name_uniq "
+            "ON restaurants_menu (restaurant_id, name)"
+        )
+    else:
+        schema_editor.add_constraint(apps.get_model("restaurants", "Menu"), CONSTRAINT)
+
+
+def remove_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute("DROP INDEX IF EXISTS menu_restaurant_name_uniq")
+    else:
+        schema_editor.remove_constraint(
+            apps.get_model("restaurants", "Menu"), CONSTRAINT
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0003_search_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_dishes, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_constraint, remove_constraint),
+            ],
+            state_operations=[
+                migrations.AddConstraint(model_name="menu", constraint=CONSTRAINT),
+            ],
+        ),
+    ]
@@ -16,6 +16,15 @@ class Restaurants(models.Model):
     def __str__(self):
         return f"{self.owner.get_full_name()} - {self.name}"
 
+    class Meta:
+        indexes = [
+            # Backs keyset pagination of the public catalogue on
+            # (created_at, id), so deep pages cost the same as page 1.
+            models.Index(
+                fields=["created_at", "id"], name="restaurants_created_id_idx"
+            ),
+        ]
+
 
 class Menu(models.Model):
     name = models.CharField(max_length=255)
@@ -28,3 +37,12 @@ class Menu(models.Model):
 
     def __str__(self):
         return f"{self.name} belongs to this {self.restaurant.name}"
+
+    class Meta:
+        constraints = [
+            # Dish names identify menu items within a restaurant; bulk
+            # imports upsert on this pair.
+            models.UniqueConstraint(
+                fields=["restaurant", "name"], name="menu_restaurant_name_uniq"
+            ),
+        ]
@@ -0,0 +1,286 @@
+"""
+Full-text search over menu items and restaurants.
+
+The index lives in the database and is kept current by the database
+itself, so every write path (`save()`, `bulk_create()`, `update()`, raw SQL)
+is covered:
+
+- SQLite: external-content FTS5 tables, filled by AFTER
+  INSERT/UPDATE/DELETE triggers on the model table, with prefix indexes
+  for 2 to 6 characters.
+- PostgreSQL: GIN indexes on `tsvector` expressions, which the planner
+  uses whenever a query repeats the same expression.
+
+Both are created by migration `restaurants.0003_search_index`. Other
+databases fall back to an unindexed `LIKE` scan.
+
+Every term but the last must match a whole word; the last one is matched
+as a prefix, which is what a user typing into a search box expects.
+"""
+
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+
+MAX_TERMS = 8
+
+# Queries with at most this many matches are ordered by relevance score
+# (bm25 / ts_rank). Scoring needs every match, so broader queries are
+# ordered by tier instead: all terms in the primary column first, then
+# the rest, each tier by id. Both orders are streamed from the index.
+RANK_LIMIT = 500
+
+# How a result set is ordered; positions of one mode mean nothing in
+# another, so cursors carry it.
+SCORE = "score"
+TIER = "tier"
+SCAN = "scan"
+
+
+def tokenize(query):
+    """
+    Split a user query into lower-cased word terms.
+
+    Everything but letters, digits and underscores is dropped, so the
+    terms can be embedded in FTS5 and tsquery expressions without escaping.
+    """
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+class SQLiteBackend:
+    """
+    Queries against the FTS5 tables of a SearchIndex.
+    """
+
+    def query(self, terms):
+        words = [f'"{term}"' for term in terms]
+        words[-1] += "*"
+        return " ".join(words)
+
+    def source(self, fts, index, match):
+        return (
+            f"FROM {fts} JOIN {index.table} t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH %s",
+            [match],
+            f"{fts}.rowid",
+        )
+
+    def everywhere(self, index, terms):
+        return self.source(index.fts_table, index, self.query(terms))
+
+    def primary(self, index, terms):
+        return self.source(index.primary_fts_table, index, self.query(terms))
+
+    def secondary(self, index, terms):
+        query = self.query(terms)
+        return self.source(
+            index.fts_table,
+            index,
+            f"({query}) NOT {{{index.columns[0]}}} : ({query})",
+        )
+
+    def score(self, index, terms):
+        weights = ", ".join(str(weight) for weight in index.weights)
+        return f"bm25({index.fts_table}, {weights})", []
+
+
+class PostgreSQLBackend:
+    """
+    Queries against the GIN-indexed tsvector expressions of a SearchIndex.
+    """
+
+    def query(self, terms):
+        return " & ".join(terms) + ":*"
+
+    def everywhere(self, index, terms):
+        return (
+            f"FROM {index.table} t "
+            f"WHERE {index.vector} @@ to_tsquery('simple', %s)",
+            [self.query(terms)],
+            "t.id",
+        )
+
+    def primary(self, index, terms):
+        return (
+            f"FROM {index.table} t "
+            f"WHERE {index.primary_vector} @@ to_tsquery('simple', %s)",
+            [self.query(terms)],
+            "t.id",
+        )
+
+    def secondary(self, index, terms):
+        sql, params, id_column = self.everywhere(index, terms)
+        return (
+            f"{sql} AND NOT {index.primary_vector} @@ to_tsquery('simple', %s)",
+            params * 2,
+            id_column,
+        )
+
+    def score(self, index, terms):
+        return (
+            f"-ts_rank({index.vector}, to_tsquery('simple', %s))",
+            [self.query(terms)],
+        )
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend(),
+    "postgresql": PostgreSQLBackend(),
+}
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    Describe the full-text indexes of one model table.
+
+    Each table has an index over all its text columns and a second, much
+    smaller one over the primary column alone, which lets the primary tier
+    of a broad query be read without filtering the full index.
+
+    Attributes:
+        table (str): The model's database table.
+        columns (tuple[str]): Indexed text columns, primary one first.
+        weights (tuple[float]): Relevance weight of each column (SQLite).
+    """
+
+    table: str
+    columns: tuple
+    weights: tuple
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+    @property
+    def primary_fts_table(self):
+        return f"{self.table}_{self.columns[0]}_fts"
+
+    @property
+    def vector(self):
+        """
+        The PostgreSQL tsvector expression; must match the GIN index.
+        """
+        return " || ".join(
+            f"setweight(to_tsvector('simple', coalesce(t.{column}, '')), '{label}')"
+            for column, label in zip(self.columns, "ABCD")
+        )
+
+    @property
+    def primary_vector(self):
+        return f"to_tsvector('simple', coalesce(t.{self.columns[0]}, ''))"
+
+    def search(self, terms, filters=None, after=None, limit=20):
+        """
+        Return the matches for `terms`, best first.
+
+        The ordering mode is chosen from the number of matches (see
+        RANK_LIMIT) on every call. When `after` was taken in another mode,
+        because matches were added or removed in between, no rows are
+        returned and the caller should start over.
+
+        Args:
+            terms (list[str]): Terms from `tokenize`; every one must match.
+            filters (dict | None): Extra equality filters on the model
+                table, as column name to value.
+            after (tuple[str, float, int] | None): (mode, score, id) of the
+                last row of the previous page.
+            limit (int): Maximum number of rows to return.
+
+        Returns:
+            tuple[str, list[tuple[int, float]]]: The mode (SCORE, TIER or
+            SCAN) and the (id, score) pairs ordered by score then id. Lower
+            scores are better.
+        """
+        if not terms:
+            return SCORE, []
+        backend = BACKENDS.get(connection.vendor)
+        if backend is None:
+            if after is not None and after[0] != SCAN:
+                return SCAN, []
+            return SCAN, self._scan(terms, filters, after, limit)
+
+        where, filter_params = self._filters(filters)
+        source, params, id_column = backend.everywhere(self, terms)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 {source}{where} LIMIT %s) probe",
+                [*params, *filter_params, RANK_LIMIT + 1],
+            )
+            mode = SCORE if cursor.fetchone()[0] <= RANK_LIMIT else TIER
+            if after is not None:
+                if after[0] != mode:
+                    return mode, []
+                after = after[1:]
+
+            if mode == SCORE:
+                score, score_params = backend.score(self, terms)
+                sql = (
+                    f"SELECT id, score FROM (SELECT {id_column} AS id, "
+                    f"{score} AS score {source}{where}) matches"
+                )
+                params = [*score_params, *params, *filter_params]
+                if after is not None:
+                    sql += " WHERE score > %s OR (score = %s AND id > %s)"
+                    params += [after[0], after[0], after[1]]
+                cursor.execute(sql + " ORDER BY score, id LIMIT %s", [*params, limit])
+                return mode, [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+            rows = []
+            for tier, build in enumerate((backend.primary, backend.secondary)):
+                if after is not None and after[0] > tier:
+                    continue
+                source, params, id_column = build(self, terms)
+                sql = f"SELECT {id_column} {source}{where}"
+                params = [*params, *filter_params]
+                if after is not None and after[0] == tier:
+                    sql += f" AND {id_column} > %s"
+                    params.append(after[1])
+                cursor.execute(
+                    sql + f" ORDER BY {id_column} LIMIT %s",
+                    [*params, limit - len(rows)],
+                )
+                rows += [(row[0], float(tier)) for row in cursor.fetchall()]
+                if len(rows) >= limit:
+                    break
+            return mode, rows
+
+    def _filters(self, filters):
+        where, params = "", []
+        for column, value in (filters or {}).items():
+            where += f" AND t.{column} = %s"
+            params.append(value)
+        return where, params
+
+    def _scan(self, terms, filters, after, limit):
+        sql, params = f"SELECT t.id FROM {self.table} t WHERE 1 = 1", []
+        for term in terms:
+            sql += (
+                " AND ("
+                + " OR ".join(f"LOWER(t.{column}) LIKE %s" for column in self.columns)
+                + ")"
+            )
+            params += [f"%{term}%"] * len(self.columns)
+        where, filter_params = self._filters(filters)
+        sql += where
+        params += filter_params
+        if after is not None:
+            sql += " AND t.id > %s"
+            params.append(after[2])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql + " ORDER BY t.id LIMIT %s", [*params, limit])
+            return [(row[0], 0.0) for row in cursor.fetchall()]
+
+
+menu_index = SearchIndex(
+    table="restaurants_menu",
+    columns=("name", "description"),
+    weights=(10.0, 1.0),
+)
+restaurant_index = SearchIndex(
+    table="restaurants_restaurants",
+    columns=("name", "address"),
+    weights=(10.0, 1.0),
+)
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from . import search
 from .models import Restaurants, Menu
 
 
@@ -16,6 +17,31 @@ class MenuSerializers(serializers.ModelSerializer):
         read_only_fields = ["created_at", "updated_at"]
 
 
+class MenuBulkListSerializer(serializers.ListSerializer):
+    """
+    Validate a whole menu import at once. Names must be unique within the
+    batch, since each one is upserted on (restaurant, name).
+    """
+
+    def validate(self, attrs):
+        seen = set()
+        errors = []
+        for item in attrs:
+            if item["name"] in seen:
+                errors.append({"name": [f"Duplicate name {item['name']!r}"]})
+            else:
+                errors.append({})
+            seen.add(item["name"])
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+
+class MenuImportSerializer(MenuSerializers):
+    class Meta(MenuSerializers.Meta):
+        list_serializer_class = MenuBulkListSerializer
+
+
 class RestaurantsSerializers(serializers.ModelSerializer):
     menu = MenuSerializers(many=True, read_only=True)
 
@@ -31,3 +57,48 @@ class RestaurantsSerializers(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["created_at", "updated_at"]
+
+
+class RestaurantCatalogueSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Restaurants
+        fields = [
+            "id",
+            "name",
+            "description",
+            "address",
+            "phone_number",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """
+    Validate the query params of the search endpoints.
+    """
+
+    q = serializers.CharField(max_length=200)
+    available = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate_q(self, value):
+        if not search.tokenize(value):
+            raise serializers.ValidationError("Enter at least one word to search for")
+        return value
+
+
+class MenuSearchSerializer(serializers.ModelSerializer):
+    restaurant_name = serializers.CharField(source="restaurant.name", read_only=True)
+
+    class Meta:
+        model = Menu
+        fields = [
+            "id",
+            "name",
+            "description",
+            "price",
+            "is_available",
+            "restaurant",
+            "restaurant_name",
+        ]
+        read_only_fields = fields
@@ -0,0 +1,31 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .cache import menu_cache
+from .models import Menu, Restaurants
+
+# Sent with `restaurant_id` when a restaurant's menu was written in bulk
+# (`restaurants.menu_io.upsert_menu`), which sends no per-row signals.
+menu_bulk_changed = Signal()
+
+
+@receiver(post_save, sender=Menu)
+@receiver(post_delete, sender=Menu)
+def invalidate_menu_cache(sender, instance, **kwargs):
+    # Bump after commit so a concurrent reader cannot cache the pre-commit
+    # rows under the new version.
+    transaction.on_commit(partial(menu_cache.bump, instance.restaurant_id))
+
+
+@receiver(post_save, sender=Restaurants)
+@receiver(post_delete, sender=Restaurants)
+def invalidate_restaurant_menu_cache(sender, instance, **kwargs):
+    transaction.on_commit(partial(menu_cache.bump, instance.pk))
+
+
+@receiver(menu_bulk_changed)
+def invalidate_imported_menu_cache(sender, restaurant_id, **kwargs):
+    transaction.on_commit(partial(menu_cache.bump, restaurant_id))
@@ -1,3 +1,907 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import tempfile
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APIRequestFactory, force_authenticate
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.pagination import RankedPagination
+from config.parsers import FastJSONParser
+from config.querybudget import QueryBudgetExceeded, track_queries
+from config.testing import QueryBudgetTestMixin
+from config.renderers import FastJSONRenderer
+from users.cache import user_cache
+from users.models import User
+from . import menu_io, search
+from .cache import LocMemLRUBackend, MenuCache, build_backend, menu_cache
+from .models import Restaurants, Menu
+from .views import (
+    AsyncMenuListView,
+    AsyncRestaurantDetailView,
+    MenuCreateView,
+    MenuSearchView,
+    RestaurantCatalogueView,
+    RestaurantListCreateView,
+)
+
+
+class RestaurantCatalogueTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("restaurant-catalogue")
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        Restaurants.objects.bulk_create(
+            [
+                Restaurants(
+                    name=f"Restaurant {i}",
+                    owner=self.owner,
+                    description="Food",
+                    address="Accra",
+                    phone_number="0244000000",
+                )
+                for i in range(25)
+            ]
+        )
+
+    def test_catalogue_is_public_and_paginated(self):
+        response = self.client.get(self.url, {"page_size": 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 10)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_catalogue_walks_every_restaurant_once(self):
+        seen = []
+        url = self.url + "?page_size=10"
+        while url:
+            response = self.client.get(url)
+            seen.extend(row["id"] for row in response.data["data"])
+            url = response.data["next"]
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        # Bulk-created rows share created_at, so id must break the tie.
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_catalogue_page_query_count(self):
+        factory = APIRequestFactory()
+        view = RestaurantCatalogueView.as_view()
+        first = view(factory.get(self.url, {"page_size": 5}))
+        request = factory.get(first.data["next"])
+        # The conditional GET validator, then the page itself.
+        with self.assertNumQueries(2):
+            response = view(request)
+        self.assertEqual(len(response.data["data"]), 5)
+
+        request = factory.get(first.data["next"], HTTP_IF_NONE_MATCH=response["ETag"])
+        with self.assertNumQueries(1):
+            response = view(request)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_owner_list_only_returns_own_restaurants(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="check@123",
+            first_name="John",
+            last_name="Doe",
+            role="owner",
+        )
+        Restaurants.objects.create(
+            name="Mine",
+            owner=other,
+            description="Food",
+            address="Kumasi",
+            phone_number="0244000001",
+        )
+        self.client.force_authenticate(other)
+        response = self.client.get(reverse("restaurant-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r["name"] for r in response.data["data"]], ["Mine"])
+
+
+class RestaurantQueryBudgetTests(QueryBudgetTestMixin, APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.view = RestaurantListCreateView.as_view()
+        self.factory = APIRequestFactory()
+
+    def call(self, request):
+        force_authenticate(request, user=self.owner)
+        with self.assertQueryBudget(RestaurantListCreateView, request.method):
+            # Count what runs after commit (the menu snapshot) as well.
+            with self.captureOnCommitCallbacks(execute=True):
+                return self.view(request)
+
+    def test_post_within_budget(self):
+        response = self.call(
+            self.factory.post(
+                "/api/v1/restaurants/",
+                {
+                    "name": "Chop Bar",
+                    "description": "Food",
+                    "address": "Accra",
+                    "phone_number": "0244000000",
+                },
+                format="json",
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_get_within_budget(self):
+        restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=self.owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"Dish {i}",
+                    description="Rice",
+                    price="5.00",
+                    restaurant=restaurant,
+                )
+                for i in range(30)
+            ]
+        )
+        response = self.call(self.factory.get("/api/v1/restaurants/"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_with_a_cold_auth_cache_within_budget(self):
+        Restaurants.objects.create(
+            name="Chop Bar",
+            owner=self.owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        user_cache.clear()
+        token = RefreshToken.for_user(self.owner).access_token
+        with self.assertQueryBudget(RestaurantListCreateView, "GET"):
+            response = self.client.get(
+                reverse("restaurant-list"), HTTP_AUTHORIZATION=f"Bearer {token}"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QueryBudgetMiddlewareTests(APITestCase):
+    def setUp(self):
+        owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        self.client.force_authenticate(owner)
+        self.url = reverse("restaurant-list")
+
+    def test_server_timing_header(self):
+        response = self.client.get(self.url)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="3 queries", total;dur=[\d.]+$',
+        )
+
+    @override_settings(
+        QUERY_BUDGET={
+            "ACTION": "raise",
+            "VIEWS": {"restaurants.views.RestaurantListCreateView": 1},
+        }
+    )
+    def test_over_budget_raises(self):
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "GET RestaurantListCreateView: 3 queries, budget is 1"
+        ):
+            self.client.get(self.url)
+
+    @override_settings(QUERY_BUDGET={"ACTION": "log", "DEFAULT": 0})
+    def test_over_default_budget_logs(self):
+        with self.assertLogs("config.querybudget", "WARNING") as logs:
+            response = self.client.get(reverse("restaurant-catalogue"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("RestaurantCatalogueView", logs.output[0])
+
+    def test_repeated_shapes_are_reported(self):
+        Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"Dish {i}",
+                    description="Rice",
+                    price=i,
+                    restaurant=self.restaurant,
+                )
+                for i in range(5)
+            ]
+        )
+        ids = list(Menu.objects.values_list("id", flat=True))
+        with track_queries() as stats:
+            for pk in ids:
+                Menu.objects.get(pk=pk)
+            Menu.objects.filter(pk__in=ids[:2]).count()
+            Menu.objects.filter(pk__in=ids).count()
+        self.assertEqual(stats.count, 7)
+        self.assertEqual([count for _, count in stats.repeated(2)], [5, 2])
+        self.assertEqual(stats.problems(threshold=5)[0][:20], "possible N+1, 5 x SE")
+
+    def test_bulk_create_batches_are_one_shape(self):
+        with track_queries() as stats:
+            Menu.objects.bulk_create(
+                [
+                    Menu(
+                        name=f"Dish {i}",
+                        description="Rice",
+                        price=i,
+                        restaurant=self.restaurant,
+                    )
+                    for i in range(12)
+                ],
+                batch_size=2,
+            )
+        self.assertEqual(stats.count, 6)
+        self.assertEqual(stats.repeated(2), [])
+
+    @override_settings(
+        QUERY_BUDGET={
+            "ACTION": "log",
+            "VIEWS": {"restaurants.views.RestaurantListCreateView": 1},
+        }
+    )
+    def test_view_can_opt_into_raise(self):
+        with mock.patch.object(
+            RestaurantListCreateView, "query_budget_action", "raise", create=True
+        ):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(self.url)
+
+
+class MenuCacheTests(APITestCase):
+    def setUp(self):
+        menu_cache.clear()
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=self.owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu = Menu.objects.create(
+                name="Jollof",
+                description="Rice",
+                price="20.00",
+                restaurant=self.restaurant,
+            )
+        self.url = reverse("menu-create", args=[self.restaurant.pk])
+        self.client.force_authenticate(self.owner)
+
+    def test_second_read_is_a_hit(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data["data"], second.data["data"])
+        self.assertEqual(menu_cache.stats()["hits"], 1)
+        self.assertEqual(menu_cache.stats()["misses"], 1)
+
+    def test_menu_save_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.price = "25.00"
+            self.menu.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["data"][0]["price"], "25.00")
+
+    def test_menu_delete_invalidates(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["data"], [])
+
+    def test_unchanged_menu_is_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["X-Conditional"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu.price = "25.00"
+            self.menu.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Conditional"], "MISS")
+
+    def test_cached_reads_run_no_query(self):
+        view = MenuCreateView.as_view()
+        factory = APIRequestFactory()
+        request = factory.get(self.url)
+        force_authenticate(request, self.owner)
+        etag = view(request, restaurant_pk=self.restaurant.pk)["ETag"]
+
+        for headers in ({}, {"HTTP_IF_NONE_MATCH": etag}):
+            request = factory.get(self.url, **headers)
+            force_authenticate(request, self.owner)
+            with self.assertNumQueries(0):
+                view(request, restaurant_pk=self.restaurant.pk)
+
+    def test_unknown_restaurant(self):
+        response = self.client.get(reverse("menu-create", args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fast_serializer_matches_model_serializer(self):
+        Menu.objects.create(
+            name="Waakye",
+            description="Rice and beans",
+            price="12.5",
+            is_available=False,
+            restaurant=self.restaurant,
+        )
+        for view_class, url in (
+            (MenuCreateView, self.url),
+            (RestaurantListCreateView, reverse("restaurant-list")),
+        ):
+            bodies = []
+            for fast in (True, False):
+                menu_cache.clear()
+                with mock.patch.object(view_class, "fast_serializer", fast):
+                    bodies.append(self.client.get(url).data["data"])
+            self.assertEqual(bodies[0], bodies[1])
+            self.assertTrue(bodies[0])
+
+    def test_lru_evicts_least_recently_used(self):
+        backend = LocMemLRUBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        self.assertEqual(backend.get("a"), 1)
+        self.assertIsNone(backend.get("b"))
+
+    def test_shared_backend_invalidates_every_worker(self):
+        # Two workers' caches over the same Django cache.
+        config = {"BACKEND": "django", "ALIAS": "default", "TIMEOUT": 300}
+        first, second = (MenuCache(build_backend(config)) for _ in range(2))
+        self.addCleanup(first.clear)
+        first.get_or_build(self.restaurant.pk, lambda: ["old"])
+        self.assertEqual(
+            second.get_or_build(self.restaurant.pk, lambda: ["new"]), (["old"], True)
+        )
+        first.bump(self.restaurant.pk)
+        self.assertEqual(
+            second.get_or_build(self.restaurant.pk, lambda: ["new"]), (["new"], False)
+        )
+
+
+class AsyncReadViewTests(QueryBudgetTestMixin, APITestCase):
+    """
+    The async views served under ASGI answer like the sync DRF views.
+    """
+
+    def setUp(self):
+        menu_cache.clear()
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=self.owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        for name, price in (("Jollof", "20.00"), ("Waakye", "12.5")):
+            Menu.objects.create(
+                name=name,
+                description="Rice",
+                price=price,
+                restaurant=self.restaurant,
+            )
+        self.detail_url = reverse("restaurant-detail", args=[self.restaurant.pk])
+        self.menu_url = reverse("menu-create", args=[self.restaurant.pk])
+        self.login(self.owner)
+
+    def login(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def both(self, url, **headers):
+        headers = {**self.headers, **headers}
+        sync = self.client.get(url, headers=headers)
+        # Drop the cached menu but keep its version, which is its ETag.
+        version = menu_cache.get_version(self.restaurant.pk)
+        menu_cache.clear()
+        menu_cache.backend.set(menu_cache.version_key(self.restaurant.pk), version)
+        response = async_to_sync(self.async_client.get)(url, headers=headers)
+        return sync, response
+
+    def assertSameResponse(self, sync, response):
+        self.assertEqual(response.status_code, sync.status_code)
+        self.assertEqual(response.content, sync.content)
+        for header in (
+            "Content-Type",
+            "ETag",
+            "X-Conditional",
+            "X-Cache",
+            "WWW-Authenticate",
+        ):
+            self.assertEqual(response.get(header), sync.get(header), header)
+
+    def test_asgi_requests_use_the_async_views(self):
+        for url, view_class in (
+            (self.detail_url, AsyncRestaurantDetailView),
+            (self.menu_url, AsyncMenuListView),
+        ):
+            response = async_to_sync(self.async_client.get)(url, headers=self.headers)
+            match = resolve(url, urlconf=response.asgi_request.urlconf)
+            self.assertIs(match.func.view_class, view_class)
+
+    def test_asgi_queries_are_counted(self):
+        for url in (reverse("restaurant-catalogue"), self.detail_url, self.menu_url):
+            with self.subTest(url=url):
+                response = async_to_sync(self.async_client.get)(
+                    url, headers=self.headers
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertNotIn('desc="0 queries"', response["Server-Timing"])
+
+    def test_restaurant_detail(self):
+        sync, response = self.both(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertSameResponse(sync, response)
+
+    def test_restaurant_of_another_owner(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="check@123",
+            first_name="Ama",
+            last_name="Doe",
+            role="owner",
+        )
+        self.login(other)
+        sync, response = self.both(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertSameResponse(sync, response)
+
+    def test_menu(self):
+        sync, response = self.both(self.menu_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertSameResponse(sync, response)
+
+    def test_menu_not_modified(self):
+        etag = self.client.get(self.menu_url, headers=self.headers)["ETag"]
+        sync, response = self.both(self.menu_url, if_none_match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertSameResponse(sync, response)
+
+    def test_unknown_restaurant_menu(self):
+        sync, response = self.both(reverse("menu-create", args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertSameResponse(sync, response)
+
+    def test_authentication_errors(self):
+        self.headers = {}
+        sync, response = self.both(self.menu_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync, response)
+
+        self.headers = {"Authorization": "Bearer not-a-token"}
+        sync, response = self.both(self.menu_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync, response)
+
+    def test_inactive_user(self):
+        User.objects.filter(pk=self.owner.pk).update(is_active=False)
+        sync, response = self.both(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync, response)
+
+    def test_other_formats_go_to_the_sync_view(self):
+        for url, headers, expected in (
+            (self.menu_url + "?format=api", {}, status.HTTP_200_OK),
+            (self.menu_url, {"accept": "text/html"}, status.HTTP_200_OK),
+            (self.menu_url, {"accept": "application/xml"}, 406),
+            (self.detail_url + "?format=xml", {}, status.HTTP_404_NOT_FOUND),
+        ):
+            with self.subTest(url=url, headers=headers):
+                sync, response = self.both(url, **headers)
+                self.assertEqual(response.status_code, expected)
+                self.assertEqual(response.status_code, sync.status_code)
+                self.assertEqual(response["Content-Type"], sync["Content-Type"])
+
+        sync, response = self.both(self.menu_url, accept="application/json")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertSameResponse(sync, response)
+
+    def test_writes_go_to_the_sync_view(self):
+        response = async_to_sync(self.async_client.post)(
+            self.menu_url,
+            {"name": "Banku", "description": "Corn", "price": "15.00"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Menu.objects.filter(name="Banku").exists())
+
+    def test_query_budget(self):
+        for url, view_class in (
+            (self.detail_url, AsyncRestaurantDetailView),
+            (self.menu_url, AsyncMenuListView),
+        ):
+            with self.assertQueryBudget(view_class, "GET"):
+                async_to_sync(self.async_client.get)(url, headers=self.headers)
+
+
+class MenuBulkTests(APITestCase):
+    def setUp(self):
+        menu_cache.clear()
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Chop Bar",
+            owner=self.owner,
+            description="Food",
+            address="Accra",
+            phone_number="0244000000",
+        )
+        Menu.objects.create(
+            name="Jollof",
+            description="Rice",
+            price="20.00",
+            restaurant=self.restaurant,
+        )
+        self.url = reverse("menu-bulk", args=[self.restaurant.pk])
+        self.client.force_authenticate(self.owner)
+
+    def test_json_import_upserts_on_name(self):
+        self.client.get(reverse("menu-create", args=[self.restaurant.pk]))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                self.url,
+                [
+                    {"name": "Jollof", "description": "Spicy", "price": "22.00"},
+                    {"name": "Waakye", "description": "Beans", "price": "15"},
+                ],
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"created": 1, "updated": 1})
+        self.assertEqual(Menu.objects.count(), 2)
+        jollof = Menu.objects.get(name="Jollof")
+        self.assertEqual(jollof.description, "Spicy")
+        self.assertEqual(str(jollof.price), "22.00")
+        # bulk_create sends no signals; the import bumps the cache itself.
+        menu = self.client.get(reverse("menu-create", args=[self.restaurant.pk]))
+        self.assertEqual(menu["X-Cache"], "MISS")
+        self.assertEqual(len(menu.data["data"]), 2)
+
+    @override_settings(QUERY_BUDGET={"ACTION": "raise"})
+    def test_import_larger_than_one_batch(self):
+        items = [
+            {"name": f"Dish {i}", "description": "Rice", "price": "10.00"}
+            for i in range(55)
+        ]
+        # Five full batches of the same INSERT, plus a shorter one.
+        with mock.patch.object(menu_io, "BATCH_SIZE", 10):
+            response = self.client.post(self.url, items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"created": 55, "updated": 0})
+        self.assertEqual(Menu.objects.count(), 56)
+
+    def test_invalid_batch_writes_nothing(self):
+        response = self.client.post(
+            self.url,
+            [
+                {"name": "Waakye", "description": "Beans", "price": "15"},
+                {"name": "Kenkey", "description": "Corn", "price": "abc"},
+                {"name": "Waakye", "description": "Again", "price": "15"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Menu.objects.count(), 1)
+
+    def test_csv_round_trip(self):
+        body = (
+            "name,description,price,is_available\n"
+            "Waakye,Beans,15.00,false\n"
+            "Kenkey,Corn,8.50,\n"
+        )
+        response = self.client.post(self.url, body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"created": 2, "updated": 0})
+        self.assertTrue(Menu.objects.get(name="Kenkey").is_available)
+
+        export = self.client.get(self.url)
+        self.assertEqual(export["Content-Type"], "text/csv")
+        self.assertEqual(
+            b"".join(export.streaming_content).decode().splitlines(),
+            [
+                "name,description,price,is_available",
+                "Jollof,Rice,20.00,true",
+                "Waakye,Beans,15.00,false",
+                "Kenkey,Corn,8.50,true",
+            ],
+        )
+
+    def test_other_owners_restaurant(self):
+        other = User.objects.create_user(
+            email="other@example.com",
+            password="check@123",
+            first_name="Other",
+            last_name="Owner",
+            role="owner",
+        )
+        self.client.force_authenticate(other)
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command_imports_json_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as handle:
+            json.dump(
+                {
+                    "items": [
+                        {"name": f"Dish {i}", "description": "Food", "price": i}
+                        for i in range(1, 2501)
+                    ]
+                },
+                handle,
+            )
+            handle.flush()
+            stdout = io.StringIO()
+            call_command(
+                "menu_bulk",
+                "import",
+                str(self.restaurant.pk),
+                handle.name,
+                stdout=stdout,
+            )
+        self.assertIn("2500 created, 0 updated", stdout.getvalue())
+        self.assertEqual(Menu.objects.count(), 2501)
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("menu-search")
+        owner = User.objects.create_user(
+            email="owner@example.com",
+            password="check@123",
+            first_name="Jane",
+            last_name="Doe",
+            role="owner",
+        )
+        self.restaurant = Restaurants.objects.create(
+            name="Jollof Palace",
+            owner=owner,
+            description="Food",
+            address="Osu, Accra",
+            phone_number="0244000000",
+        )
+        self.jollof = Menu.objects.create(
+            name="Jollof Rice",
+            description="Smoky party rice",
+            price="20.00",
+            restaurant=self.restaurant,
+        )
+        self.waakye = Menu.objects.create(
+            name="Waakye",
+            description="Rice and beans, served with jollof sauce",
+            price="15.00",
+            restaurant=self.restaurant,
+        )
+        self.fufu = Menu.objects.create(
+            name="Fufu",
+            description="Pounded cassava",
+            price="25.00",
+            is_available=False,
+            restaurant=self.restaurant,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["id"] for row in response.data["data"]]
+
+    def test_prefix_search_ranks_name_matches_first(self):
+        self.assertEqual(self.search(q="jol"), [self.jollof.pk, self.waakye.pk])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search(q="rice smo"), [self.jollof.pk])
+
+    def test_filter_by_availability(self):
+        self.assertEqual(self.search(q="pounded"), [self.fufu.pk])
+        self.assertEqual(self.search(q="pounded", available="true"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        Menu.objects.filter(pk=self.fufu.pk).update(name="Banku")
+        self.assertEqual(self.search(q="banku"), [self.fufu.pk])
+        self.assertEqual(self.search(q="fufu"), [])
+        self.jollof.delete()
+        self.assertEqual(self.search(q="jollof"), [self.waakye.pk])
+
+    def test_results_are_paginated(self):
+        Menu.objects.bulk_create(
+            [
+                Menu(
+                    name=f"Kelewele {i}",
+                    description="Spicy plantain",
+                    price="10.00",
+                    restaurant=self.restaurant,
+                )
+                for i in range(7)
+            ]
+        )
+        seen = []
+        url = self.url + "?q=kele&page_size=3"
+        while url:
+            response = self.client.get(url)
+            seen.extend(row["id"] for row in response.data["data"])
+            url = response.data["next"]
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_query_without_words_is_rejected(self):
+        response = self.client.get(self.url, {"q": "*&!"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_restaurant_search(self):
+        response = self.client.get(reverse("restaurant-search"), {"q": "osu"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["id"], self.restaurant.pk)
+
+    def test_broad_queries_are_ordered_by_tier(self):
+        with mock.patch.object(search, "RANK_LIMIT", 1):
+            self.assertEqual(self.search(q="jol"), [self.jollof.pk, self.waakye.pk])
+            self.assertEqual(self.search(q="rice"), [self.jollof.pk, self.waakye.pk])
+            response = self.client.get(self.url, {"q": "rice", "page_size": 1})
+            response = self.client.get(response.data["next"])
+            self.assertEqual(response.data["data"][0]["id"], self.waakye.pk)
+            self.assertIsNone(response.data["next"])
+
+    def test_search_page_is_three_queries(self):
+        view = MenuSearchView.as_view()
+        request = APIRequestFactory().get(self.url, {"q": "rice"})
+        # Probe the number of matches, rank them, load the page's rows.
+        with self.assertNumQueries(3):
+            response = view(request)
+        self.assertEqual(len(response.data["data"]), 2)
+
+    def test_cursor_of_another_ranking_mode_is_rejected(self):
+        with mock.patch.object(search, "RANK_LIMIT", 1):
+            response = self.client.get(self.url, {"q": "rice", "page_size": 1})
+        # Fewer matches now: the next page would be ranked by score.
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_without_mode_is_rejected(self):
+        cursor = RankedPagination().encode_cursor([0.0, self.jollof.pk])
+        response = self.client.get(self.url, {"q": "rice", "cursor": cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@skipUnless(connection.vendor == "postgresql", "tsvector search is PostgreSQL only")
+class PostgreSQLSearchTests(SearchTests):
+    """
+    The SearchTests against the tsvector/GIN backend, and its index use.
+    """
+
+    def test_queries_use_the_gin_indexes(self):
+        backend = search.BACKENDS["postgresql"]
+        terms = search.tokenize("jol")
+        for build, index in (
+            (backend.everywhere, "restaurants_menu_search_idx"),
+            (backend.primary, "restaurants_menu_name_search_idx"),
+        ):
+            source, params, id_column = build(search.menu_index, terms)
+            with connection.cursor() as cursor:
+                # The tables are tiny; make the planner show it can use them.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute(f"EXPLAIN SELECT {id_column} {source}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            self.assertIn(index, plan)
+
+
+class FastJSONTests(SimpleTestCase):
+    payload = {
+        "msg": "Menu \u2028 ch\u00e8re",
+        "data": [
+            {
+                "name": "Jollof",
+                "price": "20.00",
+                "is_available": True,
+                "rating": 4.5,
+                "created_at": datetime.datetime(
+                    2026, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc
+                ),
+                "served_on": datetime.date(2026, 1, 2),
+                "tags": ("spicy", None),
+            }
+        ],
+        "status": True,
+        1: "non-string key",
+    }
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload),
+            JSONRenderer().render(self.payload),
+        )
+
+    def test_decimals_are_exact_strings(self):
+        rendered = FastJSONRenderer().render({"total": Decimal("12345678901234.10")})
+        self.assertEqual(rendered, b'{"total":"12345678901234.10"}')
+
+    def test_indent_uses_stdlib(self):
+        media_type = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_parser_matches_json_parser(self):
+        body = JSONRenderer().render(self.payload)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_parser_rejects_invalid_json(self):
+        for body in (b'{"name": NaN}', b'{"name": '):
+            with self.assertRaisesMessage(ParseError, "JSON parse error"):
+                FastJSONParser().parse(io.BytesIO(body))
@@ -1,14 +1,23 @@
 from django.urls import path
 from .views import (
     RestaurantListCreateView,
+    RestaurantCatalogueView,
     RestaurantDetailView,
     MenuCreateView,
+    MenuBulkView,
     MenuDetailView,
+    MenuSearchView,
+    RestaurantSearchView,
 )
 
 urlpatterns = [
     # Restaurants
     path("restaurants/", RestaurantListCreateView.as_view(), name="restaurant-list"),
+    path(
+        "restaurants/catalogue/",
+        RestaurantCatalogueView.as_view(),
+        name="restaurant-catalogue",
+    ),
     path(
         "restaurants/<int:pk>/",
         RestaurantDetailView.as_view(),
@@ -20,9 +29,21 @@ urlpatterns = [
         MenuCreateView.as_view(),
         name="menu-create",
     ),
+    path(
+        "restaurants/<int:restaurant_pk>/menu/bulk/",
+        MenuBulkView.as_view(),
+        name="menu-bulk",
+    ),
     path(
         "menu/<int:pk>/",
         MenuDetailView.as_view(),
         name="menu-detail",
     ),
+    # Search
+    path("search/menu/", MenuSearchView.as_view(), name="menu-search"),
+    path(
+        "search/restaurants/",
+        RestaurantSearchView.as_view(),
+        name="restaurant-search",
+    ),
 ]
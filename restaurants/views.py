@@ -1,15 +1,32 @@
+from functools import partial
+
 from drf_spectacular.utils import extend_schema
 from rest_framework.generics import GenericAPIView
 from rest_framework import status, permissions
 from rest_framework.response import Response
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
+from config.asyncviews import AsyncAPIView
+from config.conditional import conditional, queryset_validators
+from config.parsers import CSVParser, FastJSONParser
+from config.pagination import KeysetPagination, RankedPagination
+from config.serializers import FastSerializer, FastSerializerMixin
+from . import menu_io, search
+from .cache import menu_cache
 from .models import Restaurants, Menu
-from .serializers import RestaurantsSerializers, MenuSerializers
+from .serializers import (
+    RestaurantsSerializers,
+    MenuSerializers,
+    RestaurantCatalogueSerializer,
+    SearchQuerySerializer,
+    MenuSearchSerializer,
+    MenuImportSerializer,
+)
 
 
 @extend_schema(tags=["restaurants"])
-class RestaurantListCreateView(GenericAPIView):
+class RestaurantListCreateView(FastSerializerMixin, GenericAPIView):
     """
     List and create restaurants owned by the authenticated user.
 
@@ -24,10 +41,18 @@ class RestaurantListCreateView(GenericAPIView):
     serializer_class = RestaurantsSerializers
     permission_classes = [permissions.IsAuthenticated]
     queryset = Restaurants.objects.all()
+    fast_serializer = True
+    # GET includes loading the token's user on an AUTH_USER_CACHE miss, POST
+    # building the public menu snapshot after commit.
+    query_budget = {"GET": 4, "POST": 5}
 
     def get_queryset(self):
         return Restaurants.objects.filter(owner=self.request.user)
 
+    def get_validators(self, request):
+        return queryset_validators(self.get_queryset())
+
+    @conditional
     def get(self, request):
         """
         Retrieve restaurants owned by the authenticated user.
@@ -39,7 +64,7 @@ class RestaurantListCreateView(GenericAPIView):
             rest_framework.response.Response: JSON response with list of the
             user's restaurants (HTTP 200).
         """
-        restaurants = self.queryset
+        restaurants = self.get_queryset()
         if not restaurants.exists():
             return Response(
                 {
@@ -49,11 +74,10 @@ class RestaurantListCreateView(GenericAPIView):
                 },
                 status=status.HTTP_200_OK,
             )
-        serializer = self.serializer_class(restaurants, many=True)
         return Response(
             {
                 "msg": "All your restaurants",
-                "data": serializer.data,
+                "data": self.serialize_rows(self.get_serializer_rows(restaurants)),
                 "status": True,
             },
             status=status.HTTP_200_OK,
@@ -105,6 +129,74 @@ class RestaurantListCreateView(GenericAPIView):
         )
 
 
+@extend_schema(tags=["restaurants"])
+class RestaurantCatalogueView(GenericAPIView):
+    """
+    Public, cursor-paginated catalogue of every restaurant on the platform.
+
+    Restaurants are listed newest first using keyset pagination on
+    (created_at, id), backed by the `restaurants_created_id_idx` index, so
+    fetching the deepest page costs the same single query as the first.
+
+    Methods:
+        get(request): Return one page of restaurants and the next cursor.
+    """
+
+    serializer_class = RestaurantCatalogueSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return Restaurants.objects.only(*self.serializer_class.Meta.fields)
+
+    def get_validators(self, request):
+        paginator = self.pagination_class()
+        return queryset_validators(
+            paginator.page_queryset(self.get_queryset(), request)
+        )
+
+    @conditional
+    def get(self, request):
+        """
+        Retrieve a page of the restaurant catalogue.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Optional query params: `cursor` (opaque value taken from
+                the previous response) and `page_size` (max 100).
+
+        Returns:
+            rest_framework.response.Response: JSON response with the page of
+            restaurants and the `next` page URL, or null on the last page
+            (HTTP 200).
+        """
+        paginator = self.pagination_class()
+        restaurants = paginator.paginate_queryset(
+            self.get_queryset(), request, view=self
+        )
+        serializer = self.serializer_class(restaurants, many=True)
+        return Response(
+            {
+                "msg": "Restaurant catalogue",
+                "data": serializer.data,
+                "next": paginator.get_next_link(),
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+def menu_validators(restaurant_pk):
+    """
+    Return the validators of a restaurant's menu body.
+
+    The body is cached in `menu_cache`, whose version moves on every write
+    to the restaurant or its menu, so the version alone tags the body and
+    a conditional read costs no query.
+    """
+    return {"version": menu_cache.get_version(restaurant_pk)}
+
+
 @extend_schema(tags=["restaurants"])
 class RestaurantDetailView(GenericAPIView):
     """
@@ -112,12 +204,15 @@ class RestaurantDetailView(GenericAPIView):
 
     Methods:
         get_object(): Return the restaurant object or raise 404.
+        get(request, pk): Return the restaurant.
         patch(request, pk): Partially update the restaurant.
         delete(request, pk): Delete the restaurant.
     """
 
     serializer_class = RestaurantsSerializers
     permission_classes = [permissions.IsAuthenticated]
+    # GET: the restaurant; one more loading the token's user on a miss.
+    query_budget = {"GET": 2}
 
     def get_object(self):
         """
@@ -137,6 +232,28 @@ class RestaurantDetailView(GenericAPIView):
             owner=self.request.user,
         )
 
+    def get(self, request, pk):
+        """
+        Retrieve a restaurant owned by the authenticated user.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+            pk (int): Path parameter for the restaurant primary key.
+
+        Returns:
+            rest_framework.response.Response: JSON response with the
+            restaurant data (HTTP 200).
+        """
+        serializer = self.serializer_class(self.get_object())
+        return Response(
+            {
+                "msg": "Restaurant details",
+                "data": serializer.data,
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     def patch(self, request, pk):
         """
         Partially update a restaurant owned by the authenticated user.
@@ -193,18 +310,106 @@ class RestaurantDetailView(GenericAPIView):
         )
 
 
+class AsyncRestaurantDetailView(AsyncAPIView):
+    """
+    RestaurantDetailView with an async GET, served under ASGI (see
+    `config.asyncviews`). PATCH and DELETE go to RestaurantDetailView.
+    """
+
+    sync_view = RestaurantDetailView
+    query_budget = RestaurantDetailView.query_budget
+
+    async def get(self, request, pk):
+        """
+        Retrieve a restaurant owned by the authenticated user.
+
+        Args:
+            request (django.http.HttpRequest): The incoming request, with
+                `request.user` set from its bearer token.
+            pk (int): Path parameter for the restaurant primary key.
+
+        Returns:
+            django.http.HttpResponse: The same JSON as
+            `RestaurantDetailView.get` (HTTP 200).
+
+        Raises:
+            Http404 if the restaurant does not exist or is not owned by user.
+        """
+        fast = FastSerializer.for_serializer(RestaurantsSerializers)
+        restaurants = Restaurants.objects.filter(owner=request.user)
+        try:
+            row = await fast.values(restaurants).aget(pk=pk)
+        except Restaurants.DoesNotExist:
+            raise Http404("No Restaurants matches the given query.")
+        data = await fast.aserialize([row])
+        return self.render(
+            {
+                "msg": "Restaurant details",
+                "data": data[0],
+                "status": True,
+            }
+        )
+
+
 @extend_schema(tags=["menu"])
-class MenuCreateView(GenericAPIView):
+class MenuCreateView(FastSerializerMixin, GenericAPIView):
     """
-    Create menu items for a restaurant owned by the authenticated user.
+    List a restaurant's menu, or create menu items for a restaurant owned
+    by the authenticated user.
+
+    Menu reads are served from `menu_cache`, which is invalidated by the
+    Menu/Restaurants signals in `restaurants.signals`, so repeated reads do
+    not touch the database. Their ETag is derived from the cache version,
+    so a 304 does not either. With the default per-process backend only the
+    worker handling a write drops its copy; other workers can return the
+    old menu until MENU_CACHE["TIMEOUT"] expires it.
 
     Methods:
+        get(request, restaurant_pk): Return the restaurant's menu items.
         post(request, restaurant_pk): Create a menu item linked to a
             restaurant owned by request.user.
     """
 
     serializer_class = MenuSerializers
     permission_classes = [permissions.IsAuthenticated]
+    fast_serializer = True
+
+    def get_validators(self, request, restaurant_pk):
+        return menu_validators(restaurant_pk)
+
+    @conditional
+    def get(self, request, restaurant_pk):
+        """
+        Retrieve every menu item of a restaurant.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+            restaurant_pk (int): Path parameter for the parent restaurant.
+
+        Returns:
+            rest_framework.response.Response: JSON response with the menu
+            items (HTTP 200). The `X-Cache` header reports HIT or MISS.
+
+        Raises:
+            Http404 if the restaurant does not exist (checked on cache miss).
+        """
+
+        def build():
+            get_object_or_404(Restaurants.objects.only("id"), pk=restaurant_pk)
+            menu = Menu.objects.filter(restaurant_id=restaurant_pk).order_by("id")
+            return list(self.serialize_rows(self.get_serializer_rows(menu)))
+
+        data, hit = menu_cache.get_or_build(restaurant_pk, build)
+        response = Response(
+            {
+                "msg": "Restaurant menu",
+                "data": data,
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
 
     def post(self, request, restaurant_pk):
         """
@@ -243,6 +448,145 @@ class MenuCreateView(GenericAPIView):
         )
 
 
+class AsyncMenuListView(AsyncAPIView):
+    """
+    MenuCreateView with an async GET, served under ASGI (see
+    `config.asyncviews`). POST goes to MenuCreateView.
+
+    Reads share `menu_cache` and the conditional validators with the sync
+    view, so both deployments answer with the same body and ETag.
+    """
+
+    sync_view = MenuCreateView
+    # Restaurant check and menu on a cache miss; one more loading the
+    # token's user.
+    query_budget = {"GET": 3}
+
+    async def get_validators(self, request, restaurant_pk):
+        return menu_validators(restaurant_pk)
+
+    @conditional
+    async def get(self, request, restaurant_pk):
+        """
+        Retrieve every menu item of a restaurant.
+
+        Args:
+            request (django.http.HttpRequest): The incoming request, with
+                `request.user` set from its bearer token.
+            restaurant_pk (int): Path parameter for the parent restaurant.
+
+        Returns:
+            django.http.HttpResponse: The same JSON as
+            `MenuCreateView.get` (HTTP 200), with the `X-Cache` header.
+
+        Raises:
+            Http404 if the restaurant does not exist (checked on cache miss).
+        """
+
+        async def build():
+            if not await Restaurants.objects.filter(pk=restaurant_pk).aexists():
+                raise Http404("No Restaurants matches the given query.")
+            fast = FastSerializer.for_serializer(MenuSerializers)
+            menu = Menu.objects.filter(restaurant_id=restaurant_pk).order_by("id")
+            return await fast.aserialize(fast.values(menu))
+
+        data, hit = await menu_cache.aget_or_build(restaurant_pk, build)
+        response = self.render(
+            {
+                "msg": "Restaurant menu",
+                "data": data,
+                "status": True,
+            }
+        )
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+
+@extend_schema(tags=["menu"])
+class MenuBulkView(GenericAPIView):
+    """
+    Import or export the whole menu of a restaurant owned by the
+    authenticated user.
+
+    Methods:
+        get(request, restaurant_pk): Stream the menu as CSV.
+        post(request, restaurant_pk): Upsert a batch of menu items, sent as
+            a JSON list or a `text/csv` body, matched on name.
+    """
+
+    serializer_class = MenuImportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [FastJSONParser, CSVParser]
+    max_items = 10_000
+
+    def get_restaurant(self, restaurant_pk):
+        return get_object_or_404(
+            Restaurants.objects.only("id"),
+            pk=restaurant_pk,
+            owner=self.request.user,
+        )
+
+    def get(self, request, restaurant_pk):
+        """
+        Export the restaurant's menu as CSV.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+            restaurant_pk (int): Path parameter for the parent restaurant.
+
+        Returns:
+            django.http.StreamingHttpResponse: `text/csv` attachment with
+            name, description, price and is_available columns (HTTP 200).
+
+        Raises:
+            Http404 if the restaurant is not found or not owned by the user.
+        """
+        restaurant = self.get_restaurant(restaurant_pk)
+        response = StreamingHttpResponse(
+            menu_io.export_csv(restaurant.pk), content_type="text/csv"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="menu-{restaurant.pk}.csv"'
+        )
+        return response
+
+    def post(self, request, restaurant_pk):
+        """
+        Create or update many menu items in one request.
+
+        Args:
+            request (rest_framework.request.Request): Incoming request with a
+                list of menu items (JSON) or a CSV body with a header row.
+                Items whose name already exists in the restaurant are
+                updated.
+            restaurant_pk (int): Path parameter for the parent restaurant.
+
+        Returns:
+            rest_framework.response.Response: JSON response with the created
+            and updated counts (HTTP 200), or the per-item validation
+            errors (HTTP 400); nothing is written unless every item is
+            valid.
+
+        Side effects:
+            Upserts Menu records linked to the restaurant.
+        """
+        restaurant = self.get_restaurant(restaurant_pk)
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get("items")
+        serializer = menu_io.validate_items(items, max_length=self.max_items)
+        serializer.is_valid(raise_exception=True)
+        created, updated = menu_io.upsert_menu(restaurant.pk, serializer.validated_data)
+        return Response(
+            {
+                "msg": "Menu successfully imported",
+                "data": {"created": created, "updated": updated},
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 @extend_schema(tags=["menu"])
 class MenuDetailView(GenericAPIView):
     """
@@ -329,3 +673,98 @@ class MenuDetailView(GenericAPIView):
             {"msg": "Menu successfully deleted", "status": True},
             status=status.HTTP_204_NO_CONTENT,
         )
+
+
+class SearchView(GenericAPIView):
+    """
+    Base class for the ranked full-text search endpoints.
+
+    Subclasses set `index` (a `restaurants.search.SearchIndex`), `msg` and
+    `serializer_class`, and may override `get_filters`. A page costs one
+    search query plus one query loading the matched rows.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    pagination_class = RankedPagination
+    index = None
+    msg = None
+
+    def get_filters(self, params):
+        return {}
+
+    def get(self, request):
+        """
+        Search and return one page of results, best match first.
+
+        Args:
+            request (rest_framework.request.Request): The incoming request.
+                Required query param: `q`; every word must match, each as a
+                prefix. Optional: `cursor` and `page_size` (max 100).
+
+        Returns:
+            rest_framework.response.Response: JSON response with the page of
+            results and the `next` page URL (HTTP 200).
+
+        Raises:
+            ValidationError (HTTP 400) if `q` has no searchable words.
+        """
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        terms = search.tokenize(params.validated_data["q"])
+        filters = self.get_filters(params.validated_data)
+
+        paginator = self.pagination_class()
+        hits = paginator.paginate_search(
+            partial(self.index.search, terms, filters), request
+        )
+        rows = self.get_queryset().in_bulk([pk for pk, _ in hits])
+        serializer = self.serializer_class(
+            [rows[pk] for pk, _ in hits if pk in rows], many=True
+        )
+        return Response(
+            {
+                "msg": self.msg,
+                "data": serializer.data,
+                "next": paginator.get_next_link(),
+                "status": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+@extend_schema(tags=["search"], parameters=[SearchQuerySerializer])
+class MenuSearchView(SearchView):
+    """
+    Public ranked prefix search over menu item names and descriptions.
+
+    Matches in the name rank above matches in the description. Pass
+    `available=true` (or `false`) to filter on `is_available`.
+    """
+
+    serializer_class = MenuSearchSerializer
+    index = search.menu_index
+    msg = "Menu search results"
+
+    def get_queryset(self):
+        return Menu.objects.select_related("restaurant").only(
+            *MenuSearchSerializer.Meta.fields[:-1], "restaurant__name"
+        )
+
+    def get_filters(self, params):
+        if params["available"] is None:
+            return {}
+        return {"is_available": params["available"]}
+
+
+@extend_schema(tags=["search"], parameters=[SearchQuerySerializer])
+class RestaurantSearchView(SearchView):
+    """
+    Public ranked prefix search over restaurant names and addresses.
+    """
+
+    serializer_class = RestaurantCatalogueSerializer
+    index = search.restaurant_index
+    msg = "Restaurant search results"
+
+    def get_queryset(self):
+        return Restaurants.objects.only(*self.serializer_class.Meta.fields)
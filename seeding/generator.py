@@ -0,0 +1,625 @@
+"""
+Synthetic data at production scale.
+
+`seed()` generates owners, customers, restaurants, menus, carts with their
+items and past orders with their items. Restaurants and, within each
+restaurant, dishes are picked with Zipfian popularity, so a few of them
+get most of the orders, as in production.
+
+Every row's primary key is decided up front from the table's current
+maximum, so the foreign keys of any chunk can be computed without reading
+anything back. Chunks are therefore independent of each other and of the
+database: they are built in a pool of worker processes while this process
+inserts the finished ones, parents first, one transaction per chunk.
+
+Chunks are built as plain tuples and written with one `executemany` per
+table, with values converted by the backend's own adapters, so they are
+stored exactly as the ORM would store them. Building model instances and
+running them through `bulk_create`'s per-field preparation costs several times
+as much as the insert itself.
+
+Nothing goes through `save()`, so no model signals are sent and no cache
+or snapshot is touched: seeded restaurants have no cached menus or
+snapshots yet, and they are built on first read. Passwords are hashed
+once and shared by every seeded user. Timestamps are spread over the last
+`days` days rather than all being "now".
+"""
+
+import bisect
+import os
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache, partial
+from itertools import accumulate
+
+import django
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from restaurants.models import Menu, Restaurants
+from users.models import User
+
+# Parents before children: a chunk only references rows of earlier tables.
+TABLES = ("users", "restaurants", "menus", "carts", "orders")
+
+# Per --scale 1; about 210k rows in total. `menu_items` is per restaurant
+# and does not scale.
+DEFAULT_COUNTS = {
+    "owners": 200,
+    "customers": 10_000,
+    "restaurants": 500,
+    "menu_items": 40,
+    "carts": 2_000,
+    "orders": 50_000,
+}
+
+DISHES = (
+    "Jollof Rice",
+    "Waakye",
+    "Banku and Tilapia",
+    "Fufu and Light Soup",
+    "Kenkey and Fish",
+    "Kelewele",
+    "Red Red",
+    "Omo Tuo",
+    "Ampesi",
+    "Tuo Zaafi",
+    "Kontomire Stew",
+    "Chichinga",
+)
+STYLES = ("Classic", "Spicy", "Family", "Street", "Grilled", "Special")
+AREAS = ("Osu", "Labone", "Cantonments", "East Legon", "Madina", "Tema")
+
+# Columns of the row tuples built below, in order.
+USER_FIELDS = (
+    "id",
+    "email",
+    "password",
+    "first_name",
+    "last_name",
+    "role",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "date_joined",
+    "updated_at",
+)
+RESTAURANT_FIELDS = (
+    "id",
+    "name",
+    "owner",
+    "description",
+    "address",
+    "phone_number",
+    "created_at",
+    "updated_at",
+)
+MENU_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "is_available",
+    "restaurant",
+    "created_at",
+    "updated_at",
+)
+CART_FIELDS = ("id", "customer", "total_price", "added_at", "updated_at")
+CART_ITEM_FIELDS = (
+    "cart",
+    "menu_item",
+    "quantity",
+    "price",
+    "added_at",
+    "updated_at",
+)
+ORDER_FIELDS = (
+    "id",
+    "customer",
+    "order_date",
+    "status",
+    "total_amount",
+    "created_at",
+    "updated_at",
+)
+ORDER_ITEM_FIELDS = (
+    "order",
+    "menu_item",
+    "quantity",
+    "price",
+    "created_at",
+    "updated_at",
+)
+
+
+@dataclass
+class Plan:
+    """
+    What to generate and where its primary keys start.
+
+    Attributes:
+        owners, customers, restaurants, carts, orders (int): Rows to
+            create. `carts` is capped at `customers`.
+        menu_items (int): Dishes per restaurant.
+        days (int): Timestamps are spread over this many days before `end`.
+        zipf (float): Exponent of the popularity distributions; 0 picks
+            uniformly.
+        seed (int): Seed of the random choices. The same seed, counts and
+            chunk size give the same data.
+        password (str): Hashed password shared by all seeded users.
+        end (datetime.datetime): Latest timestamp.
+        bases (dict[str, int]): Highest existing primary key per table.
+    """
+
+    owners: int
+    customers: int
+    restaurants: int
+    menu_items: int
+    carts: int
+    orders: int
+    days: int
+    zipf: float
+    seed: int
+    password: str
+    end: object
+    bases: dict = field(default_factory=dict)
+
+    def size(self, table):
+        return {
+            "users": self.owners + self.customers,
+            "restaurants": self.restaurants,
+            "menus": self.restaurants * self.menu_items,
+            "carts": min(self.carts, self.customers),
+            "orders": self.orders,
+        }[table]
+
+    def user_id(self, index):
+        return self.bases["users"] + 1 + index
+
+    def customer_id(self, index):
+        return self.user_id(self.owners + index)
+
+    def restaurant_id(self, index):
+        return self.bases["restaurants"] + 1 + index
+
+    def menu_id(self, restaurant, dish):
+        return self.bases["menus"] + 1 + restaurant * self.menu_items + dish
+
+    def price(self, restaurant, dish):
+        # A pure function of the dish, so order and cart chunks agree with
+        # the menu chunk without looking prices up.
+        index = restaurant * self.menu_items + dish
+        return Decimal(500 + (index * 7919 + self.seed) % 9500) / 100
+
+
+@dataclass
+class SeedResult:
+    """
+    Outcome of a seed run.
+
+    Attributes:
+        rows (collections.Counter): Rows inserted per model name.
+        elapsed (float): Wall-clock seconds.
+    """
+
+    rows: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    @property
+    def total(self):
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+@lru_cache(maxsize=8)
+def cumulative_weights(n, s):
+    return list(accumulate(1 / rank**s for rank in range(1, n + 1)))
+
+
+def zipf_index(rng, n, s):
+    """
+    Return an index in [0, n) where index k has weight 1 / (k + 1)**s.
+    """
+    weights = cumulative_weights(n, s)
+    return min(bisect.bisect(weights, rng.random() * weights[-1]), n - 1)
+
+
+def basket(plan, rng, size):
+    """
+    Return (restaurant index, distinct dish indexes) of one cart or order.
+    """
+    restaurant = zipf_index(rng, plan.restaurants, plan.zipf)
+    size = min(size, plan.menu_items)
+    dishes = set()
+    while len(dishes) < size:
+        dishes.add(zipf_index(rng, plan.menu_items, plan.zipf))
+    return restaurant, sorted(dishes)
+
+
+class Clock:
+    """
+    Random timestamps within the plan's last `days` days, already in the
+    form the database expects.
+
+    Converting each value with `adapt_datetimefield_value` would make every
+    aware datetime naive again; instead the end is converted once, as the
+    backend would, and offsets are subtracted from it.
+    """
+
+    def __init__(self, plan, rng):
+        end = plan.end
+        if settings.USE_TZ and not connection.features.supports_timezones:
+            end = timezone.make_naive(end, connection.timezone)
+        self.end = end
+        self.span = plan.days * 86400
+        self.rng = rng
+        self.adapt = connection.ops.adapt_datetimefield_value
+
+    def sample(self):
+        """
+        Return (age in seconds, adapted timestamp).
+        """
+        age = self.rng.random() * self.span
+        return age, self.adapt(self.end - timedelta(seconds=age))
+
+    def __call__(self):
+        return self.sample()[1]
+
+
+def build_users(plan, rng, clock, start, stop):
+    rows = []
+    for index in range(start, stop):
+        pk = plan.user_id(index)
+        owner = index < plan.owners
+        joined = clock()
+        rows.append(
+            (
+                pk,
+                f"seed{pk}@seed.example",
+                plan.password,
+                "Owner" if owner else "Customer",
+                str(pk),
+                "owner" if owner else "customer",
+                True,
+                False,
+                False,
+                joined,
+                joined,
+            )
+        )
+    return {User: (USER_FIELDS, rows)}
+
+
+def build_restaurants(plan, rng, clock, start, stop):
+    rows = []
+    for index in range(start, stop):
+        created = clock()
+        rows.append(
+            (
+                plan.restaurant_id(index),
+                f"{rng.choice(AREAS)} Kitchen {index}",
+                plan.user_id(rng.randrange(plan.owners)),
+                "Local dishes cooked to order.",
+                f"{rng.randint(1, 200)} {rng.choice(AREAS)} Road, Accra",
+                f"02{rng.randint(0, 99_999_999):08d}",
+                created,
+                created,
+            )
+        )
+    return {Restaurants: (RESTAURANT_FIELDS, rows)}
+
+
+def build_menus(plan, rng, clock, start, stop):
+    rows = []
+    for index in range(start, stop):
+        restaurant, dish = divmod(index, plan.menu_items)
+        created = clock()
+        rows.append(
+            (
+                plan.menu_id(restaurant, dish),
+                f"{rng.choice(STYLES)} {DISHES[dish % len(DISHES)]} {dish}",
+                "Freshly prepared with local ingredients.",
+                plan.price(restaurant, dish),
+                rng.random() >= 0.1,
+                plan.restaurant_id(restaurant),
+                created,
+                created,
+            )
+        )
+    return {Menu: (MENU_FIELDS, rows)}
+
+
+def build_carts(plan, rng, clock, start, stop):
+    carts, items = [], []
+    zero = Decimal("0.00")
+    for index in range(start, stop):
+        pk = plan.bases["carts"] + 1 + index
+        updated = clock()
+        restaurant, dishes = basket(plan, rng, rng.randint(1, 4))
+        total = zero
+        for dish in dishes:
+            quantity = rng.randint(1, 3)
+            total += plan.price(restaurant, dish) * quantity
+            items.append(
+                (
+                    pk,
+                    plan.menu_id(restaurant, dish),
+                    quantity,
+                    zero,
+                    updated,
+                    updated,
+                )
+            )
+        carts.append((pk, plan.customer_id(index), total, updated, updated))
+    return {Cart: (CART_FIELDS, carts), CartItem: (CART_ITEM_FIELDS, items)}
+
+
+def build_orders(plan, rng, clock, start, stop):
+    orders, items = [], []
+    for index in range(start, stop):
+        pk = plan.bases["orders"] + 1 + index
+        age, placed = clock.sample()
+        restaurant, dishes = basket(plan, rng, rng.randint(1, 4))
+        total = Decimal("0.00")
+        for dish in dishes:
+            quantity = rng.randint(1, 3)
+            price = plan.price(restaurant, dish) * quantity
+            total += price
+            items.append(
+                (
+                    pk,
+                    plan.menu_id(restaurant, dish),
+                    quantity,
+                    price,
+                    placed,
+                    placed,
+                )
+            )
+        if age < 86400:
+            status = rng.choice(("PENDING", "PROCESSING", "COMPLETED"))
+        else:
+            status = "CANCELLED" if rng.random() < 0.05 else "COMPLETED"
+        orders.append(
+            (
+                pk,
+                plan.customer_id(rng.randrange(plan.customers)),
+                placed,
+                status,
+                total,
+                placed,
+                placed,
+            )
+        )
+    return {Order: (ORDER_FIELDS, orders), OrderItem: (ORDER_ITEM_FIELDS, items)}
+
+
+BUILDERS = {
+    "users": build_users,
+    "restaurants": build_restaurants,
+    "menus": build_menus,
+    "carts": build_carts,
+    "orders": build_orders,
+}
+
+
+def adapter(model_field):
+    """
+    Return the backend's conversion of `model_field` values to query
+    parameters, or None when they are passed as they are. Datetimes come
+    from a Clock and are already converted.
+    """
+    if model_field.get_internal_type() == "DecimalField":
+        return partial(
+            connection.ops.adapt_decimalfield_value,
+            max_digits=model_field.max_digits,
+            decimal_places=model_field.decimal_places,
+        )
+    return None
+
+
+def insert_rows(model, names, rows):
+    """
+    Insert `rows`, tuples of the `names` fields' values, with one
+    `executemany`.
+    """
+    opts = model._meta
+    model_fields = [opts.get_field(name) for name in names]
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+        quote(opts.db_table),
+        ", ".join(quote(model_field.column) for model_field in model_fields),
+        ", ".join(["%s"] * len(model_fields)),
+    )
+    adapters = [
+        (position, convert)
+        for position, model_field in enumerate(model_fields)
+        if (convert := adapter(model_field))
+    ]
+    if adapters:
+        params = []
+        for row in rows:
+            row = list(row)
+            for position, convert in adapters:
+                row[position] = convert(row[position])
+            params.append(row)
+    else:
+        params = rows
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+@contextmanager
+def bulk_load_settings():
+    """
+    On SQLite, skip waiting for fsync while seeding: seeded data can be
+    generated again. The previous setting is restored afterwards.
+    """
+    # The safety level cannot change inside a transaction.
+    if connection.vendor != "sqlite" or connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        (previous,) = cursor.fetchone()
+        cursor.execute("PRAGMA synchronous = OFF")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA synchronous = {int(previous)}")
+
+
+def build_chunk(plan, table, start, stop):
+    """
+    Build rows `start`..`stop` of `table`.
+
+    Returns:
+        dict: Model to (field names, row tuples), parents first.
+    """
+    rng = random.Random(f"{plan.seed}:{table}:{start}")
+    return BUILDERS[table](plan, rng, Clock(plan, rng), start, stop)
+
+
+def write_chunk(tables):
+    """
+    Insert a built chunk in one transaction.
+
+    Returns:
+        dict[str, int]: Rows inserted per model name.
+    """
+    with transaction.atomic():
+        for model, (names, rows) in tables.items():
+            insert_rows(model, names, rows)
+    return {model.__name__: len(rows) for model, (_, rows) in tables.items()}
+
+
+def chunk_bounds(plan, chunk_size):
+    for table in TABLES:
+        size = plan.size(table)
+        for start in range(0, size, chunk_size):
+            yield table, start, min(start + chunk_size, size)
+
+
+def built_chunks(plan, chunk_size, pool, window):
+    """
+    Yield (table, built chunk) in table order, building up to `window`
+    chunks ahead in `pool` while earlier ones are written.
+    """
+    if pool is None:
+        for table, start, stop in chunk_bounds(plan, chunk_size):
+            yield table, build_chunk(plan, table, start, stop)
+        return
+    pending = deque()
+    for table, start, stop in chunk_bounds(plan, chunk_size):
+        pending.append((table, pool.submit(build_chunk, plan, table, start, stop)))
+        if len(pending) >= window:
+            table, future = pending.popleft()
+            yield table, future.result()
+    while pending:
+        table, future = pending.popleft()
+        yield table, future.result()
+
+
+def init_worker():
+    # Spawned (non-forked) workers start without a configured Django.
+    django.setup()
+
+
+def make_plan(counts, days=365, zipf=1.1, seed=0, password=None, end=None):
+    """
+    Return a Plan for `counts` (DEFAULT_COUNTS keys) placed after the
+    current rows of each table.
+    """
+    from django.contrib.auth.hashers import make_password
+
+    models = {
+        "users": User,
+        "restaurants": Restaurants,
+        "menus": Menu,
+        "carts": Cart,
+        "orders": Order,
+    }
+    bases = {
+        table: model.objects.aggregate(pk=Max("pk"))["pk"] or 0
+        for table, model in models.items()
+    }
+    return Plan(
+        **counts,
+        days=days,
+        zipf=zipf,
+        seed=seed,
+        password=make_password(password),
+        end=end or timezone.now(),
+        bases=bases,
+    )
+
+
+def seed(plan, chunk_size=5000, workers=None, on_chunk=None):
+    """
+    Insert the rows of `plan`.
+
+    Chunks are built in worker processes and written by this process, in
+    table order, while the workers build the next ones. SQLite takes one
+    writer at a time anyway, and this way no worker waits on its lock.
+
+    Args:
+        plan (Plan): What to generate, e.g. from `make_plan`.
+        chunk_size (int): Parent rows (users, orders, ...) built and
+            inserted per transaction.
+        workers (int | None): Processes building chunks; None for one per
+            CPU, 0 to build them in this process.
+        on_chunk (Callable[[str, SeedResult], None] | None): Called with
+            the table name after each chunk, e.g. to report progress.
+
+    Returns:
+        SeedResult: Rows per model and elapsed time.
+
+    Raises:
+        ValueError: If a table that other rows reference would be empty.
+    """
+    if plan.customers < 1 or plan.owners < 1:
+        raise ValueError("Seeding needs at least one owner and one customer")
+    if (plan.carts or plan.orders) and not (plan.restaurants and plan.menu_items):
+        raise ValueError("Carts and orders need restaurants with menu items")
+
+    result = SeedResult()
+    start = time.perf_counter()
+    pool = None
+    if workers != 0:
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+    try:
+        with bulk_load_settings():
+            for table, tables in built_chunks(plan, chunk_size, pool, 2 * workers):
+                result.rows.update(write_chunk(tables))
+                result.elapsed = time.perf_counter() - start
+                if on_chunk is not None:
+                    on_chunk(table, result)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    # Primary keys were set explicitly; move PostgreSQL sequences past them.
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [User, Restaurants, Menu, Cart, Order]
+    )
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    result.elapsed = time.perf_counter() - start
+    return result
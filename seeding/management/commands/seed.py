@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from analytics.services import rebuild_rollups
+from seeding.generator import DEFAULT_COUNTS, make_plan, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, restaurants, menus, carts and orders with "
+        "Zipfian popularity, added after the existing rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiply the default counts, e.g. 10 for about 2M rows.",
+        )
+        for name, count in DEFAULT_COUNTS.items():
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                dest=name,
+                type=int,
+                help=(
+                    f"Dishes per restaurant ({count})."
+                    if name == "menu_items"
+                    else f"Override the count ({count} x scale)."
+                ),
+            )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread timestamps over this many past days.",
+        )
+        parser.add_argument(
+            "--zipf",
+            type=float,
+            default=1.1,
+            help="Popularity skew of restaurants and dishes; 0 is uniform.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--password",
+            default="seed-password",
+            help="Password of every seeded user.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Rows inserted per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes. Defaults to one per CPU; 0 inserts in "
+            "this process.",
+        )
+        parser.add_argument(
+            "--rollups",
+            action="store_true",
+            help="Rebuild the daily sales rollups of the seeded days.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1")
+        counts = {}
+        for name, count in DEFAULT_COUNTS.items():
+            if options[name] is not None:
+                counts[name] = options[name]
+            elif name == "menu_items":
+                counts[name] = count
+            else:
+                counts[name] = round(count * options["scale"])
+        if any(count < 0 for count in counts.values()):
+            raise CommandError("Counts must not be negative")
+
+        plan = make_plan(
+            counts,
+            days=options["days"],
+            zipf=options["zipf"],
+            seed=options["seed"],
+            password=options["password"],
+        )
+
+        def progress(table, result):
+            self.stdout.write(
+                f"{table}: {result.total} rows, {result.rows_per_second:.0f} rows/s"
+            )
+
+        try:
+            result = seed(
+                plan,
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                on_chunk=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        for model, rows in result.rows.items():
+            self.stdout.write(f"{model}: {rows}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {result.total} rows in {result.elapsed:.1f}s "
+                f"({result.rows_per_second:.0f} rows/s)"
+            )
+        )
+
+        if options["rollups"]:
+            end = timezone.localdate(plan.end)
+            items, restaurants = rebuild_rollups(
+                end - timedelta(days=options["days"]), end
+            )
+            self.stdout.write(
+                f"Rebuilt {items} item rollups and {restaurants} restaurant rollups"
+            )
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Sum
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import DailyRestaurantRollup
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderItem
+from restaurants.models import Menu, Restaurants
+from users.models import User
+from .generator import make_plan, seed
+
+COUNTS = {
+    "owners": 3,
+    "customers": 40,
+    "restaurants": 10,
+    "menu_items": 8,
+    "carts": 15,
+    "orders": 300,
+}
+
+
+class SeedTests(TestCase):
+    def seed(self, **kwargs):
+        plan = make_plan(COUNTS, days=30, password="seed-password", **kwargs)
+        return plan, seed(plan, chunk_size=70, workers=0)
+
+    def test_row_counts(self):
+        _, result = self.seed()
+
+        self.assertEqual(User.objects.filter(role="owner").count(), 3)
+        self.assertEqual(User.objects.filter(role="customer").count(), 40)
+        self.assertEqual(Restaurants.objects.count(), 10)
+        self.assertEqual(Menu.objects.count(), 80)
+        self.assertEqual(Cart.objects.count(), 15)
+        self.assertEqual(Order.objects.count(), 300)
+        self.assertEqual(result.rows["OrderItem"], OrderItem.objects.count())
+        self.assertEqual(result.rows["CartItem"], CartItem.objects.count())
+        self.assertEqual(result.total, sum(result.rows.values()))
+
+    def test_rows_are_consistent(self):
+        self.seed()
+
+        totals = Order.objects.annotate(items_total=Sum("order_items__price"))
+        for order in totals:
+            self.assertEqual(order.total_amount, order.items_total)
+        for cart in Cart.objects.with_totals():
+            self.assertEqual(cart.total_price, cart.items_total)
+        self.assertTrue(
+            User.objects.filter(role="customer").first().check_password("seed-password")
+        )
+
+    def test_timestamps_are_spread_over_the_period(self):
+        plan, _ = self.seed()
+
+        dates = Order.objects.values_list("order_date", flat=True)
+        self.assertGreaterEqual(min(dates), plan.end - timedelta(days=30))
+        self.assertLessEqual(max(dates), plan.end)
+        self.assertGreater(max(dates) - min(dates), timedelta(days=20))
+
+    def test_popular_restaurants_get_most_orders(self):
+        self.seed()
+
+        per_restaurant = list(
+            OrderItem.objects.values("menu_item__restaurant")
+            .annotate(orders=Count("order", distinct=True))
+            .order_by("-orders")
+            .values_list("orders", flat=True)
+        )
+        self.assertGreater(
+            per_restaurant[0], 3 * per_restaurant[len(per_restaurant) // 2]
+        )
+
+    def test_seeding_again_appends(self):
+        self.seed()
+        self.seed(seed=1)
+
+        self.assertEqual(User.objects.count(), 86)
+        self.assertEqual(Order.objects.count(), 600)
+        self.assertEqual(Menu.objects.values("restaurant").distinct().count(), 20)
+
+    def test_same_seed_gives_same_data(self):
+        self.seed(end=timezone.now())
+        first = list(
+            Order.objects.order_by("pk").values_list("total_amount", flat=True)
+        )
+        Order.objects.all().delete()
+
+        self.seed(end=timezone.now())
+        second = list(
+            Order.objects.order_by("pk").values_list("total_amount", flat=True)
+        )
+        self.assertEqual(first, second)
+
+    def test_workers_build_the_same_rows(self):
+        plan = make_plan(COUNTS, password="seed-password")
+        result = seed(plan, chunk_size=70, workers=2)
+        self.assertEqual(result.rows["Order"], 300)
+        self.assertAlmostEqual(
+            Order.objects.aggregate(total=Sum("total_amount"))["total"],
+            OrderItem.objects.aggregate(total=Sum("price"))["total"],
+            places=2,
+        )
+
+
+class SeedCommandTests(TestCase):
+    def test_command_with_rollups(self):
+        out = StringIO()
+        call_command(
+            "seed",
+            "--scale",
+            "0.01",
+            "--workers",
+            "0",
+            "--days",
+            "10",
+            "--rollups",
+            stdout=out,
+        )
+
+        self.assertEqual(Restaurants.objects.count(), 5)
+        self.assertEqual(Order.objects.count(), 500)
+        self.assertIn("Seeded", out.getvalue())
+        self.assertTrue(DailyRestaurantRollup.objects.exists())
+
+    def test_counts_override_scale(self):
+        call_command(
+            "seed",
+            "--scale",
+            "0.01",
+            "--restaurants",
+            "7",
+            "--orders",
+            "0",
+            "--workers",
+            "0",
+            stdout=StringIO(),
+        )
+        self.assertEqual(Restaurants.objects.count(), 7)
+        self.assertEqual(Order.objects.count(), 0)
@@ -0,0 +1,73 @@
+import copy
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reuses a recent snapshot of the token's user
+    instead of loading the `users.User` row on every request.
+
+    Snapshots are kept in `users.cache.user_cache` per user id and token
+    id, and only after simplejwt's own checks passed (user exists, is
+    active, password unchanged). Saving or deleting the user, e.g. a role
+    change or deactivation, invalidates all of its snapshots. Each request
+    gets its own copy of the snapshot, so changes a view makes to
+    `request.user` never leak into other requests.
+
+    `aauthenticate()` is the same for async views (`config.asyncviews`):
+    snapshots are read on the event loop, and a miss runs `get_user()`'s
+    checks in a worker thread.
+
+    With the default in-process backend, a change made in another worker
+    is only seen once the snapshot expires (AUTH_USER_CACHE["TIMEOUT"]).
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        token_id = validated_token.get(api_settings.JTI_CLAIM) or str(validated_token)
+        user, _ = user_cache.get_or_build(
+            user_id, partial(super().get_user, validated_token), token_id
+        )
+        return copy.copy(user)
+
+    async def aauthenticate(self, request):
+        """
+        Async `authenticate()`.
+
+        Returns:
+            tuple | None: (user, validated_token), or None when the request
+            carries no bearer token.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """
+        Async `get_user()`. On a cache miss simplejwt's own `get_user`
+        loads and checks the user in a worker thread.
+        """
+        fetch = sync_to_async(super().get_user)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return await fetch(validated_token)
+
+        token_id = validated_token.get(api_settings.JTI_CLAIM) or str(validated_token)
+        user, _ = await user_cache.aget_or_build(
+            user_id, partial(fetch, validated_token), token_id
+        )
+        return copy.copy(user)
@@ -0,0 +1,17 @@
+from django.conf import settings
+
+from config.cache import VersionedCache, build_backend
+
+
+class UserCache(VersionedCache):
+    """
+    Short-lived cache of authenticated user snapshots, keyed by user id and
+    token id. Saving or deleting a user bumps its version (see
+    `users.signals`), which drops the snapshots of all its tokens at once.
+    """
+
+    def __init__(self, backend):
+        super().__init__(backend, prefix="user")
+
+
+user_cache = UserCache(build_backend(getattr(settings, "AUTH_USER_CACHE", {})))
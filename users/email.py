@@ -1,13 +1,149 @@
+import functools
+
+from django.dispatch import receiver
+from django.template.base import TextNode, Variable, VariableDoesNotExist, VariableNode
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
+from django.utils.formats import localize
+from django.utils.html import conditional_escape
+from django.utils.timezone import template_localtime
 from djoser import email
 
 
-class CustomActivationEmail(email.ActivationEmail):
-    template_name = "emails/activation_email.html"
+def compile_block(nodelist):
+    """
+    Split a block into literal text and plain `{{ variable }}` lookups.
+
+    Returns the parts, or None when the block uses tags or filters and has
+    to go through the template engine.
+    """
+    parts = []
+    for node in nodelist:
+        if isinstance(node, TextNode):
+            parts.append(node.s)
+        elif (
+            isinstance(node, VariableNode)
+            and not node.filter_expression.filters
+            and isinstance(node.filter_expression.var, Variable)
+            and node.filter_expression.var.lookups
+        ):
+            parts.append(node.filter_expression.var)
+        else:
+            return None
+    return parts
+
+
+class CompiledEmailTemplate:
+    """
+    An email template split into its static and per-user parts.
+
+    Djoser renders the subject, text and HTML blocks of the template
+    through the template engine on every send. Here the template is
+    compiled once:
+
+    - blocks that hold plain text only, typically the subject, are
+      rendered up front;
+    - blocks made of text and plain `{{ variable }}` lookups become a list
+      of parts, and an email only resolves its variables from the email
+      context and joins the parts, escaped and localized as the engine
+      would;
+    - anything else (tags, filters, variables that only a context
+      processor provides) is rendered by the engine, all blocks in one pass
+      over a single bound context.
+
+    Args:
+        template_name (str): Template with `subject`, `text_body` and/or
+            `html_body` blocks, as Djoser expects.
+    """
+
+    def __init__(self, template_name):
+        self.template = get_template(template_name).template
+        self.autoescape = self.template.engine.autoescape
+        self.static = {}
+        self.compiled = []
+        self.dynamic = []
+        for node in self.template.nodelist:
+            attr = email.BaseEmailMessage._node_map.get(getattr(node, "name", ""))
+            if attr is None:
+                continue
+            parts = compile_block(node.nodelist)
+            if parts is None:
+                self.dynamic.append((attr, node))
+            elif all(isinstance(part, str) for part in parts):
+                self.static[attr] = "".join(parts).strip()
+            else:
+                self.compiled.append((attr, node, parts))
+
+    def render_value(self, value):
+        value = localize(template_localtime(value))
+        if self.autoescape:
+            return conditional_escape(value if isinstance(value, str) else str(value))
+        return str(value)
+
+    def render(self, context, request=None):
+        """
+        Return the rendered blocks as a dict of EmailMessage attribute
+        (`subject`, `body`, `html`) to text.
+        """
+        rendered = dict(self.static)
+        dynamic = list(self.dynamic)
+        for attr, node, parts in self.compiled:
+            try:
+                rendered[attr] = "".join(
+                    (
+                        part
+                        if isinstance(part, str)
+                        else self.render_value(part.resolve(context))
+                    )
+                    for part in parts
+                ).strip()
+            except VariableDoesNotExist:
+                dynamic.append((attr, node))
+        if dynamic:
+            context = make_context(context, request=request)
+            with context.bind_template(self.template):
+                for attr, node in dynamic:
+                    rendered[attr] = node.render(context).strip()
+        return rendered
+
+
+@functools.cache
+def compile_email_template(template_name):
+    return CompiledEmailTemplate(template_name)
+
+
+@receiver(file_changed, dispatch_uid="users.email.template_changed")
+def clear_compiled_email_templates(sender, file_path, **kwargs):
+    # The development server reloads templates without restarting.
+    if file_path.suffix == ".html":
+        compile_email_template.cache_clear()
+
+
+class CompiledTemplateMixin:
+    """
+    Render a Djoser email from its compiled template instead of walking
+    the template on each send. Output is the same as Djoser's `render()`.
+    """
+
+    def render(self):
+        compiled = compile_email_template(self.template_name)
+        for attr, value in compiled.render(
+            self.get_context_data(), self.request
+        ).items():
+            setattr(self, attr, value)
+        self._attach_body()
+
+
+class CustomActivationEmail(CompiledTemplateMixin, email.ActivationEmail):
+    template_name = "email/activation_email.html"
 
 
-class CustomPasswordResetEmail(email.PasswordResetEmail):
-    template_name = "emails/password_reset_email.html"
+class CustomPasswordResetEmail(CompiledTemplateMixin, email.PasswordResetEmail):
+    template_name = "email/password_reset_email.html"
 
 
-class CustomUsernameResetEmail(email.UsernameChangedConfirmationEmail):
-    template_name = "emails/username_reset_email.html"
+class CustomUsernameResetEmail(
+    CompiledTemplateMixin, email.UsernameChangedConfirmationEmail
+):
+    template_name = "email/username_reset_email.html"
@@ -0,0 +1,257 @@
+"""
+Bulk import of user accounts, e.g. the owners of a restaurant chain.
+
+Rows are streamed from a CSV or JSONL file and handled in chunks: each
+chunk is validated, its passwords are hashed in a process pool, and its
+users and profiles are inserted with `bulk_create` in one transaction. An
+invalid row is reported and skipped without aborting its chunk, and a
+chunk the database rejects is retried row by row.
+"""
+
+import csv
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+
+from .models import User, UserProfile
+from .serializers import UserImportSerializer
+
+PROFILE_FIELDS = ("other_name", "date_of_birth", "phone_number")
+
+
+@dataclass
+class ImportResult:
+    """
+    Outcome of an import.
+
+    Attributes:
+        created (int): Users inserted.
+        errors (list[tuple[int, str]]): (line number, message) per
+            rejected row.
+        elapsed (float): Wall-clock seconds.
+    """
+
+    created: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows(self):
+        return self.created + len(self.errors)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+def read_rows(path, format=None):
+    """
+    Yield (line number, row dict) pairs from a CSV or JSONL file.
+
+    The format defaults to the file extension. Flat `other_name`,
+    `date_of_birth` and `phone_number` columns are gathered into a nested
+    `user_profile`, as RegisterCustomerView expects.
+    """
+    format = format or ("jsonl" if str(path).endswith((".jsonl", ".json")) else "csv")
+    with open(path, newline="", encoding="utf-8") as handle:
+        if format == "csv":
+            # Data starts on line 2, after the header.
+            rows = enumerate(csv.DictReader(handle), start=2)
+        else:
+            rows = (
+                (number, parse_json_line(line))
+                for number, line in enumerate(handle, start=1)
+                if line.strip()
+            )
+        for number, row in rows:
+            yield number, nest_profile(row)
+
+
+def parse_json_line(line):
+    try:
+        row = json.loads(line)
+    except ValueError as exc:
+        return {"__error__": f"Invalid JSON: {exc}"}
+    return row if isinstance(row, dict) else {"__error__": "Expected a JSON object"}
+
+
+def nest_profile(row):
+    profile = {name: row.pop(name) for name in PROFILE_FIELDS if name in row}
+    if any(value not in (None, "") for value in profile.values()):
+        row.setdefault("user_profile", profile)
+    if row.get("role") == "":
+        del row["role"]
+    return row
+
+
+def validate(row, role, seen):
+    """
+    Validate one row and return its cleaned data, or raise ValueError.
+    """
+    if "__error__" in row:
+        raise ValueError(row["__error__"])
+    serializer = UserImportSerializer(data=row)
+    if not serializer.is_valid():
+        raise ValueError(json.dumps(serializer.errors))
+    data = serializer.validated_data
+    data["email"] = User.objects.normalize_email(data["email"])
+    if data["email"].lower() in seen:
+        raise ValueError(f"Duplicate email {data['email']} in the file")
+    data.setdefault("role", role)
+    if data.get("password"):
+        try:
+            validate_password(
+                data["password"],
+                User(
+                    email=data["email"],
+                    first_name=data["first_name"],
+                    last_name=data["last_name"],
+                ),
+            )
+        except ValidationError as exc:
+            raise ValueError(" ".join(exc.messages))
+    seen.add(data["email"].lower())
+    return data
+
+
+def hash_passwords(passwords, pool):
+    """
+    Hash `passwords` with the configured hasher, in `pool` when given.
+
+    Empty passwords give unusable ones, as `User.set_unusable_password()`.
+    """
+    passwords = [password or None for password in passwords]
+    if pool is None:
+        return [make_password(password) for password in passwords]
+    return list(pool.map(make_password, passwords))
+
+
+def import_chunk(chunk, role, pool, seen, result):
+    valid = []
+    for number, row in chunk:
+        try:
+            valid.append((number, validate(row, role, seen)))
+        except ValueError as exc:
+            result.errors.append((number, str(exc)))
+
+    existing = existing_emails([data["email"] for _, data in valid])
+    for number, data in valid:
+        if data["email"].lower() in existing:
+            result.errors.append((number, f"User {data['email']} already exists"))
+    valid = [
+        (number, data)
+        for number, data in valid
+        if data["email"].lower() not in existing
+    ]
+    if not valid:
+        return
+
+    hashes = hash_passwords([data.get("password") for _, data in valid], pool)
+    users = [
+        User(
+            email=data["email"],
+            password=password,
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            role=data["role"],
+        )
+        for (_, data), password in zip(valid, hashes)
+    ]
+    try:
+        insert(users, valid)
+    except DatabaseError:
+        # E.g. an email registered concurrently. The chunk is rolled back
+        # and retried row by row, so only the offending rows are reported.
+        for user, row in zip(users, valid):
+            user.pk = None
+            try:
+                insert([user], [row])
+            except DatabaseError as exc:
+                result.errors.append((row[0], f"User not imported: {exc}"))
+            else:
+                result.created += 1
+        return
+    result.created += len(users)
+
+
+def existing_emails(emails):
+    """
+    Return which of `emails` are already registered, lowercased.
+
+    Matched case-insensitively, like the duplicates within the file.
+    """
+    return set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[email.lower() for email in emails])
+        .values_list("email_lower", flat=True)
+    )
+
+
+def insert(users, rows):
+    """
+    Insert `users` and the profiles of their (line number, data) `rows` in
+    one transaction, or a savepoint when one is already open.
+    """
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        UserProfile.objects.bulk_create(
+            [
+                UserProfile(user=user, **data["user_profile"])
+                for user, (_, data) in zip(users, rows)
+                if data.get("user_profile")
+            ]
+        )
+
+
+def init_worker():
+    # Spawned (non-forked) workers start without a configured Django.
+    django.setup()
+
+
+def import_users(rows, role="owner", chunk_size=500, workers=None, on_chunk=None):
+    """
+    Create users (and their profiles) from `rows`.
+
+    Args:
+        rows (Iterable[tuple[int, dict]]): (line number, row) pairs, e.g.
+            from `read_rows`. Rows carry email, password, first_name,
+            last_name, an optional role and an optional user_profile.
+        role (str): Role of rows that do not name one.
+        chunk_size (int): Rows validated and inserted per transaction.
+        workers (int | None): Password hashing processes; None for one per
+            CPU, 0 to hash in this process.
+        on_chunk (Callable[[ImportResult], None] | None): Called after each
+            chunk, e.g. to report progress.
+
+    Returns:
+        ImportResult: Counts, per-row errors and elapsed time.
+    """
+    result = ImportResult()
+    start = time.perf_counter()
+    seen = set()
+    rows = iter(rows)
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+        if workers != 0
+        else None
+    )
+    try:
+        while chunk := list(itertools.islice(rows, chunk_size)):
+            import_chunk(chunk, role, pool, seen, result)
+            result.elapsed = time.perf_counter() - start
+            if on_chunk is not None:
+                on_chunk(result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importer import import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create users and their profiles from a CSV or JSONL file. Invalid "
+        "rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with a header row) or JSONL file.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="File format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--role",
+            choices=["owner", "customer"],
+            default="owner",
+            help="Role of rows without a role column.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Rows inserted per transaction.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes. Defaults to one per CPU; 0 "
+            "hashes in this process.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        reported = 0
+
+        def progress(result):
+            nonlocal reported
+            for number, message in result.errors[reported:]:
+                self.stderr.write(f"line {number}: {message}")
+            reported = len(result.errors)
+            self.stdout.write(
+                f"{result.rows} rows, {result.created} created, "
+                f"{result.rows_per_second:.0f} rows/s"
+            )
+
+        try:
+            rows = read_rows(options["path"], options["format"])
+            result = import_users(
+                rows,
+                role=options["role"],
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+                on_chunk=progress,
+            )
+        except OSError as exc:
+            raise CommandError(exc)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} users, {len(result.errors)} errors, "
+                f"in {result.elapsed:.1f}s ({result.rows_per_second:.0f} rows/s)"
+            )
+        )
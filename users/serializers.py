@@ -31,3 +31,18 @@ class AdminUpdateRoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["role"]
+
+
+class UserImportSerializer(serializers.Serializer):
+    """
+    Validate one row of `manage.py import_users`.
+    """
+
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(
+        required=False, allow_blank=True, trim_whitespace=False
+    )
+    first_name = serializers.CharField(max_length=255)
+    last_name = serializers.CharField(max_length=255)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    user_profile = UserProfileSerializer(required=False, allow_null=True)
@@ -1,6 +1,26 @@
-from rest_framework.test import APITestCase
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from djoser import email
+from rest_framework.test import APITestCase, APIRequestFactory
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import CachedJWTAuthentication
+from users.cache import user_cache
+from users.email import (
+    CustomActivationEmail,
+    CustomPasswordResetEmail,
+    compile_email_template,
+)
+from users import importer
+from users.models import User
 
 
 class UserTests(APITestCase):
@@ -21,3 +41,197 @@ class UserTests(APITestCase):
     def test_create_user(self):
         response = self.client.post(self.url, self.data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="check@123",
+            first_name="John",
+            last_name="Doe",
+        )
+        token = AccessToken.for_user(self.user)
+        self.request = APIRequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        self.auth = CachedJWTAuthentication()
+
+    def authenticate(self):
+        user, _ = self.auth.authenticate(self.request)
+        return user
+
+    def test_second_request_skips_user_query(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user_cache.stats()["hit_rate"], 0.5)
+
+    def test_each_request_gets_its_own_copy(self):
+        self.authenticate().first_name = "Changed"
+        self.assertEqual(self.authenticate().first_name, "John")
+
+    def test_role_change_invalidates(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = "owner"
+            self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().role, "owner")
+
+    def test_deactivation_invalidates(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+class CompiledEmailTemplateTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com",
+            password="check@123",
+            first_name="John",
+            last_name="Doe",
+        )
+        self.request = APIRequestFactory().get("/")
+
+    @mock.patch("djoser.email.default_token_generator.make_token", lambda user: "t")
+    def test_matches_djoser_rendering(self):
+        for compiled_class, djoser_class in (
+            (CustomActivationEmail, email.ActivationEmail),
+            (CustomPasswordResetEmail, email.PasswordResetEmail),
+        ):
+            compiled = compiled_class(self.request, {"user": self.user})
+            plain = djoser_class(
+                self.request,
+                {"user": self.user},
+                template_name=compiled_class.template_name,
+            )
+            compiled.render()
+            plain.render()
+            self.assertEqual(
+                (compiled.subject, compiled.body, compiled.alternatives),
+                (plain.subject, plain.body, plain.alternatives),
+            )
+            self.assertIn('"token": "t"', compiled.body)
+
+    def test_blocks_are_split_into_static_and_compiled(self):
+        template = compile_email_template(CustomActivationEmail.template_name)
+        self.assertEqual(template.static, {"subject": "Account Activation Required"})
+        self.assertEqual([attr for attr, _, _ in template.compiled], ["body"])
+        self.assertEqual(template.dynamic, [])
+
+    def test_unknown_variables_fall_back_to_the_engine(self):
+        template = compile_email_template(CustomActivationEmail.template_name)
+        rendered = template.render({"uid": "<u>"}, self.request)
+        self.assertIn('"uid": "&lt;u&gt;"', rendered["body"])
+        self.assertIn('"token": ""', rendered["body"])
+
+
+class ImportUsersCommandTests(APITestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        User.objects.create_user(
+            email="taken@example.com",
+            password="check@123",
+            first_name="Old",
+            last_name="User",
+        )
+
+    def write(self, name, content):
+        path = Path(self.dir.name) / name
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def run_import(self, path, *args):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command("import_users", path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_import_skips_bad_rows(self):
+        path = self.write(
+            "owners.csv",
+            "email,password,first_name,last_name,role,other_name,"
+            "date_of_birth,phone_number\n"
+            "a@example.com,check@123,Ann,Lee,,Annie,1990-01-02,0240000000\n"
+            "not-an-email,check@123,Bad,Row,,,,\n"
+            "b@example.com,,Ben,Ray,customer,,,\n"
+            "taken@example.com,check@123,Dup,User,,,,\n"
+            "A@EXAMPLE.com,check@123,Ann,Again,,,,\n"
+            "c@example.com,123,Weak,Password,,,,\n",
+        )
+        stdout, stderr = self.run_import(path, "--workers", "0", "--chunk-size", "2")
+
+        self.assertIn("Imported 2 users, 4 errors", stdout)
+        self.assertEqual(
+            [line.split(":")[0] for line in stderr.splitlines()],
+            ["line 3", "line 5", "line 6", "line 7"],
+        )
+        ann = User.objects.get(email="a@example.com")
+        self.assertEqual(ann.role, "owner")
+        self.assertTrue(ann.check_password("check@123"))
+        self.assertEqual(ann.user_profile.other_name, "Annie")
+        ben = User.objects.get(email="b@example.com")
+        self.assertEqual(ben.role, "customer")
+        self.assertFalse(ben.has_usable_password())
+        self.assertFalse(hasattr(ben, "user_profile"))
+
+    def test_existing_emails_match_case_insensitively(self):
+        path = self.write(
+            "owners.csv",
+            "email,password,first_name,last_name\n"
+            "TAKEN@example.com,check@123,Dup,User\n",
+        )
+        stdout, stderr = self.run_import(path, "--workers", "0")
+
+        self.assertIn("Imported 0 users, 1 errors", stdout)
+        self.assertIn("line 2: User TAKEN@example.com already exists", stderr)
+
+    def test_rejected_chunk_is_retried_row_by_row(self):
+        path = self.write(
+            "owners.csv",
+            "email,password,first_name,last_name\n"
+            "a@example.com,check@123,Ann,Lee\n"
+            "taken@example.com,check@123,Dup,User\n"
+            "b@example.com,check@123,Ben,Ray\n",
+        )
+        # As if taken@example.com registered after the existence check.
+        with mock.patch.object(importer, "existing_emails", return_value=set()):
+            stdout, stderr = self.run_import(path, "--workers", "0")
+
+        self.assertIn("Imported 2 users, 1 errors", stdout)
+        self.assertTrue(stderr.startswith("line 3: User not imported"))
+        self.assertEqual(len(stderr.splitlines()), 1)
+        self.assertTrue(User.objects.filter(email="b@example.com").exists())
+
+    def test_jsonl_import_hashes_in_worker_pool(self):
+        rows = [
+            {
+                "email": f"owner{i}@example.com",
+                "password": "check@123",
+                "first_name": "Owner",
+                "last_name": str(i),
+                "user_profile": {
+                    "other_name": "O",
+                    "date_of_birth": "1990-01-01",
+                    "phone_number": "0240000000",
+                },
+            }
+            for i in range(3)
+        ]
+        lines = [json.dumps(row) for row in rows] + ["{broken"]
+        path = self.write("owners.jsonl", "\n".join(lines) + "\n")
+        stdout, stderr = self.run_import(path, "--workers", "2")
+
+        self.assertIn("Imported 3 users, 1 errors", stdout)
+        self.assertTrue(stderr.startswith("line 4: Invalid JSON"))
+        owner = User.objects.get(email="owner1@example.com")
+        self.assertTrue(owner.check_password("check@123"))
+        self.assertEqual(owner.user_profile.phone_number, "0240000000")
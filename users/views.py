@@ -9,11 +9,12 @@ from .serializers import (
     UserProfileSerializer,
     AdminUpdateRoleSerializer,
 )
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
 from .models import User
-from django.conf import settings
 from djoser import signals
+from djoser.conf import settings as djoser_settings
+from notifications.outbox import enqueue, enqueue_templated
 
 
 @extend_schema(
@@ -78,6 +79,11 @@ class RegisterCustomerView(CreateAPIView):
                     sender=self.__class__, user=user, request=request
                 )
                 print("Successfully sent user_registered signal")
+                # Queued after commit; delivered by send_outbox_emails
+                enqueue_templated(
+                    djoser_settings.EMAIL.activation(request, {"user": user}),
+                    [user.email],
+                )
 
         data = {
             "message": "Customer account created successfully",
@@ -170,19 +176,20 @@ class AdminUpdateRoleView(generics.UpdateAPIView):
         role_serializer.is_valid(raise_exception=True)
         role_serializer.save()
 
-        # Send notification email to the user about role change
-        send_mail(
-            "Congratulations on Becoming a Restaurant Owner",
-            f"Dear {user.first_name},\n\n"
-            "We are delighted to inform you that your account has been successfully upgraded to a Restaurant Owner.\n\n"
-            "You now have full access to manage your restaurant on our platform, including adding menu items, updating restaurant details, and tracking orders.\n\n"
-            "We look forward to supporting you as you grow your restaurant business with us.\n\n"
-            "Thank you for being a valued member of our community.\n\n"
-            "Sincerely,\n"
-            "The Multi Restaurant Team",
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
+        # Queue notification email to the user about role change
+        enqueue(
+            EmailMessage(
+                "Congratulations on Becoming a Restaurant Owner",
+                f"Dear {user.first_name},\n\n"
+                "We are delighted to inform you that your account has been successfully upgraded to a Restaurant Owner.\n\n"
+                "You now have full access to manage your restaurant on our platform, including adding menu items, updating restaurant details, and tracking orders.\n\n"
+                "We look forward to supporting you as you grow your restaurant business with us.\n\n"
+                "Thank you for being a valued member of our community.\n\n"
+                "Sincerely,\n"
+                "The Multi Restaurant Team",
+                settings.DEFAULT_FROM_EMAIL,
+                [user.email],
+            )
         )
 
         return Response(